@@ -0,0 +1,406 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import JSONResponse, Response
+import settings
+from job_queue import COMPLETED, QueueFullError
+from lazy_schedule import LazySchedule
+from results import INVALID_RESULTS
+from schedule_database import process_and_store
+from upload_spool import UploadTooLargeError, close_when_done, spool_upload
+
+# The media type and file extension of each schedule download format.
+SCHEDULE_FORMATS = {
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "xlsx",
+    ),
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+}
+
+
+def process_workbook(excel_file, progress=None, cache=None):
+    """This function processes an ETABS design export into the beam schedule, importing the design engine
+    on its first call. The engine and pandas are slow to import, so they are kept out of the startup of
+    the application and only loaded within the worker processing the first upload.
+
+    Args:
+        excel_file (str or file-like): The path or content of the uploaded spreadsheet.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The processed beam schedule, or a string describing why it could not be processed.
+    """
+    import df_processing as pr
+
+    return pr.process_workbook(excel_file, progress=progress, cache=cache)
+
+
+def process_runs(excel_files, progress=None, cache=None):
+    """This function merges the ETABS design exports of several runs into their governing envelope and
+    processes it into the beam schedule, importing the design engine on its first call.
+
+    Args:
+        excel_files (list): The paths or contents of the uploaded spreadsheets, one per run.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The processed beam schedule, or a string describing why it could not be processed.
+    """
+    import envelope_merging as em
+
+    return em.process_workbooks(excel_files, progress=progress, cache=cache)
+
+
+def open_lazy_schedule(excel_file, progress=None, cache=None):
+    """This function parses an ETABS design export and indexes it by storey without designing any beam, so
+    each storey is only designed once it is downloaded.
+
+    Args:
+        excel_file (str or file-like): The path or content of the uploaded spreadsheet.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        LazySchedule: The export indexed by storey, or a string describing why it could not be parsed.
+    """
+    return LazySchedule.from_workbook(excel_file, progress=progress, cache=cache)
+
+
+def export_schedule(beam_schedule_df, file_format: str) -> bytes:
+    """This function exports a processed beam schedule in one of the download formats.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+        file_format (str): Either "xlsx", "csv", or "json".
+
+    Returns:
+        bytes: The exported schedule.
+    """
+    import export_processing as ex
+
+    if file_format == "xlsx":
+        return ex.export_file(beam_schedule_df)
+    if file_format == "csv":
+        return beam_schedule_df.to_csv(index=False).encode("utf-8-sig")
+    # The split orientation keeps both levels of each column header.
+    return beam_schedule_df.to_json(orient="split", index=False).encode("utf-8")
+
+
+def export_changes(changes_df, file_format: str) -> bytes:
+    """This function exports the changes between two schedule revisions in one of the download formats.
+
+    Args:
+        changes_df (pd.DataFrame): The change sheet, as returned by schedule_diff.diff_schedules.
+        file_format (str): Either "xlsx", "csv", or "json".
+
+    Returns:
+        bytes: The exported change sheet.
+    """
+    import export_processing as ex
+
+    if file_format == "xlsx":
+        return ex.export_changes(changes_df)
+    if file_format == "csv":
+        return changes_df.to_csv(index=False).encode("utf-8-sig")
+    return changes_df.to_json(orient="records").encode("utf-8")
+
+
+def job_summary(job) -> dict:
+    """This function summarises a job for the API, reporting spreadsheets which could not be processed as
+    invalid.
+
+    Args:
+        job (ScheduleJob): The job.
+
+    Returns:
+        dict: The job's status, as returned by its as_dict method.
+    """
+    import pandas as pd
+
+    summary = job.as_dict()
+    if job.status == COMPLETED and not isinstance(
+        job.result, (pd.DataFrame, LazySchedule)
+    ):
+        summary["status"] = "invalid"
+        summary["error"] = INVALID_RESULTS.get(
+            job.result, "The spreadsheet produced an empty beam schedule."
+        )
+    return summary
+
+
+def schedule_response(
+    file_format: str, content: bytes, file_name: str = "beam_schedule"
+) -> Response:
+    """This function wraps an exported schedule in a download response.
+
+    Args:
+        file_format (str): Either "xlsx", "csv", or "json".
+        content (bytes): The exported schedule.
+        file_name (str, optional): The name of the downloaded file, without its extension.
+
+    Returns:
+        Response: The download response.
+    """
+    media_type, extension = SCHEDULE_FORMATS[file_format]
+    return Response(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{file_name}.{extension}"'
+        },
+    )
+
+
+def create_router(job_queue, database=None, cache=None) -> APIRouter:
+    """This function creates the routes of the headless schedule API. An ETABS export is posted to be
+    processed on the job queue shared with the GUI, its status is polled by the returned job id, and the
+    schedule is then fetched as xlsx, csv, or json. A lazy upload is only parsed and indexed by storey.
+    Fetching storeys which are not designed yet queues their design as a job of its own, whose schedule is
+    fetched once it completes, while designed storeys are fetched straight away. The exports of several
+    runs may be posted together to be merged into their governing envelope and designed once. With a
+    schedule database, processed schedules are stored by project and revision, and stored schedules are
+    listed and fetched without designing them again.
+
+    Args:
+        job_queue (ScheduleJobQueue): The queue the schedules are processed on.
+        database (ScheduleDatabase, optional): The store of processed schedules. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across projects. Defaults to None.
+
+    Returns:
+        APIRouter: The API routes, mounted under /api.
+    """
+    router = APIRouter(prefix="/api")
+
+    def find_job(job_id):
+        job = job_queue.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired job id.")
+        return job
+
+    @router.post("/schedules", status_code=202)
+    async def submit_schedule(
+        file: UploadFile = File(...),
+        project: str = Form(None),
+        revision: str = Form(None),
+        previous_revision: str = Form(None),
+        lazy: bool = Form(False),
+    ):
+        if lazy and project is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="A lazy schedule is not designed as a whole, so it cannot be stored.",
+            )
+        # The upload is copied to a spooled file, so that it outlives the request while the job waits in
+        # the queue, without holding large workbooks in memory.
+        try:
+            content = await asyncio.to_thread(
+                spool_upload,
+                file.file,
+                int(settings.UPLOAD_MAX_MB * 1024**2),
+                int(settings.UPLOAD_SPOOL_MB * 1024**2),
+            )
+        except UploadTooLargeError as error:
+            raise HTTPException(status_code=413, detail=str(error))
+        try:
+            if lazy or database is None:
+                job = job_queue.submit(
+                    open_lazy_schedule if lazy else process_workbook,
+                    content,
+                    cache=cache,
+                    name=file.filename,
+                    track_progress=True,
+                )
+            else:
+                job = job_queue.submit(
+                    process_and_store,
+                    database,
+                    content,
+                    project or os.path.splitext(file.filename or "Untitled")[0],
+                    revision,
+                    previous_revision,
+                    cache=cache,
+                    name=file.filename,
+                    track_progress=True,
+                )
+        except QueueFullError as error:
+            content.close()
+            return JSONResponse(
+                status_code=503,
+                content={"detail": str(error)},
+                headers={"Retry-After": "60"},
+            )
+        close_when_done(job, content)
+        return job_summary(job)
+
+    @router.post("/schedules/merged", status_code=202)
+    async def submit_merged_schedule(files: list[UploadFile] = File(...)):
+        # Each run is spooled as it is for a single upload, and the runs are merged within the job.
+        contents = []
+        try:
+            for file in files:
+                contents.append(
+                    await asyncio.to_thread(
+                        spool_upload,
+                        file.file,
+                        int(settings.UPLOAD_MAX_MB * 1024**2),
+                        int(settings.UPLOAD_SPOOL_MB * 1024**2),
+                    )
+                )
+            job = job_queue.submit(
+                process_runs,
+                contents,
+                cache=cache,
+                name=", ".join(file.filename or "Untitled" for file in files),
+                track_progress=True,
+            )
+        except UploadTooLargeError as error:
+            for content in contents:
+                content.close()
+            raise HTTPException(status_code=413, detail=str(error))
+        except QueueFullError as error:
+            for content in contents:
+                content.close()
+            return JSONResponse(
+                status_code=503,
+                content={"detail": str(error)},
+                headers={"Retry-After": "60"},
+            )
+        for content in contents:
+            close_when_done(job, content)
+        return job_summary(job)
+
+    @router.get("/schedules/{job_id}")
+    def schedule_status(job_id: str):
+        return job_summary(find_job(job_id))
+
+    @router.delete("/schedules/{job_id}")
+    def cancel_schedule(job_id: str):
+        job = find_job(job_id)
+        job_queue.cancel(job_id)
+        return job_summary(job)
+
+    def completed_result(job_id):
+        job = find_job(job_id)
+        summary = job_summary(job)
+        if summary["status"] != COMPLETED:
+            raise HTTPException(
+                status_code=409,
+                detail=summary["error"] or f"The job is {summary['status']}.",
+            )
+        return job.result
+
+    @router.get("/schedules/{job_id}/storeys")
+    def list_storeys(job_id: str):
+        result = completed_result(job_id)
+        if isinstance(result, LazySchedule):
+            return result.storey_summary()
+        storeys = result[("Storey", "")].astype(str).value_counts(sort=False)
+        return [
+            {"storey": storey, "beams": int(count), "designed": True}
+            for storey, count in storeys.items()
+        ]
+
+    @router.get("/schedules/{job_id}/schedule")
+    async def download_schedule(
+        job_id: str,
+        format: str = Query("xlsx", pattern="^(xlsx|csv|json)$"),
+        storey: list[str] = Query(None),
+    ):
+        result = completed_result(job_id)
+        if isinstance(result, LazySchedule):
+            unknown = set(storey or []) - set(result.storeys)
+            if unknown:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Unknown storeys: {', '.join(sorted(unknown))}.",
+                )
+            missing = result.missing(storey)
+            if missing:
+                # The storeys not designed yet are designed on the job queue, like any other upload, and
+                # their schedule is fetched from the new job once it completes.
+                try:
+                    design_job = job_queue.submit(
+                        result.schedule,
+                        storey,
+                        name=f"{find_job(job_id).name} ({', '.join(missing)})",
+                        track_progress=True,
+                    )
+                except QueueFullError as error:
+                    return JSONResponse(
+                        status_code=503,
+                        content={"detail": str(error)},
+                        headers={"Retry-After": "60"},
+                    )
+                return JSONResponse(status_code=202, content=job_summary(design_job))
+            beam_schedule_df = await asyncio.to_thread(result.schedule, storey)
+        elif storey:
+            beam_schedule_df = result[
+                result[("Storey", "")].astype(str).isin(storey)
+            ].reset_index(drop=True)
+        else:
+            beam_schedule_df = result
+        # Exporting a large schedule is slow, so it is kept off the event loop.
+        content = await asyncio.to_thread(export_schedule, beam_schedule_df, format)
+        return schedule_response(format, content)
+
+    if database is None:
+        return router
+
+    @router.get("/projects/{project}/revisions")
+    async def list_revisions(project: str):
+        return await asyncio.to_thread(database.revisions, project)
+
+    @router.get("/projects/{project}/revisions/{revision}/schedule")
+    async def download_stored_schedule(
+        project: str,
+        revision: str,
+        format: str = Query("xlsx", pattern="^(xlsx|csv|json)$"),
+        storey: list[str] = Query(None),
+    ):
+        beam_schedule_df = await asyncio.to_thread(
+            database.load, project, revision, storey
+        )
+        if beam_schedule_df is None:
+            raise HTTPException(status_code=404, detail="Unknown project revision.")
+        content = await asyncio.to_thread(export_schedule, beam_schedule_df, format)
+        return schedule_response(format, content)
+
+    @router.get("/projects/{project}/diff")
+    async def diff_revisions(
+        project: str,
+        previous: str,
+        current: str,
+        format: str = Query("xlsx", pattern="^(xlsx|csv|json)$"),
+    ):
+        import schedule_diff as sd
+
+        schedules = []
+        for revision in (previous, current):
+            beam_schedule_df = await asyncio.to_thread(database.load, project, revision)
+            if beam_schedule_df is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Unknown project revision {revision}."
+                )
+            schedules.append(beam_schedule_df)
+        changes_df = await asyncio.to_thread(sd.diff_schedules, *schedules)
+        content = await asyncio.to_thread(export_changes, changes_df, format)
+        return schedule_response(format, content, "schedule_changes")
+
+    return router
+
+
+def register_api(app, job_queue, database=None, cache=None):
+    """This function mounts the headless schedule API on the application.
+
+    Args:
+        app (FastAPI): The application, such as NiceGUI's app.
+        job_queue (ScheduleJobQueue): The queue the schedules are processed on.
+        database (ScheduleDatabase, optional): The store of processed schedules. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across projects. Defaults to None.
+    """
+    app.include_router(create_router(job_queue, database, cache))
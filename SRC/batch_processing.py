@@ -0,0 +1,266 @@
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import df_processing as pr
+import export_processing as ex
+import rationalisation as ra
+from design_cache import DesignCache, design_cache_path
+from results import EXIT_FAILED, EXIT_NO_INPUTS, EXIT_OK, INVALID_RESULTS, OUTPUT_SUFFIX
+
+# The suffix added to each input's name to name the folder of its storey schedules.
+STOREY_FOLDER_SUFFIX = "_storeys"
+
+
+def expand_inputs(patterns) -> list:
+    """This function expands the input paths and glob patterns into a list of workbooks. Patterns are
+    expanded here, as the Windows shell does not expand them itself.
+
+    Args:
+        patterns (list): The paths and glob patterns given on the command line.
+
+    Returns:
+        list: The unique workbook paths, in the order given.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            # Excel's lock files sit alongside open workbooks and are not exports.
+            if os.path.basename(path).startswith("~$") or path.endswith(OUTPUT_SUFFIX):
+                continue
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def output_path(input_path, output_dir=None) -> str:
+    """This function names the schedule written for an input workbook.
+
+    Args:
+        input_path (str): The path of the ETABS export.
+        output_dir (str, optional): The folder to write to. Defaults to the folder of the input.
+
+    Returns:
+        str: The path of the schedule.
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    folder = output_dir if output_dir else os.path.dirname(input_path)
+    return os.path.join(folder, stem + OUTPUT_SUFFIX)
+
+
+def process_by_storey(
+    input_path, output_dir=None, workers=None, design_cache=None, report=None
+):
+    """This function designs and exports each storey of an ETABS export on a separate worker process.
+    Each storey's schedule is written to the export's storey folder as soon as it is designed, and the
+    storeys are then assembled into the full schedule.
+
+    Args:
+        input_path (str): The path of the ETABS export.
+        output_dir (str, optional): The folder to write to. Defaults to the folder of the input.
+        workers (int, optional): The number of worker processes. Defaults to the CPU count.
+        design_cache (str, optional): The path of the design cache shared across runs. Defaults to None.
+        report (callable, optional): Receives a line describing each storey written. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The processed beam schedule, or a string describing why it could not be processed.
+    """
+    workbook = pr.read_workbook(input_path)
+    if isinstance(workbook, str):
+        return workbook
+    beam_inputs = pr.extract_beam_inputs(*workbook)
+    if isinstance(beam_inputs, str):
+        return beam_inputs
+
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    folder = os.path.join(
+        output_dir if output_dir else os.path.dirname(input_path),
+        stem + STOREY_FOLDER_SUFFIX,
+    )
+    os.makedirs(folder, exist_ok=True)
+    start = time.perf_counter()
+    storeys = []
+    for storey, positions, storey_df, content in pr.design_by_storey(
+        beam_inputs, workers, "xlsx", design_cache
+    ):
+        with open(
+            os.path.join(folder, ex.storey_file_name(storey, "xlsx")), "wb"
+        ) as file:
+            file.write(content)
+        storeys.append((positions, storey_df))
+        if report is not None:
+            report(
+                f"     {time.perf_counter() - start:7.2f} s  {storey}: {len(storey_df)} beams"
+            )
+    if not storeys:
+        return pr.create_schedule([])
+    return pr.assemble_storeys(storeys)
+
+
+def process_file(
+    input_path,
+    output_dir=None,
+    type_tolerance=None,
+    design_cache=None,
+    by_storey=False,
+    workers=None,
+    report=None,
+) -> dict:
+    """This function processes one ETABS export and writes its schedule. It is run within the worker
+    processes of process_files, so it must remain a module level function which does not raise.
+
+    Args:
+        input_path (str): The path of the ETABS export.
+        output_dir (str, optional): The folder to write to. Defaults to the folder of the input.
+        type_tolerance (float, optional): Rationalises the schedule into beam types, merging types within
+            this fraction of extra steel. Defaults to None, which leaves the schedule untyped.
+        design_cache (str, optional): The path of the design cache shared across runs. Defaults to None,
+            which designs every beam.
+        by_storey (bool, optional): Designs and writes each storey on a separate worker process, as in
+            process_by_storey. Defaults to False.
+        workers (int, optional): The number of worker processes designing the storeys. Defaults to the
+            CPU count.
+        report (callable, optional): Receives a line describing each storey written. Defaults to None.
+
+    Returns:
+        dict: The input and output paths, whether it succeeded, a message, and the seconds taken.
+    """
+    start = time.perf_counter()
+    result = {"input": input_path, "output": None, "ok": False}
+    try:
+        if by_storey:
+            beam_schedule_df = process_by_storey(
+                input_path, output_dir, workers, design_cache, report
+            )
+        else:
+            cache = DesignCache(design_cache) if design_cache else None
+            beam_schedule_df = pr.process_workbook(input_path, cache=cache)
+        if isinstance(beam_schedule_df, str):
+            result["message"] = INVALID_RESULTS.get(beam_schedule_df, beam_schedule_df)
+        elif not isinstance(beam_schedule_df, pd.DataFrame) or beam_schedule_df.empty:
+            result["message"] = "produced an empty beam schedule"
+        else:
+            type_schedule_df = None
+            if type_tolerance is not None:
+                beam_schedule_df, type_schedule_df = ra.rationalise(
+                    beam_schedule_df, type_tolerance
+                )
+            result["output"] = output_path(input_path, output_dir)
+            with open(result["output"], "wb") as file:
+                file.write(ex.export_file(beam_schedule_df, type_schedule_df))
+            result["ok"] = True
+            result["message"] = f"{len(beam_schedule_df)} beams"
+            if type_schedule_df is not None:
+                result["message"] += f" in {len(type_schedule_df)} types"
+    except Exception as error:
+        result["message"] = f"failed ({str(error) or type(error).__name__})"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def process_files(
+    input_paths,
+    output_dir=None,
+    workers=None,
+    type_tolerance=None,
+    design_cache=None,
+    by_storey=False,
+    report=None,
+):
+    """This function processes ETABS exports across a pool of worker processes, yielding the result of
+    each as it finishes.
+
+    Args:
+        input_paths (list): The paths of the ETABS exports.
+        output_dir (str, optional): The folder to write to. Defaults to the folder of each input.
+        workers (int, optional): The number of worker processes. Defaults to the CPU count.
+        type_tolerance (float, optional): Rationalises each schedule into beam types. Defaults to None.
+        design_cache (str, optional): The path of the design cache shared across runs. Defaults to None.
+        by_storey (bool, optional): Processes the exports one at a time, designing the storeys of each
+            across the worker processes instead. Defaults to False.
+        report (callable, optional): Receives a line describing each storey written. Defaults to None.
+
+    Yields:
+        dict: The result of each file, as returned by process_file.
+    """
+    if by_storey:
+        for input_path in input_paths:
+            yield process_file(
+                input_path,
+                output_dir,
+                type_tolerance,
+                design_cache,
+                by_storey=True,
+                workers=workers,
+                report=report,
+            )
+        return
+    # A single export is quicker to process in process than to send to a worker process.
+    if len(input_paths) <= 1 or workers == 1:
+        for input_path in input_paths:
+            yield process_file(input_path, output_dir, type_tolerance, design_cache)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                process_file, input_path, output_dir, type_tolerance, design_cache
+            )
+            for input_path in input_paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_result(result) -> str:
+    """This function describes the outcome and timing of a processed file on one line.
+
+    Args:
+        result (dict): The result of the file, as returned by process_file.
+
+    Returns:
+        str: The line to print.
+    """
+    status = "OK  " if result["ok"] else "FAIL"
+    return (
+        f"{status} {result['seconds']:7.2f} s  {result['input']}: {result['message']}"
+    )
+
+
+def run_command(args) -> int:
+    """This function runs the batch command, printing the outcome and timing of each file.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    input_paths = expand_inputs(args.inputs)
+    if not input_paths:
+        print("No ETABS workbooks matched the inputs given.", file=sys.stderr)
+        return EXIT_NO_INPUTS
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    failed = 0
+    for result in process_files(
+        input_paths,
+        args.output_dir,
+        args.workers,
+        args.types,
+        design_cache_path(args),
+        args.by_storey,
+        lambda line: print(line, flush=True),
+    ):
+        print(format_result(result), flush=True)
+        failed += not result["ok"]
+    print(
+        f"Processed {len(input_paths)} workbook(s) in {time.perf_counter() - start:.2f} s, {failed} failed."
+    )
+    return EXIT_FAILED if failed else EXIT_OK
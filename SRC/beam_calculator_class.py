@@ -6,6 +6,14 @@ class Beam:
     reinforcement schedule.
     """
 
+    # The bar diameters and spacings the design may choose from, in mm, and the cover to the shear links.
+    FLEXURE_DIAMETERS = (16, 20, 25, 32)
+    SHEAR_DIAMETERS = (12, 16, 20, 25)
+    SHEAR_SPACINGS = (250, 200, 150, 125, 100)
+    SIDE_FACE_DIAMETERS = (12, 16, 20, 25, 32)
+    SIDE_FACE_SPACINGS = (250, 200, 150)
+    COVER = 40
+
     def __init__(
         self,
         story,
@@ -159,6 +167,21 @@ class Beam:
         conc_grade = "".join(retrieved_value)
         return int(conc_grade)
 
+    @staticmethod
+    def get_shear_legs_and_spacing(shear_string: str) -> tuple:
+        """This function retrieves the number of legs and the spacing from a shear reinforcement string,
+        such as 4L-T12@75, whatever the number of digits of each.
+
+        Args:
+            shear_string (str): the shear reinforcement string.
+
+        Returns:
+            tuple: the number of legs and the spacing, in mm.
+        """
+        legs, _, remainder = shear_string.partition("L")
+        spacing = remainder.rpartition("@")[2]
+        return int(legs), int(spacing)
+
     @staticmethod
     def check_combo(combo_list: list) -> str:
         """This function checks if any of the flexural combos in the list is overstressed.
@@ -243,7 +266,7 @@ class Beam:
         """This method loops through the required top flexural reinforcement and provides a string
         containing the schedule for each part of the beam. Once the string has been made, the schedule
         for each section of the beam is indexed to its relevant attribute."""
-        dia_list = [16, 20, 25, 32]
+        dia_list = list(self.FLEXURE_DIAMETERS)
         target = self.req_top_flex_reinf.copy()
         if self.neg_flex_combo == "False":
             for index, req in enumerate(target):
@@ -301,7 +324,7 @@ class Beam:
         for each beam schedule. Once calculated, the value
         for each section of the beam is indexed to its relevant attribute.
         """
-        dia_list = [16, 20, 25, 32]
+        dia_list = list(self.FLEXURE_DIAMETERS)
         target = self.req_top_flex_reinf.copy()
         if self.neg_flex_combo == "False":
             for index, req in enumerate(target):
@@ -347,7 +370,7 @@ class Beam:
         containing the schedule for each part of the beam. Once the string has been made, the schedule
         for each section of the beam is indexed to its relevant attribute.
         """
-        dia_list = [16, 20, 25, 32]
+        dia_list = list(self.FLEXURE_DIAMETERS)
         target = self.req_bot_flex_reinf.copy()
 
         if self.pos_flex_combo == "False":
@@ -405,7 +428,7 @@ class Beam:
         for each beam schedule. Once calculated, the value
         for each section of the beam is indexed to its relevant attribute.
         """
-        dia_list = [16, 20, 25, 32]
+        dia_list = list(self.FLEXURE_DIAMETERS)
         target = self.req_bot_flex_reinf.copy()
         if self.pos_flex_combo == "False":
             for index, req in enumerate(target):
@@ -530,16 +553,13 @@ class Beam:
         It defines two lists: one diameter list, ranging from 12 to 25mm dia, and another spacing
         list from 250 to 100mm. It utilises a truthy statement to ensure that the right
         diameter and spacing combination is found for the shear reinforcement."""
-        shear_dia_list = [12, 16, 20, 25]
-        shear_spacing_list = [250, 200, 150, 125, 100, self.min_shear_long_spacing]
-        shear_spacing_list = list(
-            set(
-                spacing
-                for spacing in shear_spacing_list
-                if spacing <= self.min_shear_long_spacing
-            )
-        )
-        shear_spacing_list.sort(reverse=True)
+        shear_dia_list = list(self.SHEAR_DIAMETERS)
+        # The spacings keep the order given, as the first spacing which works is detailed.
+        shear_spacing_list = [
+            spacing
+            for spacing in self.SHEAR_SPACINGS
+            if spacing <= self.min_shear_long_spacing
+        ]
         shear_legs_list = list(range(self.req_shear_legs, self.flex_rebar_count + 1, 2))
         target = [
             self.req_total_left_shear_reinf,
@@ -583,16 +603,13 @@ class Beam:
         It defines two lists: one diameter list, ranging from 12 to 25mm dia, and another spacing
         list from 250 to 100mm. It utilises a truthy statement to ensure that the right
         diameter and spacing combination is found for the shear reinforcement."""
-        shear_dia_list = [12, 16, 20, 25]
-        shear_spacing_list = [250, 200, 150, 125, 100, self.min_shear_long_spacing]
-        shear_spacing_list = list(
-            set(
-                spacing
-                for spacing in shear_spacing_list
-                if spacing <= self.min_shear_long_spacing
-            )
-        )
-        shear_spacing_list.sort(reverse=True)
+        shear_dia_list = list(self.SHEAR_DIAMETERS)
+        # The spacings keep the order given, as the first spacing which works is detailed.
+        shear_spacing_list = [
+            spacing
+            for spacing in self.SHEAR_SPACINGS
+            if spacing <= self.min_shear_long_spacing
+        ]
         shear_legs_list = list(range(self.req_shear_legs, self.flex_rebar_count + 1, 2))
         target = [
             self.req_total_left_shear_reinf,
@@ -674,7 +691,7 @@ class Beam:
                 max_shear_dia = max(dia_shear_list)
                 self.side_face_clear_space = (
                     self.depth
-                    - (2 * 40)
+                    - (2 * self.COVER)
                     - (2 * max_shear_dia)
                     - max_top_dia_one
                     - max_top_dia_two
@@ -691,8 +708,8 @@ class Beam:
         than 700mm. It subtracts the required torsion from the residual calculated from the flexural reinforcement.
         It also checks if the combos are overstressed or not. It also provides the minimum side face reinforcement
         if the depth is greater than 900 and the flexural torsion requirement is 0."""
-        spacing_list = [250, 200, 150]
-        dia_list = [12, 16, 20, 25, 32]
+        spacing_list = list(self.SIDE_FACE_SPACINGS)
+        dia_list = list(self.SIDE_FACE_DIAMETERS)
         combined_residual = [
             self.left_residual_rebar,
             self.middle_residual_rebar,
@@ -739,8 +756,8 @@ class Beam:
         than 700mm. It subtracts the required torsion from the residual calculated from the flexural reinforcement.
         It also checks if the combos are overstressed or not. It also provides the minimum side face reinforcement
         if the depth is greater than 900 and the flexural torsion requirement is 0."""
-        spacing_list = [250, 200, 150]
-        dia_list = [12, 16, 20, 25, 32]
+        spacing_list = list(self.SIDE_FACE_SPACINGS)
+        dia_list = list(self.SIDE_FACE_DIAMETERS)
         combined_residual = [
             self.left_residual_rebar,
             self.middle_residual_rebar,
@@ -868,7 +885,7 @@ class Beam:
 
     def get_min_shear_long_spacing(self):
         """This method follows Clause 18.4.2.4 of ACI 318-19 by ensuring that the longitudinal spacing of shear links is
-        not exceeded. This value is inputted into the spacing list found in shear string and area methods.
+        not exceeded. This value bounds the spacing list found in shear string and area methods.
         This method has been updated to follow Table 18.4.2.4, which grabs the minimum middle shear longitudinal spacing.
         """
         combined_long_dia_list = [
@@ -916,83 +933,60 @@ class Beam:
                     300,
                 ]
             )
-            if min_shear_long_spacing >= 200 and min_shear_long_spacing < 250:
-                min_shear_long_spacing = 200
-            elif min_shear_long_spacing >= 150 and min_shear_long_spacing < 200:
-                min_shear_long_spacing = 150
-            elif min_shear_long_spacing >= 125 and min_shear_long_spacing < 150:
-                min_shear_long_spacing = 125
-            elif min_shear_long_spacing < 125:
-                min_shear_long_spacing = 100
-
-            self.min_shear_long_spacing = min_shear_long_spacing
-
-            self.min_shear_centre_long_spacing = min([(self.eff_depth / 2), 250])
-            if (
-                self.min_shear_centre_long_spacing >= 200
-                and self.min_shear_centre_long_spacing < 250
-            ):
-                self.min_shear_centre_long_spacing = 200
-            elif (
-                self.min_shear_centre_long_spacing >= 150
-                and self.min_shear_centre_long_spacing < 200
-            ):
-                self.min_shear_centre_long_spacing = 150
-            elif (
-                self.min_shear_centre_long_spacing >= 125
-                and self.min_shear_centre_long_spacing < 150
-            ):
-                self.min_shear_centre_long_spacing = 125
-            elif self.min_shear_centre_long_spacing < 125:
-                self.min_shear_centre_long_spacing = 100
+            self.min_shear_long_spacing = self.round_shear_spacing(
+                min_shear_long_spacing
+            )
+            self.min_shear_centre_long_spacing = self.round_shear_spacing(
+                min([(self.eff_depth / 2), 250])
+            )
+
+    def round_shear_spacing(self, spacing):
+        """This method rounds a longitudinal spacing limit down to the largest shear spacing in SHEAR_SPACINGS
+        which does not exceed it, or to the smallest shear spacing when every one exceeds it.
+
+        Args:
+            spacing (float): The longitudinal spacing limit in mm.
+
+        Returns:
+            int: The shear spacing the links are detailed at, at most.
+        """
+        fitting = [i for i in self.SHEAR_SPACINGS if i <= spacing]
+        return max(fitting) if fitting else min(self.SHEAR_SPACINGS)
 
     def modify_shear_reinf(self):
         """This method overrides the middle shear spacing to assess if the codal maximum is met. If it isn't, it sets it to the codal maximum and then iterates through
         the design. For the left and right shear portions, the legs and spacing are set to be the same and recalculated to assess if a smaller dia is achievable.
         """
-        shear_dia_list = [12, 16, 20, 25]
+        shear_dia_list = list(self.SHEAR_DIAMETERS)
 
         paired_values = []
 
         shear_spacing_list = [
-            250,
-            200,
-            150,
-            125,
-            100,
-            self.min_shear_centre_long_spacing,
+            spacing
+            for spacing in self.SHEAR_SPACINGS
+            if spacing <= self.min_shear_centre_long_spacing
         ]
         check_shear = [
             self.shear_left_string,
             self.shear_middle_string,
             self.shear_right_string,
         ]
-        shear_spacing_list = list(
-            set(
-                spacing
-                for spacing in shear_spacing_list
-                if spacing <= self.min_shear_centre_long_spacing
-            )
-        )
-        shear_spacing_list.sort(reverse=True)
 
         if (
             "Overstressed. Please re-assess" not in check_shear
             and self.min_shear_centre_long_spacing != 0
             and self.min_shear_long_spacing != 0
         ):
-            left_legs = self.shear_left_string[0]
-            middle_legs = self.shear_middle_string[0]
-            right_legs = self.shear_right_string[0]
-            left_legs = int(left_legs)
-            middle_legs = int(middle_legs)
-            right_legs = int(right_legs)
+            # Split the legs and spacing out of each string, as either may have any number of digits.
+            left_legs, left_spacing = Beam.get_shear_legs_and_spacing(
+                self.shear_left_string
+            )
+            middle_legs, _ = Beam.get_shear_legs_and_spacing(self.shear_middle_string)
+            right_legs, right_spacing = Beam.get_shear_legs_and_spacing(
+                self.shear_right_string
+            )
             self.final_shear_legs = max(left_legs, middle_legs, right_legs)
 
-            left_spacing = self.shear_left_string[-3:]
-            right_spacing = self.shear_right_string[-3:]
-            left_spacing = int(left_spacing)
-            right_spacing = int(right_spacing)
             final_spacing = min([left_spacing, right_spacing])
 
             target = [self.req_total_left_shear_reinf, self.req_total_right_shear_reinf]
@@ -1035,7 +1029,9 @@ class Beam:
             self.shear_left_string = paired_values[0][1]
             self.shear_right_string = paired_values[1][1]
 
-            shear_middle_spacing = int(self.shear_middle_string[-3:])  # type: ignore
+            _, shear_middle_spacing = Beam.get_shear_legs_and_spacing(
+                self.shear_middle_string  # type: ignore
+            )
             if shear_middle_spacing < self.min_shear_centre_long_spacing:
                 found = False
                 for dia in shear_dia_list:
@@ -1,20 +1,24 @@
-from nicegui import app, ui
+from nicegui import ui
+from static_assets import asset_url
 
-# Turn on dark mode for the website.
-ui.dark_mode().enable()
 
-# Call the Eva Icons for icon usage.
-ui.add_head_html(
-    '<link href="https://unpkg.com/eva-icons@1.1.3/style/eva-icons.css" rel="stylesheet">'
-)
+# Set up the page theme and head, which each client's page requires.
+def page_head():
+    """This function turns on dark mode and adds the Eva Icons stylesheet to the page."""
+    # Turn on dark mode for the website.
+    ui.dark_mode().enable()
+
+    # Call the Eva Icons for icon usage, served from the bundled assets rather than a CDN.
+    ui.add_head_html(
+        f'<link href="{asset_url("eva-icons/eva-icons.css")}" rel="stylesheet">'
+    )
 
 
 # Create function which describes limitations and requirements of beam scheduler.
 def start_popup():
     """This function aims to clarify what the beam scheduler does and what it requires
     to run properly."""
-    with ui.dialog() as dialog, ui.card().classes("w-fit"):
-        app.on_startup(dialog)
+    with ui.dialog(value=True) as dialog, ui.card().classes("w-fit"):
         ui.label("Beam Scheduler v1.0").classes("self-center font-bold text-4xl -my-2")
         ui.label("Made by Adnan Almulla @ Killa Design").classes("self-center text-2xl")
         ui.label(
@@ -107,8 +111,13 @@ def ui_header():
 
 
 # Create main row in the centre of the page which contains the upload and download functionality.
-def main_row(upload_handler):
-    """This function holds the main row which carries the upload and download functionality."""
+def main_row(upload_handler, max_file_size=None):
+    """This function holds the main row which carries the upload and download functionality.
+
+    Args:
+        upload_handler (callable): Handles each uploaded spreadsheet.
+        max_file_size (int, optional): The largest spreadsheet accepted, in bytes. Defaults to no limit.
+    """
     with ui.grid(columns=3).classes("w-full no-wrap mt-64"):
         with ui.row().classes("pt-8 pb-6 pr-6 pl-10 justify-start items-start"):
             pass
@@ -128,14 +137,33 @@ def main_row(upload_handler):
                 label="",
                 on_upload=upload_handler,
                 auto_upload=True,
+                max_file_size=max_file_size,
                 on_rejected=lambda: ui.notify(
-                    "Please only upload an excel spreadsheet (.xlsx)", type="warning"
+                    "Please only upload an excel spreadsheet (.xlsx) within the size limit",
+                    type="warning",
                 ),
             ).classes("w-96 text-lg self-center").props('accept=".xlsx"')
         with ui.row().classes("pt-8 pb-6 pr-6 pl-10 justify-start items-start"):
             pass
 
 
+# Create the progress display shown while a beam schedule is processed.
+def progress_display(cancel_handler):
+    """This function holds the label and bar which show the progress of a processing beam schedule,
+    along with the button which cancels it.
+
+    Returns:
+        tuple: The column holding the display, its label, and its progress bar.
+    """
+    with ui.column().classes("w-full items-center mt-5") as progress_column:
+        progress_label = ui.label("Waiting for a free worker...").classes("text-lg")
+        progress_bar = ui.linear_progress(value=0, show_value=False).classes("w-96")
+        ui.button("cancel", on_click=cancel_handler, color="#9C0006").classes(
+            "text-lg font-bold self-center rounded-full"
+        )
+    return progress_column, progress_label, progress_bar
+
+
 @ui.refreshable
 def download_button():
     main_container = ui.grid(columns=1).classes("w-full no-wrap")
@@ -0,0 +1,233 @@
+import argparse
+import importlib
+import sys
+
+from results import OUTPUT_SUFFIX
+
+
+def add_design_cache_arguments(parser):
+    """This function adds the design cache options to a command.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the command.
+    """
+    parser.add_argument(
+        "--design-cache",
+        help="The design cache shared across runs. Defaults to the configured cache.",
+    )
+    parser.add_argument(
+        "--no-design-cache",
+        action="store_true",
+        help="Design every beam without looking it up in the design cache.",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """This function builds the command line parser and its subcommands.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="beam-scheduler",
+        description="Produce beam reinforcement schedules from ETABS design exports without the GUI.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser(
+        "batch", help="Process many ETABS workbooks in parallel."
+    )
+    batch.add_argument(
+        "inputs",
+        nargs="+",
+        help="ETABS workbooks or glob patterns, such as exports/*.xlsx.",
+    )
+    batch.add_argument(
+        "-o",
+        "--output-dir",
+        help="The folder to write the schedules to. Defaults to alongside each input.",
+    )
+    batch.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the CPU count.",
+    )
+    batch.add_argument(
+        "--types",
+        type=float,
+        nargs="?",
+        const=0.0,
+        default=None,
+        metavar="TOLERANCE",
+        help="Rationalise each schedule into beam types, merging types within this fraction of extra"
+        " steel, such as 0.1. Defaults to identical beams only when no tolerance is given.",
+    )
+    batch.add_argument(
+        "--by-storey",
+        action="store_true",
+        help="Design each storey on a separate worker, writing each storey's schedule to a folder as"
+        " soon as it is designed. Suits a few large exports rather than many small ones.",
+    )
+    add_design_cache_arguments(batch)
+    batch.set_defaults(module="batch_processing")
+
+    watch = subparsers.add_parser(
+        "watch",
+        help="Process new or changed ETABS workbooks saved to a folder.",
+    )
+    watch.add_argument("folder", help="The folder to watch.")
+    watch.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the CPU count.",
+    )
+    watch.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="The seconds a workbook must remain unchanged before it is processed.",
+    )
+    watch.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="The seconds between scans of the folder.",
+    )
+    add_design_cache_arguments(watch)
+    watch.set_defaults(module="folder_watcher")
+
+    merge = subparsers.add_parser(
+        "merge",
+        help="Design the governing envelope of several ETABS runs into one schedule.",
+    )
+    merge.add_argument(
+        "inputs",
+        nargs="+",
+        help="The ETABS workbooks of each run, or glob patterns, such as stages/*.xlsx.",
+    )
+    merge.add_argument(
+        "-o",
+        "--output",
+        default="merged" + OUTPUT_SUFFIX,
+        help=f"The schedule to write. Defaults to merged{OUTPUT_SUFFIX}.",
+    )
+    merge.add_argument(
+        "--types",
+        type=float,
+        nargs="?",
+        const=0.0,
+        default=None,
+        metavar="TOLERANCE",
+        help="Rationalise the schedule into beam types, merging types within this fraction of extra steel.",
+    )
+    add_design_cache_arguments(merge)
+    merge.set_defaults(module="envelope_merging")
+
+    sweep = subparsers.add_parser(
+        "sweep",
+        help="Compare the steel and failures of one export under variants of the detailing rules.",
+    )
+    sweep.add_argument("input", help="The ETABS workbook to design.")
+    sweep.add_argument(
+        "variants",
+        help="A JSON file listing the variants, each changing any of flexure_diameters, shear_diameters,"
+        " shear_spacings, side_face_diameters, side_face_spacings, and cover.",
+    )
+    sweep.add_argument(
+        "-o",
+        "--output",
+        default="design_sweep.xlsx",
+        help="The summary to write. Defaults to design_sweep.xlsx.",
+    )
+    sweep.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the CPU count.",
+    )
+    sweep.add_argument(
+        "--include-current",
+        action="store_true",
+        help="Design the current rules first, as the baseline of the steel change.",
+    )
+    sweep.set_defaults(module="design_sweep")
+
+    generate = subparsers.add_parser(
+        "generate",
+        help="Write a synthetic ETABS design export, for testing and benchmarking at scale.",
+    )
+    generate.add_argument(
+        "output",
+        help="The export to write, as text tables if it ends in .txt, and as a workbook otherwise.",
+    )
+    generate.add_argument(
+        "-n", "--beams", type=int, default=1000, help="The number of beams."
+    )
+    generate.add_argument(
+        "--storeys", type=int, default=10, help="The number of storeys."
+    )
+    generate.add_argument(
+        "--section",
+        action="append",
+        metavar="SECTION=SHARE",
+        help="A section and its share of the beams, repeated for each section of the mix.",
+    )
+    generate.add_argument(
+        "--os-rate",
+        type=float,
+        default=0.0,
+        help="The fraction of beams overstressed.",
+    )
+    generate.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="The fraction of beams with a malformed section, which invalidates the export.",
+    )
+    generate.add_argument(
+        "--seed", type=int, default=0, help="The seed of the random demands."
+    )
+    generate.set_defaults(module="etabs_generator")
+
+    diff = subparsers.add_parser(
+        "diff",
+        help="Report the beams whose reinforcement changed between two revisions.",
+    )
+    diff.add_argument(
+        "previous",
+        help="The earlier ETABS workbook, or stored revision with --project.",
+    )
+    diff.add_argument(
+        "current", help="The later ETABS workbook, or stored revision with --project."
+    )
+    diff.add_argument(
+        "-o",
+        "--output",
+        default="schedule_changes.xlsx",
+        help="The change sheet to write. Defaults to schedule_changes.xlsx.",
+    )
+    diff.add_argument(
+        "--project",
+        help="Compare two revisions of this project stored in the schedule database.",
+    )
+    diff.add_argument(
+        "--database",
+        help="The schedule database. Defaults to the configured database.",
+    )
+    diff.set_defaults(module="schedule_diff")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    # Each command is run by its feature module, which is only imported once the command is chosen.
+    return importlib.import_module(args.module).run_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import settings
+
+# The table of the design cache. Each entry holds the designed schedule values of one beam, keyed by its
+# normalised inputs, with its size and when it was last used for the least recently used eviction.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS designs_last_used ON designs (last_used);
+"""
+
+# SQLite limits the number of parameters in a statement, so keys are looked up in batches of this size.
+KEY_BATCH_SIZE = 500
+
+
+def encode_value(value):
+    """This function converts the numpy values of a beam's inputs and design into plain Python values,
+    so they are written to JSON.
+
+    Args:
+        value (object): A value json cannot encode itself.
+
+    Returns:
+        object: The plain value, or its string representation.
+    """
+    return getattr(value, "item", lambda: str(value))()
+
+
+def design_rules_hash(parameters) -> str:
+    """This function fingerprints the design rules, from the design parameters and the source of the beam
+    design class. Entries designed under other rules are never matched, and age out of the cache.
+
+    Args:
+        parameters (dict): The design parameters, as returned by df_processing.design_parameters.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    import beam_calculator_class
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(parameters, sort_keys=True).encode("utf-8"))
+    with open(beam_calculator_class.__file__, "rb") as file:
+        digest.update(file.read())
+    return digest.hexdigest()
+
+
+def design_cache_path(args):
+    """This function finds the design cache a command uses, which is the configured cache unless another
+    is given or the cache is turned off.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        str: The path of the design cache, or None when it is turned off.
+    """
+    if args.no_design_cache:
+        return None
+    return args.design_cache or settings.DESIGN_CACHE or None
+
+
+class DesignCache:
+    """This class caches the design of each beam in a local SQLite database shared by every project. A beam
+    is keyed by its section and demands without its storey or etabs id, along with the design rules, so a
+    beam repeated within or across projects is designed once and looked up afterwards. The cache is bounded
+    in size, evicting the least recently used designs first. A connection is opened per call, so the cache is
+    safe to use from worker threads and processes alike.
+    """
+
+    def __init__(self, path, max_mb=256):
+        """Begin by creating the database and its table if they do not exist.
+
+        Args:
+            path (str): The path of the SQLite database file.
+            max_mb (float, optional): The size, in MB, of the designs kept. Defaults to 256.
+        """
+        self.path = path
+        self._rules = None
+        self.max_bytes = int(max_mb * 1024**2)
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """This method opens a connection to the database."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    @property
+    def rules(self) -> str:
+        """This property fingerprints the design rules on first use, so the design engine is only imported
+        once a beam is designed.
+
+        Returns:
+            str: The hexadecimal fingerprint of the design rules.
+        """
+        if self._rules is None:
+            import df_processing as pr
+
+            self._rules = design_rules_hash(pr.design_parameters())
+        return self._rules
+
+    def keys(self, beam_inputs) -> list:
+        """This method normalises the inputs of each beam into its cache key. The storey and etabs id are
+        left out, as they do not affect the design.
+
+        Args:
+            beam_inputs (list): The inputs of each beam, as returned by df_processing.extract_beam_inputs.
+
+        Returns:
+            list: A hexadecimal key per beam.
+        """
+        return [
+            hashlib.blake2b(
+                json.dumps(
+                    [self.rules, *inputs[2:]],
+                    default=encode_value,
+                    separators=(",", ":"),
+                ).encode("utf-8"),
+                digest_size=16,
+            ).hexdigest()
+            for inputs in beam_inputs
+        ]
+
+    def get_many(self, keys) -> dict:
+        """This method looks up the designs of many beams at once, marking those found as recently used.
+
+        Args:
+            keys (list): The keys of the beams, as returned by keys.
+
+        Returns:
+            dict: The designed schedule values of each beam found, by key.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        connection = self._connect()
+        try:
+            with connection:
+                # The lookups are followed by writes, so the write lock is taken up front. A read upgraded
+                # to a write fails at once, without waiting, if another process wrote in between.
+                connection.execute("BEGIN IMMEDIATE")
+                for start in range(0, len(unique_keys), KEY_BATCH_SIZE):
+                    batch = unique_keys[start : start + KEY_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = connection.execute(
+                        f"SELECT key, payload FROM designs WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                    found.update((key, json.loads(payload)) for key, payload in rows)
+                    connection.execute(
+                        f"UPDATE designs SET last_used = ? WHERE key IN ({placeholders})",
+                        [time.time(), *batch],
+                    )
+        finally:
+            connection.close()
+        return found
+
+    def put_many(self, designs):
+        """This method stores the designs of many beams, then evicts the least recently used designs while
+        the cache is over its size.
+
+        Args:
+            designs (dict): The designed schedule values of each beam, by key.
+        """
+        now = time.time()
+        rows = []
+        for key, values in designs.items():
+            payload = json.dumps(
+                values, default=encode_value, separators=(",", ":")
+            ).encode("utf-8")
+            rows.append((key, payload, len(payload), now))
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO designs VALUES (?, ?, ?, ?)", rows
+                )
+                self._evict(connection)
+        finally:
+            connection.close()
+
+    def _evict(self, connection):
+        """This method deletes the least recently used designs beyond the size of the cache.
+
+        Args:
+            connection (sqlite3.Connection): The open connection to evict through.
+        """
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM designs"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        connection.execute(
+            """
+            DELETE FROM designs WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS kept
+                    FROM designs
+                ) WHERE kept > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+    def stats(self) -> dict:
+        """This method reports the number of designs cached and their size.
+
+        Returns:
+            dict: The number of designs and their size in bytes.
+        """
+        connection = self._connect()
+        try:
+            count, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM designs"
+            ).fetchone()
+        finally:
+            connection.close()
+        return {"designs": count, "bytes": size}
+
+    def clear(self):
+        """This method deletes every cached design."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM designs")
+        finally:
+            connection.close()
@@ -0,0 +1,304 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import df_processing as pr
+import export_processing as ex
+import quantity_takeoff as qt
+from beam_calculator_class import Beam
+from results import EXIT_FAILED, EXIT_OK, INVALID_RESULTS
+
+# The detailing rules a variant may change, and the Beam constants they replace.
+CATALOGUE_ATTRIBUTES = {
+    "flexure_diameters": "FLEXURE_DIAMETERS",
+    "shear_diameters": "SHEAR_DIAMETERS",
+    "shear_spacings": "SHEAR_SPACINGS",
+    "side_face_diameters": "SIDE_FACE_DIAMETERS",
+    "side_face_spacings": "SIDE_FACE_SPACINGS",
+    "cover": "COVER",
+}
+
+SWEEP_COLUMNS = [
+    "Variant",
+    "Beams",
+    "Failed Beams",
+    "Designed Steel (t)",
+    "Compared Beams",
+    "Compared Steel (t)",
+    "Steel Change (%)",
+    "Seconds",
+    "Error",
+]
+
+
+def valid_rule(key, value) -> bool:
+    """This function checks the value of one detailing rule of a variant.
+
+    Args:
+        key (str): The rule, one of the keys of CATALOGUE_ATTRIBUTES.
+        value (object): The value the variant sets.
+
+    Returns:
+        bool: Whether the cover is a positive number, or the sizes or spacings a non-empty list of positive
+            integers.
+    """
+
+    def positive(number, kinds):
+        return isinstance(number, kinds) and not isinstance(number, bool) and number > 0
+
+    if key == "cover":
+        return positive(value, (int, float))
+    return (
+        isinstance(value, (list, tuple))
+        and len(value) > 0
+        and all(positive(number, int) for number in value)
+    )
+
+
+def catalogue(variant) -> dict:
+    """This function completes a variant's detailing rules with the Beam defaults for those it leaves out.
+
+    Args:
+        variant (dict): The variant's name and the detailing rules it changes, by the keys of
+            CATALOGUE_ATTRIBUTES.
+
+    Raises:
+        ValueError: The variant changes a rule which is not in the catalogue, or sets a cover which is not
+            a positive number, or sizes and spacings which are not a non-empty list of positive integers.
+
+    Returns:
+        dict: Every detailing rule of the variant, by Beam constant.
+    """
+    unknown = set(variant) - set(CATALOGUE_ATTRIBUTES) - {"name"}
+    if unknown:
+        raise ValueError(
+            f"Variant {variant.get('name')} has unknown rules: {', '.join(sorted(unknown))}"
+        )
+    rules = {}
+    for key, attribute in CATALOGUE_ATTRIBUTES.items():
+        value = variant.get(key, getattr(Beam, attribute))
+        if not valid_rule(key, value):
+            expected = (
+                "a positive number"
+                if key == "cover"
+                else "a non-empty list of positive integers"
+            )
+            raise ValueError(
+                f"Variant {variant.get('name')} sets {key} to {value!r}, not {expected}"
+            )
+        # The lists keep the order given, as the design takes the first size or spacing which works.
+        rules[attribute] = value if key == "cover" else tuple(value)
+    return rules
+
+
+def load_variants(path) -> list:
+    """This function loads the variants of a sweep from a JSON file holding a list of variants, such as
+    [{"name": "No T32", "flexure_diameters": [16, 20, 25]}, {"name": "50 cover", "cover": 50}].
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Raises:
+        ValueError: The file does not hold a list of variants, or a variant is not valid.
+
+    Returns:
+        list: The variants, each named.
+    """
+    with open(path, encoding="utf-8") as file:
+        variants = json.load(file)
+    if not isinstance(variants, list) or not all(
+        isinstance(variant, dict) for variant in variants
+    ):
+        raise ValueError(f"{os.path.basename(path)} does not hold a list of variants")
+    for index, variant in enumerate(variants, start=1):
+        variant.setdefault("name", f"Variant {index}")
+        catalogue(variant)
+    return variants
+
+
+def design_schedule(beam_inputs, rules) -> pd.DataFrame:
+    """This function designs every beam under a set of detailing rules. The rules are set on each beam
+    instance, shadowing the Beam defaults, so the parsed inputs are shared by every variant.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by df_processing.extract_beam_inputs.
+        rules (dict): The Beam class attributes to set, as returned by catalogue.
+
+    Returns:
+        pd.DataFrame: The beam schedule under the rules.
+    """
+    beam_instances = []
+    for inputs in beam_inputs:
+        beam = pr.create_instance(*inputs)
+        for attribute, value in rules.items():
+            setattr(beam, attribute, value)
+        beam_instances.append(beam)
+    pr.design_beams(beam_instances)
+    return pr.create_schedule(beam_instances)
+
+
+def design_variant(beam_inputs, variant) -> dict:
+    """This function designs every beam under a variant's detailing rules and summarises the outcome. It is
+    run within the worker processes of run_sweep, so it must remain a module level function.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by df_processing.extract_beam_inputs.
+        variant (dict): The variant's name and the detailing rules it changes.
+
+    Returns:
+        dict: The variant's name, beam count, failed beams, and the steel tonnage of its designed beams,
+            with the steel of each beam, or NaN for each failed beam.
+    """
+    start = time.perf_counter()
+    rules = catalogue(variant)
+    beam_schedule_df = design_schedule(beam_inputs, rules)
+
+    statuses = beam_schedule_df[
+        [(group, "Status") for group in pr.CRITERIA_GROUPS]
+    ].astype(str)
+    failed = (statuses != "OK").any(axis=1).to_numpy()
+    takeoff_df = qt.steel_takeoff(beam_schedule_df, cover=rules["COVER"])
+    beam_steel = np.where(failed, np.nan, takeoff_df["Total (kg)"].to_numpy())
+    return {
+        "Variant": variant["name"],
+        "Beams": len(beam_schedule_df),
+        "Failed Beams": int(failed.sum()),
+        "Designed Steel (t)": float(np.nansum(beam_steel)) / 1000,
+        "Beam Steel (kg)": beam_steel,
+        "Seconds": time.perf_counter() - start,
+    }
+
+
+def failed_variant(variant, error) -> dict:
+    """This function summarises a variant whose design failed, so the rest of the sweep is kept.
+
+    Args:
+        variant (dict): The variant's name and the detailing rules it changes.
+        error (Exception): The error raised designing the variant.
+
+    Returns:
+        dict: The variant's name and the error.
+    """
+    return {"Variant": variant["name"], "Error": f"{type(error).__name__}: {error}"}
+
+
+def compare_steel(summaries):
+    """This function totals the steel of each variant over only the beams which design under every variant.
+    A failed beam has no steel, so a variant failing more beams would otherwise appear lighter.
+
+    Args:
+        summaries (list): The summary of each variant, as returned by design_variant or failed_variant.
+            The steel of each beam is replaced by the compared beams and their steel tonnage.
+    """
+    designed = [summary for summary in summaries if "Beam Steel (kg)" in summary]
+    if not designed:
+        return
+    compared = np.logical_and.reduce(
+        [~np.isnan(summary["Beam Steel (kg)"]) for summary in designed]
+    )
+    for summary in designed:
+        beam_steel = summary.pop("Beam Steel (kg)")
+        summary["Compared Beams"] = int(compared.sum())
+        summary["Compared Steel (t)"] = float(beam_steel[compared].sum()) / 1000
+
+
+def run_sweep(beam_inputs, variants, workers=None) -> pd.DataFrame:
+    """This function designs the same parsed beams under each variant across a pool of worker processes,
+    and tabulates the summary of each variant for comparison. A variant whose design fails is reported by
+    its error, without failing the other variants.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by df_processing.extract_beam_inputs.
+        variants (list): The variants to design, each named.
+        workers (int, optional): The number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        pd.DataFrame: One row per variant, in the order given, with its steel over the beams every variant
+            designs relative to the first, and the error of each variant which failed.
+    """
+    if len(variants) <= 1 or workers == 1:
+        summaries = []
+        for variant in variants:
+            try:
+                summaries.append(design_variant(beam_inputs, variant))
+            except Exception as error:
+                summaries.append(failed_variant(variant, error))
+    else:
+        summaries = [None] * len(variants)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(design_variant, beam_inputs, variant): index
+                for index, variant in enumerate(variants)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    summaries[index] = future.result()
+                except Exception as error:
+                    summaries[index] = failed_variant(variants[index], error)
+
+    compare_steel(summaries)
+    sweep_df = pd.DataFrame(summaries, columns=SWEEP_COLUMNS)
+    if not sweep_df.empty:
+        baseline = sweep_df["Compared Steel (t)"].iloc[0]
+        sweep_df["Steel Change (%)"] = (
+            sweep_df["Compared Steel (t)"] / baseline - 1
+        ) * 100
+    return sweep_df
+
+
+def run_command(args) -> int:
+    """This function runs the sweep command, designing one export under each variant of the detailing
+    rules and writing the steel and failures of each.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    try:
+        variants = load_variants(args.variants)
+    except (OSError, ValueError) as error:
+        print(f"The variants could not be loaded: {error}", file=sys.stderr)
+        return EXIT_FAILED
+    if args.include_current:
+        variants.insert(0, {"name": "Current rules"})
+
+    start = time.perf_counter()
+    # The export is parsed once, and its inputs shared by every variant.
+    workbook = pr.read_workbook(args.input)
+    beam_inputs = (
+        workbook if isinstance(workbook, str) else pr.extract_beam_inputs(*workbook)
+    )
+    if isinstance(beam_inputs, str):
+        print(
+            f"{args.input}: {INVALID_RESULTS.get(beam_inputs, beam_inputs)}",
+            file=sys.stderr,
+        )
+        return EXIT_FAILED
+
+    sweep_df = run_sweep(beam_inputs, variants, args.workers)
+    with open(args.output, "wb") as file:
+        file.write(ex.export_sweep(sweep_df))
+    failed = 0
+    for summary in sweep_df.to_dict("records"):
+        if isinstance(summary["Error"], str):
+            failed += 1
+            print(f"{summary['Variant']}: failed, {summary['Error']}", file=sys.stderr)
+            continue
+        print(
+            f"{summary['Variant']}: {summary['Compared Steel (t)']:.2f} t"
+            f" ({summary['Steel Change (%)']:+.1f}%) over the {summary['Compared Beams']} beams"
+            f" every variant designs, {summary['Failed Beams']} failed beam(s)"
+        )
+    print(
+        f"Designed {len(beam_inputs)} beams under {len(variants)} variant(s), {failed} failed."
+        f" Wrote {args.output} in {time.perf_counter() - start:.2f} s."
+    )
+    return EXIT_FAILED if failed else EXIT_OK
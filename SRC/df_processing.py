@@ -1,7 +1,235 @@
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from beam_calculator_class import Beam
 import pandas as pd
 
 
+# The titles of the flexure and shear envelope tables in an ETABS design export.
+FLEXURE_TABLE = "TABLE:  Concrete Beam Flexure Envelope - ACI 318-19"
+SHEAR_TABLE = "TABLE:  Concrete Beam Shear Envelope - ACI 318-19"
+
+# The number of beams designed between progress reports.
+BEAM_CHUNK_SIZE = 100
+
+# The version of the design rules. Increase it whenever a change to the design alters the schedules it
+# produces, so that schedules stored under earlier rules are not mistaken for current ones.
+DESIGN_RULES_VERSION = 2
+
+# Map the relevant beam attributes to the beam schedule dataframe columns:
+BEAM_MAPPING = {
+    "story": ("Storey", ""),
+    "id": ("Etabs ID", ""),
+    "width": ("Dimensions", "Width (mm)"),
+    "depth": ("Dimensions", "Depth (mm)"),
+    "flex_bot_left_rebar_string": ("Bottom Reinforcement", "Left (BL)"),
+    "flex_bot_middle_rebar_string": ("Bottom Reinforcement", "Middle (B)"),
+    "flex_bot_right_rebar_string": ("Bottom Reinforcement", "Right (BR)"),
+    "flex_top_left_rebar_string": ("Top Reinforcement", "Left (TL)"),
+    "flex_top_middle_rebar_string": ("Top Reinforcement", "Middle (T)"),
+    "flex_top_right_rebar_string": ("Top Reinforcement", "Right (TR)"),
+    "selected_side_face_reinforcement_string": ("Side Face Reinforcement", ""),
+    "shear_left_string": ("Shear links", "Left (H)"),
+    "shear_middle_string": ("Shear links", "Middle (J)"),
+    "shear_right_string": ("Shear links", "Right (K)"),
+    "transverse_space_check": ("Check Transverse Shear Spacing?", ""),
+    "req_bot_left_flex_reinf": (
+        "Flexural BL Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_bot_left_rebar_area": (
+        "Flexural BL Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_bot_middle_flex_reinf": (
+        "Flexural BM Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_bot_middle_rebar_area": (
+        "Flexural BM Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_bot_right_flex_reinf": (
+        "Flexural BR Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_bot_right_rebar_area": (
+        "Flexural BR Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_top_left_flex_reinf": (
+        "Flexural TL Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_top_left_rebar_area": (
+        "Flexural TL Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_top_middle_flex_reinf": (
+        "Flexural TM Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_top_middle_rebar_area": (
+        "Flexural TM Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_top_right_flex_reinf": (
+        "Flexural TR Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "flex_top_right_rebar_area": (
+        "Flexural TR Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_total_left_shear_reinf": (
+        "Shear L Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "shear_left_area": (
+        "Shear L Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_total_middle_shear_reinf": (
+        "Shear M Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "shear_middle_area": (
+        "Shear M Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+    "req_total_right_shear_reinf": (
+        "Shear R Reinforcement Criteria",
+        "Required (mm^2)",
+    ),
+    "shear_right_area": (
+        "Shear R Reinforcement Criteria",
+        "Provided (mm^2)",
+    ),
+}
+
+# The criteria groups hold numeric required and provided areas, and are each given a status column.
+CRITERIA_GROUPS = [
+    "Flexural BL Reinforcement Criteria",
+    "Flexural BM Reinforcement Criteria",
+    "Flexural BR Reinforcement Criteria",
+    "Flexural TL Reinforcement Criteria",
+    "Flexural TM Reinforcement Criteria",
+    "Flexural TR Reinforcement Criteria",
+    "Shear L Reinforcement Criteria",
+    "Shear M Reinforcement Criteria",
+    "Shear R Reinforcement Criteria",
+]
+
+# The design statuses a criteria group may hold. Any other message is appended as an extra category.
+DESIGN_STATUSES = [
+    "OK",
+    "Overstressed. Please re-assess",
+    "Increase rebar count or re-assess",
+    "O/S in Shear",
+    "O/S in Torsion",
+    "O/S in Shear and Torsion",
+]
+
+# Order the schedule columns as mapped, with each criteria group's status following its areas.
+SCHEDULE_COLUMNS = []
+for column in BEAM_MAPPING.values():
+    SCHEDULE_COLUMNS.append(column)
+    if column[0] in CRITERIA_GROUPS and column[1] == "Provided (mm^2)":
+        SCHEDULE_COLUMNS.append((column[0], "Status"))
+
+
+def design_parameters() -> dict:
+    """This function describes the design rules the schedules are produced under, so that stored schedules
+    record what they were designed with.
+
+    Returns:
+        dict: The design rules version, with the bar diameters, spacings, and cover the design chooses from.
+    """
+    return {
+        "design_rules_version": DESIGN_RULES_VERSION,
+        "flexure_diameters": list(Beam.FLEXURE_DIAMETERS),
+        "shear_diameters": list(Beam.SHEAR_DIAMETERS),
+        "shear_spacings": list(Beam.SHEAR_SPACINGS),
+        "side_face_diameters": list(Beam.SIDE_FACE_DIAMETERS),
+        "side_face_spacings": list(Beam.SIDE_FACE_SPACINGS),
+        "cover": Beam.COVER,
+    }
+
+
+# Undertake the design calculations of a beam instance.
+def design_beam(beam):
+    """This function runs the design calculations of a beam instance in order, creating the attributes
+    which make up its schedule.
+
+    Args:
+        beam (Beam): The beam instance to design.
+    """
+    # Get the effective depth by multiplying the depth by 0.8.
+    beam.get_eff_depth()
+
+    # Get the longitudinal rebar count.
+    beam.get_long_count()
+
+    # Split the torsion reinforcement to the top and bottom rebar if the depth <= 600mm.
+    beam.flex_torsion_splitting()
+
+    # Begin calculating the required top and bottom longitudinal reinforcement.
+    beam.get_top_flex_rebar_string()
+    beam.get_top_flex_rebar_area()
+
+    beam.get_bot_flex_rebar_string()
+    beam.get_bot_flex_rebar_area()
+
+    # beam.process_bot_flexural_rebar_string()
+
+    # Calculate the residual rebar obtained from the provided against the required.
+    beam.get_residual_rebar()
+
+    # Calculate the required shear legs based on the beams width.
+    beam.get_shear_legs()
+
+    # Assess if the transverse shear spacing needs to be checked.
+    beam.check_transverse_shear_spacing()
+
+    # Calculate the total required shear reinforcement including shear and torsion.
+    beam.get_total_shear_req()
+
+    # Calculate the provided shear reinforcement string and area.
+    beam.get_min_shear_long_spacing()
+    beam.get_shear_string()
+    beam.get_shear_area()
+
+    # Check and replace if necessary the maximum longitudinal shear spacing against Clause 18.4.2.4 of ACI 318-19.
+    beam.modify_shear_reinf()
+
+    # Calculate the allowable side face clear space in beams which have a depth greater than 600mm.
+    beam.get_side_face_clear_space()
+
+    # Calculate the provided side face reinforcement string and area.
+    beam.get_side_face_string()
+    beam.get_side_face_area()
+
+    # Grab the index of the side face reinforcement with the highest area.
+    beam.get_index_for_side_face_reinf()
+
+
+def design_beams(beam_instances, progress=None):
+    """This function designs every beam instance, reporting its progress after each chunk of beams.
+
+    Args:
+        beam_instances (list of Beam): The beam instances to design.
+        progress (ProgressReporter, optional): Receives the number of beams designed. Defaults to None.
+    """
+    total = len(beam_instances)
+    if progress is not None:
+        progress.update("Designing beams", 0, total)
+    for index, beam in enumerate(beam_instances, start=1):
+        design_beam(beam)
+        if progress is not None and (index % BEAM_CHUNK_SIZE == 0 or index == total):
+            progress.update("Designing beams", index, total)
+
+
 # Create all instances of Beam class.
 def create_instance(
     story,
@@ -40,7 +268,154 @@ def create_instance(
     return beam
 
 
-def process_dataframes(flexural_df, shear_df):
+def design_status(required, provided):
+    """This function derives the design status of a criteria group from its required and provided
+    reinforcement columns. Numeric areas are "OK", otherwise the relevant message is taken, preferring the
+    specific shear and torsion messages held in the required column.
+
+    Args:
+        required (pd.Series): The required reinforcement column of the criteria group.
+        provided (pd.Series): The provided reinforcement column of the criteria group.
+
+    Returns:
+        pd.Series: The design status of each beam in the criteria group.
+    """
+    required_messages = required.astype(str)
+    provided_messages = provided.astype(str)
+    status = pd.Series("OK", index=required.index, dtype=object)
+    status = status.mask(
+        pd.to_numeric(provided, errors="coerce").isna(), provided_messages
+    )
+    specific_message = pd.to_numeric(
+        required, errors="coerce"
+    ).isna() & required_messages.str.startswith("O/S in")
+    return status.mask(specific_message, required_messages)
+
+
+def apply_schedule_dtypes(beam_schedule_df):
+    """This function converts the beam schedule columns into their compact typed schema: categorical storey,
+    etabs id and status columns, integer dimensions, and float32 reinforcement areas. Messages which remain
+    in the area columns become NaN, as they are held by the status columns.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The beam schedule with the columns in SCHEDULE_COLUMNS.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule.
+    """
+    typed_columns = {}
+    for column in beam_schedule_df.columns:
+        values = beam_schedule_df[column]
+        if column in [
+            ("Storey", ""),
+            ("Etabs ID", ""),
+            ("Check Transverse Shear Spacing?", ""),
+        ]:
+            values = values.astype(pd.CategoricalDtype(pd.unique(values.dropna())))
+        elif column[0] == "Dimensions":
+            values = values.astype("int32")
+        elif column[1] == "Status":
+            categories = DESIGN_STATUSES + [
+                status
+                for status in pd.unique(values.dropna())
+                if status not in DESIGN_STATUSES
+            ]
+            values = values.astype(pd.CategoricalDtype(categories))
+        elif column[1] in ["Required (mm^2)", "Provided (mm^2)"]:
+            values = pd.to_numeric(values, errors="coerce").astype("float32")
+        typed_columns[column] = values
+    return pd.DataFrame(typed_columns, index=beam_schedule_df.index)
+
+
+def create_schedule(beam_instances):
+    """This function tabulates the designed beam instances into the typed beam schedule dataframe.
+
+    Args:
+        beam_instances (list of Beam): The designed beam instances.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam.
+    """
+    records = [
+        [getattr(beam, attr) for attr in BEAM_MAPPING] for beam in beam_instances
+    ]
+    return tabulate_records(records)
+
+
+def tabulate_records(records):
+    """This function tabulates the schedule values of each beam, in the order of BEAM_MAPPING, into the
+    typed beam schedule dataframe.
+
+    Args:
+        records (list): The schedule values of each beam.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam.
+    """
+    beam_schedule_df = pd.DataFrame(
+        records, columns=pd.MultiIndex.from_tuples(list(BEAM_MAPPING.values()))
+    )
+    for group in CRITERIA_GROUPS:
+        beam_schedule_df[(group, "Status")] = design_status(
+            beam_schedule_df[(group, "Required (mm^2)")],
+            beam_schedule_df[(group, "Provided (mm^2)")],
+        )
+    beam_schedule_df = beam_schedule_df[SCHEDULE_COLUMNS]
+    beam_schedule_df.columns = pd.MultiIndex.from_tuples(SCHEDULE_COLUMNS)
+    return apply_schedule_dtypes(beam_schedule_df)
+
+
+def read_workbook(excel_file):
+    """This function reads the flexure and shear envelopes from an ETABS design export, parsing the
+    workbook once. It checks the workbook holds three sheets, with the flexure and shear envelopes first.
+
+    Args:
+        excel_file (str or file-like): The path or content of the uploaded spreadsheet.
+
+    Returns:
+        tuple: The flexural and shear dataframes, or a string describing why the workbook is incorrect.
+    """
+    workbook = pd.ExcelFile(excel_file)
+    if len(workbook.sheet_names) != 3:
+        return "Incorrect number of sheets"
+    flexural_df = workbook.parse(sheet_name=0)
+    shear_df = workbook.parse(sheet_name=1)
+    if flexural_df.columns[0] != FLEXURE_TABLE or shear_df.columns[0] != SHEAR_TABLE:
+        return "Incorrect sheets"
+    return flexural_df, shear_df
+
+
+def process_workbook(excel_file, progress=None, cache=None):
+    """This function reads, validates and processes an ETABS design export into the beam schedule.
+    It is run in its entirety within a worker, away from the event loop.
+
+    Args:
+        excel_file (str or file-like): The path or content of the uploaded spreadsheet.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The processed beam schedule, or a string describing why it could not be processed.
+    """
+    if progress is not None:
+        progress.update("Reading workbook", 0, 1)
+    workbook = read_workbook(excel_file)
+    if isinstance(workbook, str):
+        return workbook
+    return process_dataframes(*workbook, progress=progress, cache=cache)
+
+
+def extract_beam_inputs(flexural_df, shear_df):
+    """This function extracts the design inputs of each beam from the flexure and shear envelopes of an
+    ETABS design export. Each beam's inputs are the arguments of create_instance, in order.
+
+    Args:
+        flexural_df (pd.DataFrame): The flexure envelope sheet.
+        shear_df (pd.DataFrame): The shear envelope sheet.
+
+    Returns:
+        list: A tuple of inputs per beam, or "Incorrect section definitions".
+    """
     # Remove the first two rows of both dataframes.
     initial_flexural_df = flexural_df.drop([0, 1])
     initial_shear_df = shear_df.drop([0, 1])
@@ -50,9 +425,7 @@ def process_dataframes(flexural_df, shear_df):
     initial_shear_df = initial_shear_df.reset_index(drop=True)
 
     # Slice through the flexural df and get the story identifier.
-    stories = initial_flexural_df[
-        "TABLE:  Concrete Beam Flexure Envelope - ACI 318-19"
-    ].iloc[::3]
+    stories = initial_flexural_df[FLEXURE_TABLE].iloc[::3]
 
     # Slice through the flexural df and get the etabs id.
     e_ids = initial_flexural_df["Unnamed: 1"].iloc[::3]
@@ -226,26 +599,9 @@ def process_dataframes(flexural_df, shear_df):
             for sublist in torsion_reinf_needed
         ]
 
-        # Call create_instance function and create instances of all beams.
-        beam_instances = [
-            create_instance(
-                stories,
-                e_id,
-                width,
-                depth,
-                concrete_grade,
-                pos_flex_combo,
-                neg_flex_combo,
-                req_top_flex_reinf,
-                req_bot_flex_reinf,
-                req_flex_torsion_reinf,
-                shear_force,
-                shear_combo,
-                torsion_combo,
-                req_shear_reinf,
-                req_torsion_reinf,
-            )
-            for stories, e_id, width, depth, concrete_grade, pos_flex_combo, neg_flex_combo, req_top_flex_reinf, req_bot_flex_reinf, req_flex_torsion_reinf, shear_force, shear_combo, torsion_combo, req_shear_reinf, req_torsion_reinf in zip(
+        # Gather the inputs of each beam, in the order of create_instance's arguments.
+        return list(
+            zip(
                 stories,
                 e_ids,
                 beam_widths,
@@ -262,235 +618,272 @@ def process_dataframes(flexural_df, shear_df):
                 shear_reinf_needed,
                 torsion_reinf_needed,
             )
+        )
+    else:
+        return "Incorrect section definitions"
+
+
+def design_inputs(beam_inputs, progress=None, cache=None):
+    """This function designs beams from their extracted inputs and tabulates them into the beam schedule.
+    With a design cache, beams designed before under the same rules are looked up rather than designed,
+    and beams repeated within the export are designed once.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam.
+    """
+    if cache is not None:
+        return design_cached_inputs(beam_inputs, cache, progress)
+
+    # Call create_instance function and create instances of all beams.
+    beam_instances = [create_instance(*inputs) for inputs in beam_inputs]
+
+    # Begin with for loop and create attributes for each beam instance to undertake calculations.
+    design_beams(beam_instances, progress)
+
+    # Tabulate the designed beam instances into the typed beam schedule dataframe.
+    if progress is not None:
+        progress.update("Tabulating schedule", 0, 1)
+    return create_schedule(beam_instances)
+
+
+def design_cached_inputs(beam_inputs, cache, progress=None):
+    """This function designs beams through the design cache. The cache holds each beam's schedule values
+    without its storey and etabs id, which are added back from the beam's inputs.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+        cache (DesignCache): The design cache shared across runs.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam.
+    """
+    keys = cache.keys(beam_inputs)
+    designs = cache.get_many(keys)
+
+    # Design the first beam of each key which is not cached yet.
+    missing = {}
+    for inputs, key in zip(beam_inputs, keys):
+        if key not in designs and key not in missing:
+            missing[key] = create_instance(*inputs)
+    design_beams(list(missing.values()), progress)
+    designed = {
+        key: [getattr(beam, attr) for attr in list(BEAM_MAPPING)[2:]]
+        for key, beam in missing.items()
+    }
+    if designed:
+        cache.put_many(designed)
+    designs.update(designed)
+
+    if progress is not None:
+        progress.update("Tabulating schedule", 0, 1)
+    return tabulate_records(
+        [
+            [inputs[0], inputs[1], *designs[key]]
+            for inputs, key in zip(beam_inputs, keys)
         ]
+    )
 
-        # Begin with for loop and create attributes for each beam instance to undertake calculations.
-        for beam in beam_instances:
-            # Get the effective depth by multiplying the depth by 0.8.
-            beam.get_eff_depth()
-
-            # Get the longitudinal rebar count.
-            beam.get_long_count()
-
-            # Split the torsion reinforcement to the top and bottom rebar if the depth <= 600mm.
-            beam.flex_torsion_splitting()
-
-            # Begin calculating the required top and bottom longitudinal reinforcement.
-            beam.get_top_flex_rebar_string()
-            beam.get_top_flex_rebar_area()
-
-            beam.get_bot_flex_rebar_string()
-            beam.get_bot_flex_rebar_area()
-
-            # beam.process_bot_flexural_rebar_string()
-
-            # Calculate the residual rebar obtained from the provided against the required.
-            beam.get_residual_rebar()
-
-            # Calculate the required shear legs based on the beams width.
-            beam.get_shear_legs()
 
-            # Assess if the transverse shear spacing needs to be checked.
-            beam.check_transverse_shear_spacing()
+def beam_fingerprints(beam_inputs) -> list:
+    """This function fingerprints the inputs of each beam, so that beams whose section or demands have
+    changed between revisions can be found.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+
+    Returns:
+        list: A hexadecimal fingerprint per beam.
+    """
+    return [
+        hashlib.blake2b(
+            json.dumps(
+                inputs,
+                default=lambda value: getattr(value, "item", lambda: str(value))(),
+            ).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        for inputs in beam_inputs
+    ]
+
+
+def redesign_changed(
+    beam_inputs,
+    fingerprints,
+    previous_df,
+    previous_fingerprints,
+    progress=None,
+    cache=None,
+):
+    """This function produces the beam schedule of a new revision from the schedule of a previous one.
+    Beams are matched by storey and etabs id, and only those which are new or whose fingerprint has
+    changed are designed. The rows of the unchanged beams are carried over from the previous schedule.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+        fingerprints (list): The fingerprint of each beam's inputs, as returned by beam_fingerprints.
+        previous_df (pd.DataFrame): The beam schedule of the previous revision.
+        previous_fingerprints (list): The fingerprint of each row of the previous schedule.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam in the order of the new export.
+    """
+    # Map each previous beam to its row. Beams which appear more than once cannot be matched safely.
+    previous_rows = {}
+    keys = zip(
+        previous_df[("Storey", "")].astype(str),
+        previous_df[("Etabs ID", "")].astype(str),
+    )
+    for position, (key, fingerprint) in enumerate(zip(keys, previous_fingerprints)):
+        previous_rows[key] = None if key in previous_rows else (position, fingerprint)
+
+    carried_positions = []
+    carried_order = []
+    changed_inputs = []
+    changed_order = []
+    for order, (inputs, fingerprint) in enumerate(zip(beam_inputs, fingerprints)):
+        previous = previous_rows.get((str(inputs[0]), str(inputs[1])))
+        if previous is not None and previous[1] == fingerprint:
+            carried_positions.append(previous[0])
+            carried_order.append(order)
+        else:
+            changed_inputs.append(inputs)
+            changed_order.append(order)
+
+    frames = [previous_df.iloc[carried_positions].set_axis(carried_order)]
+    if changed_inputs:
+        frames.append(
+            design_inputs(changed_inputs, progress, cache).set_axis(changed_order)
+        )
+    beam_schedule_df = pd.concat(frames).sort_index().reset_index(drop=True)
+    return apply_schedule_dtypes(beam_schedule_df)
+
+
+def partition_by_storey(beam_inputs) -> list:
+    """This function partitions the inputs of each beam by storey, as beams on different storeys are
+    designed independently of each other.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+
+    Returns:
+        list: (storey, positions, inputs) tuples in the order the storeys first appear, holding the
+            position of each beam within the export and its inputs.
+    """
+    partitions = {}
+    for position, inputs in enumerate(beam_inputs):
+        positions, storey_inputs = partitions.setdefault(str(inputs[0]), ([], []))
+        positions.append(position)
+        storey_inputs.append(inputs)
+    return [
+        (storey, positions, storey_inputs)
+        for storey, (positions, storey_inputs) in partitions.items()
+    ]
+
+
+def design_storey(storey, storey_inputs, file_format=None, cache_path=None) -> tuple:
+    """This function designs the beams of one storey, and optionally exports the storey's schedule. It is
+    run within the worker processes of design_by_storey, so it must remain a module level function.
+
+    Args:
+        storey (str): The storey name.
+        storey_inputs (list): The inputs of each beam on the storey.
+        file_format (str, optional): Exports the storey's schedule as "xlsx" or "csv". Defaults to None.
+        cache_path (str, optional): The path of the design cache shared across runs. Defaults to None.
+
+    Returns:
+        tuple: The storey name, its beam schedule, and its exported content or None.
+    """
+    cache = None
+    if cache_path:
+        from design_cache import DesignCache
+
+        cache = DesignCache(cache_path)
+    storey_df = design_inputs(storey_inputs, cache=cache)
+    content = None
+    if file_format is not None:
+        import export_processing as ex
+
+        content = ex.export_storey(storey, storey_df, file_format)[1]
+    return storey, storey_df, content
+
+
+def design_by_storey(beam_inputs, workers=None, file_format=None, cache_path=None):
+    """This function designs each storey on a separate worker process, yielding each storey as soon as it
+    is designed, so the first storeys are available before the whole export is done.
+
+    Args:
+        beam_inputs (list): The inputs of each beam, as returned by extract_beam_inputs.
+        workers (int, optional): The number of worker processes. Defaults to the CPU count.
+        file_format (str, optional): Also exports each storey's schedule as "xlsx" or "csv" within its
+            worker. Defaults to None.
+        cache_path (str, optional): The path of the design cache shared across runs. Defaults to None.
+
+    Yields:
+        tuple: The storey name, the position of each of its beams within the export, its beam schedule,
+            and its exported content or None, in the order the storeys finish.
+    """
+    partitions = partition_by_storey(beam_inputs)
+    # A single storey is quicker to design in process than to send to a worker process.
+    if len(partitions) <= 1 or workers == 1:
+        for storey, positions, storey_inputs in partitions:
+            _, storey_df, content = design_storey(
+                storey, storey_inputs, file_format, cache_path
+            )
+            yield storey, positions, storey_df, content
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                design_storey, storey, storey_inputs, file_format, cache_path
+            ): positions
+            for storey, positions, storey_inputs in partitions
+        }
+        for future in as_completed(futures):
+            storey, storey_df, content = future.result()
+            yield storey, futures[future], storey_df, content
 
-            # Calculate the total required shear reinforcement including shear and torsion.
-            beam.get_total_shear_req()
 
-            # Calculate the provided shear reinforcement string and area.
-            beam.get_min_shear_long_spacing()
-            beam.get_shear_string()
-            beam.get_shear_area()
+def assemble_storeys(storeys):
+    """This function assembles the schedules of each storey into the beam schedule, in the order of the
+    export.
 
-            # Check and replace if necessary the maximum longitudinal shear spacing against Clause 18.4.2.4 of ACI 318-19.
-            beam.modify_shear_reinf()
+    Args:
+        storeys (list): (positions, storey schedule) tuples, as designed by design_by_storey.
 
-            # Calculate the allowable side face clear space in beams which have a depth greater than 600mm.
-            beam.get_side_face_clear_space()
+    Returns:
+        pd.DataFrame: The typed beam schedule, with one row per beam.
+    """
+    beam_schedule_df = pd.concat(
+        [storey_df.set_axis(positions) for positions, storey_df in storeys]
+    )
+    return apply_schedule_dtypes(beam_schedule_df.sort_index().reset_index(drop=True))
 
-            # Calculate the provided side face reinforcement string and area.
-            beam.get_side_face_string()
-            beam.get_side_face_area()
 
-            # Grab the index of the side face reinforcement with the highest area.
-            beam.get_index_for_side_face_reinf()
+def process_dataframes(flexural_df, shear_df, progress=None, cache=None):
+    """This function processes the flexure and shear envelopes of an ETABS design export into the beam
+    schedule. Its progress through each stage is reported to the optional progress reporter.
 
-        # Create dataframe to fill data with.
-        columns = pd.MultiIndex.from_tuples(
-            [
-                ("Storey", ""),
-                ("Etabs ID", ""),
-                ("Dimensions", "Width (mm)"),
-                ("Dimensions", "Depth (mm)"),
-                ("Bottom Reinforcement", "Left (BL)"),
-                ("Bottom Reinforcement", "Middle (B)"),
-                ("Bottom Reinforcement", "Right (BR)"),
-                ("Top Reinforcement", "Left (TL)"),
-                ("Top Reinforcement", "Middle (T)"),
-                ("Top Reinforcement", "Right (TR)"),
-                ("Side Face Reinforcement", ""),
-                ("Shear links", "Left (H)"),
-                ("Shear links", "Middle (J)"),
-                ("Shear links", "Right (K)"),
-                ("Check Transverse Shear Spacing?", ""),
-                (
-                    "Flexural BL Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural BL Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                (
-                    "Flexural BM Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural BM Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                (
-                    "Flexural BR Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural BR Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                (
-                    "Flexural TL Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural TL Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                (
-                    "Flexural TM Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural TM Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                (
-                    "Flexural TR Reinforcement Criteria",
-                    "Required (mm^2)",
-                ),
-                (
-                    "Flexural TR Reinforcement Criteria",
-                    "Provided (mm^2)",
-                ),
-                ("Shear L Reinforcement Criteria", "Required (mm^2)"),
-                ("Shear L Reinforcement Criteria", "Provided (mm^2)"),
-                ("Shear M Reinforcement Criteria", "Required (mm^2)"),
-                ("Shear M Reinforcement Criteria", "Provided (mm^2)"),
-                ("Shear R Reinforcement Criteria", "Required (mm^2)"),
-                ("Shear R Reinforcement Criteria", "Provided (mm^2)"),
-            ]
-        )
-        beam_schedule_df = pd.DataFrame(columns=columns)
-
-        # Map the relevant beam attributes to the beam schedule dataframe columns:
-        beam_mapping = {
-            "story": ("Storey", ""),
-            "id": ("Etabs ID", ""),
-            "width": ("Dimensions", "Width (mm)"),
-            "depth": ("Dimensions", "Depth (mm)"),
-            "flex_bot_left_rebar_string": ("Bottom Reinforcement", "Left (BL)"),
-            "flex_bot_middle_rebar_string": ("Bottom Reinforcement", "Middle (B)"),
-            "flex_bot_right_rebar_string": ("Bottom Reinforcement", "Right (BR)"),
-            "flex_top_left_rebar_string": ("Top Reinforcement", "Left (TL)"),
-            "flex_top_middle_rebar_string": ("Top Reinforcement", "Middle (T)"),
-            "flex_top_right_rebar_string": ("Top Reinforcement", "Right (TR)"),
-            "selected_side_face_reinforcement_string": ("Side Face Reinforcement", ""),
-            "shear_left_string": ("Shear links", "Left (H)"),
-            "shear_middle_string": ("Shear links", "Middle (J)"),
-            "shear_right_string": ("Shear links", "Right (K)"),
-            "transverse_space_check": ("Check Transverse Shear Spacing?", ""),
-            "req_bot_left_flex_reinf": (
-                "Flexural BL Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_bot_left_rebar_area": (
-                "Flexural BL Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_bot_middle_flex_reinf": (
-                "Flexural BM Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_bot_middle_rebar_area": (
-                "Flexural BM Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_bot_right_flex_reinf": (
-                "Flexural BR Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_bot_right_rebar_area": (
-                "Flexural BR Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_top_left_flex_reinf": (
-                "Flexural TL Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_top_left_rebar_area": (
-                "Flexural TL Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_top_middle_flex_reinf": (
-                "Flexural TM Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_top_middle_rebar_area": (
-                "Flexural TM Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_top_right_flex_reinf": (
-                "Flexural TR Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "flex_top_right_rebar_area": (
-                "Flexural TR Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_total_left_shear_reinf": (
-                "Shear L Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "shear_left_area": (
-                "Shear L Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_total_middle_shear_reinf": (
-                "Shear M Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "shear_middle_area": (
-                "Shear M Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-            "req_total_right_shear_reinf": (
-                "Shear R Reinforcement Criteria",
-                "Required (mm^2)",
-            ),
-            "shear_right_area": (
-                "Shear R Reinforcement Criteria",
-                "Provided (mm^2)",
-            ),
-        }
+    Args:
+        flexural_df (pd.DataFrame): The flexure envelope sheet.
+        shear_df (pd.DataFrame): The shear envelope sheet.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
 
-        # Loop through all the beam instances and populate the beam schedule dataframe with relevant information.
-        for idx, beam in enumerate(beam_instances):  # type: ignore
-            for attr, col in beam_mapping.items():
-                value = getattr(beam, attr)
-                if isinstance(value, str):
-                    beam_schedule_df[col] = beam_schedule_df[col].astype(object)
-                beam_schedule_df.loc[idx, col] = value
+    Returns:
+        pd.DataFrame: The processed beam schedule, or "Incorrect section definitions".
+    """
+    if progress is not None:
+        progress.update("Reading demands", 0, 1)
 
-        processed_beam_schedule_df = beam_schedule_df
-        return processed_beam_schedule_df
-    else:
-        processed_beam_schedule_df = "Incorrect section definitions"
-        return processed_beam_schedule_df
+    beam_inputs = extract_beam_inputs(flexural_df, shear_df)
+    if isinstance(beam_inputs, str):
+        return beam_inputs
+    return design_inputs(beam_inputs, progress, cache)
@@ -0,0 +1,233 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import batch_processing as bp
+import df_processing as pr
+import export_processing as ex
+import rationalisation as ra
+from design_cache import DesignCache, design_cache_path
+from results import EXIT_FAILED, EXIT_NO_INPUTS, EXIT_OK, INVALID_RESULTS
+
+# The columns of the envelope sheets, by position, which align the stations of each beam across runs.
+KEY_POSITIONS = [0, 1, 4]
+SECTION_POSITION = 3
+
+# The governing groups of each sheet. The run with the larger required area, or which is overstressed,
+# governs the group, and its combos and demands are taken along with its area.
+FLEXURE_GROUPS = [
+    {"area": 7, "combo": 5, "demands": [6]},
+    {"area": 10, "combo": 8, "demands": [9]},
+]
+SHEAR_GROUPS = [
+    {"area": 8, "combo": 5, "demands": [6, 7]},
+    {"area": 11, "combo": 9, "demands": [10]},
+    {"area": 14, "combo": 12, "demands": [13]},
+]
+
+
+def station_keys(data_df) -> pd.MultiIndex:
+    """This function keys each station of an envelope sheet by its storey, etabs id, and location.
+
+    Args:
+        data_df (pd.DataFrame): The stations of the envelope sheet, without its two header rows.
+
+    Returns:
+        pd.MultiIndex: The key of each station.
+    """
+    return pd.MultiIndex.from_arrays(
+        [data_df.iloc[:, position].astype(str).to_numpy() for position in KEY_POSITIONS]
+    )
+
+
+def overstressed(values) -> np.ndarray:
+    """This function flags the cells holding O/S, or nothing, as extract_beam_inputs reads them.
+
+    Args:
+        values (pd.Series): A column of an envelope sheet.
+
+    Returns:
+        np.ndarray: Whether each cell is overstressed.
+    """
+    return values.astype(str).str.strip().str.lower().isin(["o/s", "nan"]).to_numpy()
+
+
+def stations_aligned(data_df) -> bool:
+    """This function checks that every beam of an envelope sheet has its three stations together, as
+    df_processing.extract_beam_inputs reads each beam from three consecutive rows.
+
+    Args:
+        data_df (pd.DataFrame): The stations of the envelope sheet, without its two header rows.
+
+    Returns:
+        bool: Whether every beam has exactly three consecutive stations.
+    """
+    beams = (
+        data_df.iloc[:, 0].astype(str) + "\x00" + data_df.iloc[:, 1].astype(str)
+    ).to_numpy()
+    if len(beams) == 0:
+        return True
+    starts = np.flatnonzero(np.r_[True, beams[1:] != beams[:-1]])
+    lengths = np.diff(np.r_[starts, len(beams)])
+    return bool((lengths == 3).all()) and len(starts) == len(set(beams))
+
+
+def merge_pair(governing_df, run_df, groups):
+    """This function merges the envelope sheet of another run into the governing envelope so far. Stations
+    are aligned by storey, etabs id, and location, and stations only in the other run are appended after
+    those of the governing envelope, keeping the three stations of each beam together.
+
+    Args:
+        governing_df (pd.DataFrame): The governing envelope sheet of the runs merged so far.
+        run_df (pd.DataFrame): The envelope sheet of the next run.
+        groups (list): The governing groups of the sheet, FLEXURE_GROUPS or SHEAR_GROUPS.
+
+    Returns:
+        pd.DataFrame: The governing envelope sheet, or a string describing why the runs could not be
+            merged. Runs placing a beam's stations at different locations return "Mismatched stations".
+    """
+    governing = governing_df.iloc[2:].set_axis(range(governing_df.shape[1]), axis=1)
+    run = run_df.iloc[2:].set_axis(range(run_df.shape[1]), axis=1)
+    governing = governing.set_axis(station_keys(governing))
+    run = run.set_axis(station_keys(run))
+    if not (governing.index.is_unique and run.index.is_unique):
+        return "Duplicate stations"
+
+    stations = governing.index.append(run.index.difference(governing.index, sort=False))
+    in_governing = stations.isin(governing.index)
+    in_run = stations.isin(run.index)
+    governing = governing.reindex(stations)
+    run = run.reindex(stations)
+
+    # A beam cannot be merged across runs which define it with different sections.
+    sections = governing[SECTION_POSITION].astype(str).to_numpy()
+    run_sections = run[SECTION_POSITION].astype(str).to_numpy()
+    if (in_governing & in_run & (sections != run_sections)).any():
+        return "Mismatched sections"
+
+    merged = governing.copy()
+    merged.loc[~in_governing] = run.loc[~in_governing].to_numpy()
+    for group in groups:
+        governing_area = pd.to_numeric(governing[group["area"]], errors="coerce")
+        run_area = pd.to_numeric(run[group["area"]], errors="coerce")
+        governing_os = overstressed(governing[group["area"]]) | overstressed(
+            governing[group["combo"]]
+        )
+        run_os = overstressed(run[group["area"]]) | overstressed(run[group["combo"]])
+        # An overstressed run governs any other, and otherwise the larger required area governs.
+        take_run = (
+            in_governing
+            & in_run
+            & ~governing_os
+            & (run_os | (run_area > governing_area).to_numpy())
+        )
+        columns = [group["area"], group["combo"], *group["demands"]]
+        merged.loc[take_run, columns] = run.loc[take_run, columns].to_numpy()
+
+    # A beam whose stations differ across runs would be read with the stations of its neighbours.
+    if not stations_aligned(merged):
+        return "Mismatched stations"
+
+    merged = pd.concat(
+        [governing_df.iloc[:2].set_axis(range(governing_df.shape[1]), axis=1), merged]
+    )
+    return merged.set_axis(governing_df.columns, axis=1).reset_index(drop=True)
+
+
+def merge_envelopes(workbooks):
+    """This function merges the envelopes of several ETABS runs, such as construction stages or cracked and
+    uncracked analyses, into the governing envelope. The runs are reduced one at a time, so only the
+    governing envelope and the next run are held at once.
+
+    Args:
+        workbooks (iterable): The flexural and shear dataframes of each run, or a string describing why a
+            run could not be read, as returned by df_processing.read_workbook.
+
+    Returns:
+        tuple: The governing flexural and shear dataframes, or a string describing why they could not be
+            merged.
+    """
+    governing = None
+    for workbook in workbooks:
+        if isinstance(workbook, str):
+            return workbook
+        if governing is None:
+            governing = workbook
+            continue
+        flexural_df = merge_pair(governing[0], workbook[0], FLEXURE_GROUPS)
+        if isinstance(flexural_df, str):
+            return flexural_df
+        shear_df = merge_pair(governing[1], workbook[1], SHEAR_GROUPS)
+        if isinstance(shear_df, str):
+            return shear_df
+        governing = (flexural_df, shear_df)
+    if governing is None:
+        return "No workbooks"
+    return governing
+
+
+def process_workbooks(excel_files, progress=None, cache=None):
+    """This function reads the ETABS design exports of several runs, merges them into the governing
+    envelope, and designs it once into the beam schedule.
+
+    Args:
+        excel_files (list): The paths or contents of the exports, one per run.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The processed beam schedule, or a string describing why it could not be processed.
+    """
+
+    def read_runs():
+        for index, excel_file in enumerate(excel_files):
+            if progress is not None:
+                progress.update("Merging envelopes", index, len(excel_files))
+            yield pr.read_workbook(excel_file)
+
+    workbook = merge_envelopes(read_runs())
+    if isinstance(workbook, str):
+        return workbook
+    return pr.process_dataframes(*workbook, progress=progress, cache=cache)
+
+
+def run_command(args) -> int:
+    """This function runs the merge command, designing the governing envelope of several runs into one
+    schedule.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    input_paths = bp.expand_inputs(args.inputs)
+    if not input_paths:
+        print("No ETABS workbooks matched the inputs given.", file=sys.stderr)
+        return EXIT_NO_INPUTS
+
+    start = time.perf_counter()
+    cache_path = design_cache_path(args)
+    beam_schedule_df = process_workbooks(
+        input_paths, cache=DesignCache(cache_path) if cache_path else None
+    )
+    if isinstance(beam_schedule_df, str):
+        print(
+            f"The runs could not be merged. {INVALID_RESULTS.get(beam_schedule_df, beam_schedule_df)}",
+            file=sys.stderr,
+        )
+        return EXIT_FAILED
+    type_schedule_df = None
+    if args.types is not None:
+        beam_schedule_df, type_schedule_df = ra.rationalise(
+            beam_schedule_df, args.types
+        )
+    with open(args.output, "wb") as file:
+        file.write(ex.export_file(beam_schedule_df, type_schedule_df))
+    print(
+        f"Merged {len(input_paths)} run(s) into {len(beam_schedule_df)} beams."
+        f" Wrote {args.output} in {time.perf_counter() - start:.2f} s."
+    )
+    return EXIT_OK
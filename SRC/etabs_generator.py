@@ -0,0 +1,359 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from beam_calculator_class import Beam
+from df_processing import FLEXURE_TABLE, SHEAR_TABLE
+from results import EXIT_FAILED, EXIT_OK
+
+# The field names and units of the flexure and shear envelope tables, as ETABS exports them.
+FLEXURE_FIELDS = [
+    ["Story", "Label", "UniqueName", "Section", "Location", "FTopCombo"]
+    + ["FTopMoment", "FTopArea", "FBotCombo", "FBotMoment", "FBotArea"],
+    ["", "", "", "", "mm", "", "kN-m", "mm²", "", "kN-m", "mm²"],
+]
+SHEAR_FIELDS = [
+    ["Story", "Label", "UniqueName", "Section", "Location", "VCombo", "VForce"]
+    + ["PhiVc", "VRebar", "TCombo", "TForce", "TTrnRebar", "TLngCombo"]
+    + ["TLngForce", "TLngRebar"],
+    ["", "", "", "", "mm", "", "kN", "kN", "mm²/m", "", "kN-m", "mm²/m", "", "kN-m"]
+    + ["mm²"],
+]
+
+# The section mix of a typical tower, by the share of beams of each section.
+DEFAULT_SECTIONS = {
+    "B300X600-C45/55": 0.35,
+    "B400X750-C45/55": 0.3,
+    "B300X500-C40/50": 0.15,
+    "B600X900-C40/50": 0.12,
+    "B800X1200-C40/50": 0.08,
+}
+
+# The name ETABS gives a section left undefined, which the section syntax does not abide with.
+MALFORMED_SECTION = "ConcBm"
+
+# Each beam spans three rows, beneath the title, field name, and unit rows, so a worksheet of 1,048,576
+# rows holds this many beams at most. Larger models are written as text tables.
+XLSX_MAX_BEAMS = (1048576 - 3) // 3
+
+# The yield strength of the reinforcement, in MPa, the demands are sized with.
+YIELD_STRENGTH = 420
+
+
+def section_dimensions(sections) -> np.ndarray:
+    """This function parses the width, depth, and concrete grade of each section, as the design does.
+
+    Args:
+        sections (list): The section names.
+
+    Raises:
+        ValueError: A section does not abide with the section syntax.
+
+    Returns:
+        np.ndarray: The width, depth, and grade of each section, one row per section.
+    """
+    dimensions = []
+    for section in sections:
+        try:
+            dimensions.append(
+                [
+                    Beam.get_width(section),
+                    Beam.get_depth(section),
+                    Beam.get_comp_conc_grade(section),
+                ]
+            )
+        except ValueError:
+            raise ValueError(f"{section} does not abide with the section syntax")
+    return np.array(dimensions, dtype=float)
+
+
+def generate_envelopes(
+    beam_count,
+    storeys=10,
+    sections=None,
+    os_rate=0.0,
+    malformed_rate=0.0,
+    seed=0,
+) -> tuple:
+    """This function generates the flexure and shear envelopes of a synthetic ETABS model, laid out as
+    pandas reads them from a design export. The beams are spread evenly over the storeys, and their demands
+    are sized from their sections, so that most beams design without failing. Overstressed beams report
+    O/S at every station, and malformed beams carry a section name the section syntax does not abide with,
+    so that any malformed beam makes the export invalid as a whole.
+
+    Args:
+        beam_count (int): The number of beams.
+        storeys (int, optional): The number of storeys. Defaults to 10.
+        sections (dict, optional): The share of beams of each section. Defaults to DEFAULT_SECTIONS.
+        os_rate (float, optional): The fraction of beams overstressed. Defaults to 0.0.
+        malformed_rate (float, optional): The fraction of beams with a malformed section. Defaults to 0.0.
+        seed (int, optional): The seed of the random demands, so a model is generated again identically.
+            Defaults to 0.
+
+    Raises:
+        ValueError: There are no beams or storeys, or a section does not abide with the section syntax.
+
+    Returns:
+        tuple: The flexural and shear dataframes.
+    """
+    if beam_count < 1 or storeys < 1:
+        raise ValueError("A model needs at least one beam and one storey")
+    sections = DEFAULT_SECTIONS if sections is None else sections
+    rng = np.random.default_rng(seed)
+    names = np.array(list(sections), dtype=object)
+    shares = np.array(list(sections.values()), dtype=float)
+    beam_sections = rng.choice(len(names), size=beam_count, p=shares / shares.sum())
+    width, depth, grade = section_dimensions(names)[beam_sections].T
+
+    storey_index = np.arange(beam_count) * storeys // beam_count
+    first_beam = np.searchsorted(storey_index, storey_index)
+    storey_names = np.array(
+        [f"L{storey + 1}" for storey in range(storeys)], dtype=object
+    )
+    labels = np.char.add("B", (np.arange(beam_count) - first_beam + 1).astype(str))
+    overstressed = rng.random(beam_count) < os_rate
+    malformed = rng.random(beam_count) < malformed_rate
+    section_names = np.where(malformed, MALFORMED_SECTION, names[beam_sections])
+
+    # Every beam has stations at its left support, midspan, and right support.
+    span = np.round(rng.uniform(3000, 9000, beam_count) / 50) * 50
+    locations = np.stack([np.full(beam_count, 250.0), span / 2, span - 250], axis=1)
+    support = np.array([True, False, True])
+    shape = (beam_count, 3)
+
+    def per_station(values):
+        return np.repeat(values, 3)
+
+    def combos():
+        return np.char.add("DCon", rng.integers(1, 41, shape).astype(str))
+
+    def moment(area):
+        return area * YIELD_STRENGTH * 0.9 * 0.85 * depth[:, None] / 1e6
+
+    gross_area = (width * depth)[:, None]
+    top_area = gross_area * np.where(
+        support, rng.uniform(0.002, 0.012, shape), rng.uniform(0.001, 0.004, shape)
+    )
+    bottom_area = gross_area * np.where(
+        support, rng.uniform(0.002, 0.005, shape), rng.uniform(0.003, 0.01, shape)
+    )
+    concrete_shear = (0.75 * 0.17 * np.sqrt(grade) * width * depth / 1000)[:, None]
+    shear_force = concrete_shear * np.where(
+        support, rng.uniform(0.6, 2.2, shape), rng.uniform(0.2, 0.8, shape)
+    )
+    shear_area = np.maximum(
+        0,
+        (shear_force - concrete_shear) * 1e6 / (0.75 * YIELD_STRENGTH * depth[:, None]),
+    )
+    torsion = rng.uniform(0, 0.02, shape) * (width**2 * depth)[:, None] / 1e6
+    torsion_area = rng.uniform(0, 200, shape)
+    longitudinal_area = rng.uniform(0, 600, shape)
+
+    def demand(values, decimals=1):
+        values = np.round(values, decimals).ravel().astype(object)
+        values[per_station(overstressed)] = "O/S"
+        return values
+
+    def combo():
+        values = combos().ravel().astype(object)
+        values[per_station(overstressed)] = "O/S"
+        return values
+
+    keys = {
+        0: per_station(storey_names[storey_index]),
+        1: per_station(labels).astype(object),
+        2: per_station(np.arange(1, beam_count + 1).astype(str)).astype(object),
+        3: per_station(section_names),
+        4: np.round(locations.ravel()),
+    }
+    flexure_columns = {
+        **keys,
+        5: combo(),
+        6: np.round(-moment(top_area), 1).ravel(),
+        7: demand(top_area),
+        8: combo(),
+        9: np.round(moment(bottom_area), 1).ravel(),
+        10: demand(bottom_area),
+    }
+    shear_columns = {
+        **keys,
+        5: combo(),
+        6: np.round(shear_force, 1).ravel(),
+        7: np.round(np.broadcast_to(concrete_shear, shape), 1).ravel(),
+        8: demand(shear_area),
+        9: combo(),
+        10: np.round(torsion, 2).ravel(),
+        11: demand(torsion_area),
+        12: combo(),
+        13: np.round(torsion, 2).ravel(),
+        14: demand(longitudinal_area),
+    }
+    return (
+        envelope_frame(FLEXURE_TABLE, FLEXURE_FIELDS, flexure_columns),
+        envelope_frame(SHEAR_TABLE, SHEAR_FIELDS, shear_columns),
+    )
+
+
+def envelope_frame(title, fields, columns) -> pd.DataFrame:
+    """This function lays out the columns of an envelope table beneath its field name and unit rows, with
+    the table title heading the first column, as pandas reads an ETABS design export.
+
+    Args:
+        title (str): The table title.
+        fields (list): The field name and unit rows.
+        columns (dict): The values of each column, by position.
+
+    Returns:
+        pd.DataFrame: The envelope sheet.
+    """
+    headers = [title] + [
+        f"Unnamed: {position}" for position in range(1, len(fields[0]))
+    ]
+    header_df = pd.DataFrame(fields, columns=headers)
+    data_df = pd.DataFrame(
+        {headers[position]: values for position, values in columns.items()}
+    )
+    return pd.concat([header_df, data_df.astype(object)], ignore_index=True)
+
+
+def envelope_rows(envelope_df):
+    """This function yields the rows of an envelope sheet, as plain Python values, from its title down.
+
+    Args:
+        envelope_df (pd.DataFrame): The envelope sheet.
+
+    Yields:
+        list: The values of each row.
+    """
+    yield [envelope_df.columns[0]]
+    yield from envelope_df.itertuples(index=False, name=None)
+
+
+def write_workbook(flexural_df, shear_df, path):
+    """This function writes the envelopes to a workbook laid out as an ETABS design export, with the
+    program control table as the third sheet. The rows are streamed to the file rather than held in memory,
+    so that models of a few hundred thousand beams are written quickly.
+
+    Args:
+        flexural_df (pd.DataFrame): The flexural dataframe.
+        shear_df (pd.DataFrame): The shear dataframe.
+        path (str or file-like): The workbook to write.
+
+    Raises:
+        ValueError: The envelopes hold more beams than a worksheet does.
+    """
+    if len(flexural_df) - 2 > XLSX_MAX_BEAMS * 3:
+        raise ValueError(
+            f"A workbook holds {XLSX_MAX_BEAMS} beams at most; write larger models as text tables"
+        )
+    workbook = xlsxwriter.Workbook(
+        path, {"constant_memory": True, "in_memory": not isinstance(path, str)}
+    )
+    sheets = [
+        ("Concrete Beam Flexure Envelope", flexural_df),
+        ("Concrete Beam Shear Envelope", shear_df),
+    ]
+    for sheet_name, envelope_df in sheets:
+        worksheet = workbook.add_worksheet(sheet_name)
+        for row, values in enumerate(envelope_rows(envelope_df)):
+            worksheet.write_row(row, 0, values)
+    worksheet = workbook.add_worksheet("Program Control")
+    for row, values in enumerate(
+        [["TABLE:  Program Control"], ["ProgramName"], ["ETABS"]]
+    ):
+        worksheet.write_row(row, 0, values)
+    workbook.close()
+
+
+def write_text_tables(flexural_df, shear_df, path):
+    """This function writes the envelopes as tab separated text tables, as ETABS exports tables to text.
+    Each table is headed by its title, field name, and unit rows, and the tables are separated by a blank
+    line. Text tables hold models of any size.
+
+    Args:
+        flexural_df (pd.DataFrame): The flexural dataframe.
+        shear_df (pd.DataFrame): The shear dataframe.
+        path (str): The text file to write.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        for index, envelope_df in enumerate([flexural_df, shear_df]):
+            if index:
+                file.write("\n")
+            file.write(f"{envelope_df.columns[0]}\n")
+            envelope_df.to_csv(
+                file, sep="\t", header=False, index=False, lineterminator="\n"
+            )
+
+
+def parse_section_mix(specs) -> dict:
+    """This function parses the section mix of a generated model from SECTION=SHARE arguments.
+
+    Args:
+        specs (list): The SECTION=SHARE arguments, such as B300X600-C45/55=0.4.
+
+    Raises:
+        ValueError: An argument is not a section and its share.
+
+    Returns:
+        dict: The share of each section, or None to use the default mix.
+    """
+    if not specs:
+        return None
+    sections = {}
+    for spec in specs:
+        section, _, share = spec.rpartition("=")
+        try:
+            sections[section] = float(share)
+        except ValueError:
+            raise ValueError(f"{spec} is not SECTION=SHARE")
+        if not section or sections[section] <= 0:
+            raise ValueError(f"{spec} is not SECTION=SHARE")
+    return sections
+
+
+def run_command(args) -> int:
+    """This function runs the generate command, writing a synthetic ETABS design export of any size for
+    reproducing production scale locally. Outputs ending in .txt are written as text tables, and any other
+    as a workbook.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    try:
+        sections = parse_section_mix(args.section)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return EXIT_FAILED
+
+    start = time.perf_counter()
+    try:
+        envelopes = generate_envelopes(
+            args.beams,
+            storeys=args.storeys,
+            sections=sections,
+            os_rate=args.os_rate,
+            malformed_rate=args.malformed_rate,
+            seed=args.seed,
+        )
+    except ValueError as error:
+        print(f"The model could not be generated: {error}", file=sys.stderr)
+        return EXIT_FAILED
+    try:
+        if args.output.lower().endswith(".txt"):
+            write_text_tables(*envelopes, args.output)
+        else:
+            write_workbook(*envelopes, args.output)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return EXIT_FAILED
+    print(
+        f"Wrote {args.beams} beams over {args.storeys} storeys to {args.output}"
+        f" in {time.perf_counter() - start:.2f} s."
+    )
+    return EXIT_OK
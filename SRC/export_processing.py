@@ -0,0 +1,297 @@
+import io
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import quantity_takeoff as qt
+from xlsxwriter.utility import xl_col_to_name
+
+
+class ScheduleFormats:
+    """This class holds the formats of a formatted beam schedule workbook. The formats are created once
+    per workbook and shared by every sheet and cell they are applied to.
+    """
+
+    def __init__(self, workbook):
+        """Begin by adding the header, area, and overstressed formats to the workbook."""
+        self.header = workbook.add_format(
+            {
+                "bold": True,
+                "border": 1,
+                "align": "center",
+                "valign": "vcenter",
+                "text_wrap": True,
+                "bg_color": "#075985",
+                "font_color": "#FFFFFF",
+            }
+        )
+        self.area = workbook.add_format({"num_format": "#,##0"})
+        self.mass = workbook.add_format({"num_format": "#,##0.0"})
+        self.overstressed = workbook.add_format(
+            {"bg_color": "#FFC7CE", "font_color": "#9C0006"}
+        )
+
+
+def write_schedule_sheet(writer, beam_schedule_df, sheet_name, formats):
+    """This function writes the beam schedule to a formatted sheet. The MultiIndex headers are merged,
+    mm^2 columns are given a number format, and rows with a status other than OK are filled in red.
+
+    Args:
+        writer (pd.ExcelWriter): The xlsxwriter based Excel writer.
+        beam_schedule_df (pd.DataFrame): The beam schedule, or the part of it to write.
+        sheet_name (str): The name of the sheet.
+        formats (ScheduleFormats): The formats of the writer's workbook.
+    """
+    # Pandas cannot write MultiIndex columns without the index, so the headers are written below instead.
+    beam_schedule_df.set_axis(range(beam_schedule_df.shape[1]), axis=1).to_excel(
+        writer, sheet_name=sheet_name, startrow=2, header=False, index=False
+    )
+    worksheet = writer.sheets[sheet_name]
+
+    # Merge each group of columns under its top level header. Columns without a second level header span both rows.
+    columns = list(beam_schedule_df.columns)
+    start = 0
+    while start < len(columns):
+        top = columns[start][0]
+        end = start
+        while end + 1 < len(columns) and columns[end + 1][0] == top:
+            end += 1
+        if start == end and columns[start][1] == "":
+            worksheet.merge_range(0, start, 1, start, top, formats.header)
+        else:
+            if start == end:
+                worksheet.write(0, start, top, formats.header)
+            else:
+                worksheet.merge_range(0, start, 0, end, top, formats.header)
+            for index in range(start, end + 1):
+                worksheet.write(1, index, columns[index][1], formats.header)
+        start = end + 1
+
+    # Apply the column formats once per column rather than once per cell.
+    status_columns = []
+    for index, column in enumerate(columns):
+        if column[1].endswith("(mm^2)"):
+            worksheet.set_column(index, index, 12, formats.area)
+        elif column[1] == "Status":
+            worksheet.set_column(index, index, 14)
+            status_columns.append(xl_col_to_name(index))
+        else:
+            worksheet.set_column(index, index, 14)
+    worksheet.set_row(0, 30)
+    worksheet.freeze_panes(2, 2)
+
+    # A single conditional format fills every row holding a status other than OK.
+    if status_columns and len(beam_schedule_df) > 0:
+        conditions = ",".join(f'${column}3<>"OK"' for column in status_columns)
+        worksheet.conditional_format(
+            2,
+            0,
+            len(beam_schedule_df) + 1,
+            len(columns) - 1,
+            {
+                "type": "formula",
+                "criteria": f"=OR({conditions})",
+                "format": formats.overstressed,
+            },
+        )
+
+
+def write_takeoff_sheets(writer, beam_schedule_df, formats):
+    """This function writes the steel quantity takeoff of each beam, and its total per storey, to two sheets.
+
+    Args:
+        writer (pd.ExcelWriter): The xlsxwriter based Excel writer.
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+        formats (ScheduleFormats): The formats of the writer's workbook.
+    """
+    takeoff_df = qt.steel_takeoff(beam_schedule_df)
+    for sheet_name, sheet_df in [
+        ("Steel Quantity Takeoff", takeoff_df),
+        ("Steel Quantity by Storey", qt.storey_takeoff(takeoff_df)),
+    ]:
+        sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        worksheet = writer.sheets[sheet_name]
+        for index, column in enumerate(sheet_df.columns):
+            worksheet.write(0, index, column, formats.header)
+            if column.endswith("(kg)") or column.endswith("(t)"):
+                worksheet.set_column(index, index, 16, formats.mass)
+            else:
+                worksheet.set_column(index, index, 14)
+        worksheet.freeze_panes(1, 0)
+
+
+# Create the relevant functions to export the excel file
+def export_file(beam_schedule_df, type_schedule_df=None):
+    """This function exports the beam schedule to a workbook with the full schedule, a sheet per storey,
+    and the steel quantity takeoff. Given the type schedule of a rationalised schedule, it follows the full
+    schedule on its own sheet.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule, or the typed schedule.
+        type_schedule_df (pd.DataFrame, optional): The type schedule from rationalisation.rationalise.
+            Defaults to None.
+
+    Returns:
+        bytes: The Excel file content.
+    """
+    # Use BytesIO as an in-memory buffer
+    output = io.BytesIO()
+
+    # Create an Excel writer object with the BytesIO object
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        # Create the formats once for the whole workbook.
+        formats = ScheduleFormats(writer.book)
+
+        # Write the entire DataFrame to the first sheet
+        write_schedule_sheet(
+            writer, beam_schedule_df, "Beam Reinforcement Schedule", formats
+        )
+        if type_schedule_df is not None:
+            write_schedule_sheet(writer, type_schedule_df, "Beam Types", formats)
+
+        # Group by the 'Storey' column
+        grouped = beam_schedule_df.groupby("Storey", sort=False, observed=True)
+
+        # Iterate through the groups and write to separate sheets
+        for name, group in grouped:
+            sheet_name = f"{name}"
+            write_schedule_sheet(writer, group, sheet_name, formats)
+
+        # Follow the storey sheets with the steel quantity takeoff.
+        write_takeoff_sheets(writer, beam_schedule_df, formats)
+
+    # Return the Excel file content from the in-memory buffer
+    return output.getvalue()
+
+
+def storey_file_name(storey, file_format: str) -> str:
+    """This function turns a storey name into a file name which is safe to use within a zip archive.
+
+    Args:
+        storey (str): The storey name as exported from ETABS.
+        file_format (str): Either "xlsx" or "csv".
+
+    Returns:
+        str: The file name for the storey, such as "L12.xlsx".
+    """
+    safe_name = re.sub(r"[^\w\-. ]", "_", str(storey)).strip(" .") or "Storey"
+    return f"{safe_name}.{file_format}"
+
+
+def export_storey(storey, storey_df, file_format: str = "xlsx") -> tuple:
+    """This function exports the schedule of a single storey. It is run within the worker processes
+    of export_storey_bundle, so it must remain a module level function.
+
+    Args:
+        storey (str): The storey name.
+        storey_df (pd.DataFrame): The beam schedule rows belonging to the storey.
+        file_format (str, optional): Either "xlsx" or "csv". Defaults to "xlsx".
+
+    Returns:
+        tuple: The storey name and the exported file content in bytes.
+    """
+    if file_format == "csv":
+        return storey, storey_df.to_csv(index=False).encode("utf-8-sig")
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        write_schedule_sheet(
+            writer, storey_df, f"{storey}", ScheduleFormats(writer.book)
+        )
+    return storey, output.getvalue()
+
+
+def export_storey_bundle(beam_schedule_df, file_format="xlsx", max_workers=None):
+    """This function exports a zip archive containing one file per storey. The storeys are exported
+    in parallel worker processes and added to the archive in the order they appear in the schedule.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+        file_format (str, optional): Either "xlsx" or "csv". Defaults to "xlsx".
+        max_workers (int, optional): The number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        bytes: The zip archive content.
+    """
+    if file_format not in ("xlsx", "csv"):
+        raise ValueError(f"Unsupported storey export format: {file_format}")
+
+    storeys = [
+        (name, group)
+        for name, group in beam_schedule_df.groupby("Storey", sort=False, observed=True)
+    ]
+
+    # Small schedules are quicker to export in process than to send to worker processes.
+    if len(storeys) <= 1 or max_workers == 1:
+        exported = [export_storey(name, group, file_format) for name, group in storeys]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            exported = list(
+                executor.map(
+                    export_storey,
+                    [name for name, _ in storeys],
+                    [group for _, group in storeys],
+                    [file_format] * len(storeys),
+                )
+            )
+
+    output = io.BytesIO()
+    used_names = set()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for storey, content in exported:
+            file_name = storey_file_name(storey, file_format)
+            # Storeys which only differ by unsafe characters must not overwrite each other.
+            suffix = 2
+            while file_name in used_names:
+                file_name = storey_file_name(f"{storey}_{suffix}", file_format)
+                suffix += 1
+            used_names.add(file_name)
+            archive.writestr(file_name, content)
+    return output.getvalue()
+
+
+def export_changes(changes_df):
+    """This function exports the changes between two schedule revisions to a single filterable sheet.
+
+    Args:
+        changes_df (pd.DataFrame): The change sheet, as returned by schedule_diff.diff_schedules.
+
+    Returns:
+        bytes: The Excel file content.
+    """
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        formats = ScheduleFormats(writer.book)
+        changes_df.to_excel(writer, sheet_name="Schedule Changes", index=False)
+        worksheet = writer.sheets["Schedule Changes"]
+        for index, column in enumerate(changes_df.columns):
+            worksheet.write(0, index, column, formats.header)
+            worksheet.set_column(index, index, 34 if column == "Element" else 16)
+        worksheet.autofilter(0, 0, len(changes_df), len(changes_df.columns) - 1)
+        worksheet.freeze_panes(1, 0)
+    return output.getvalue()
+
+
+def export_sweep(sweep_df):
+    """This function exports the summary of a design sweep to a single sheet, one row per variant.
+
+    Args:
+        sweep_df (pd.DataFrame): The sweep summary, as returned by design_sweep.run_sweep.
+
+    Returns:
+        bytes: The Excel file content.
+    """
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        formats = ScheduleFormats(writer.book)
+        sweep_df.to_excel(writer, sheet_name="Design Sweep", index=False)
+        worksheet = writer.sheets["Design Sweep"]
+        number = writer.book.add_format({"num_format": "#,##0.00"})
+        for index, column in enumerate(sweep_df.columns):
+            worksheet.write(0, index, column, formats.header)
+            if column in ("Variant", "Error"):
+                worksheet.set_column(index, index, 30)
+            else:
+                worksheet.set_column(index, index, 16, number)
+        worksheet.freeze_panes(1, 1)
+    return output.getvalue()
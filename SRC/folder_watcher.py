@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_processing as bp
+from design_cache import design_cache_path
+from results import EXIT_NO_INPUTS, EXIT_OK
+
+# The file within the watched folder recording the content hash of each processed workbook.
+MANIFEST_NAME = ".beam_scheduler_manifest.json"
+
+
+def file_hash(path) -> str:
+    """This function returns the SHA-256 hash of a file's content.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024**2), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FolderWatcher:
+    """This class watches a folder for new or changed ETABS exports and processes each into a schedule
+    written alongside it. The folder is polled, so it works on network shares where file system events
+    are unreliable. A workbook is only processed once its size and modification time have held steady
+    for the settle time, so partially saved files are left alone, and workbooks whose content hash
+    matches the manifest are skipped. Each workbook's hash is kept until its size or modification time
+    changes.
+    """
+
+    def __init__(self, folder, settle=2.0, clock=time.monotonic, design_cache=None):
+        """Begin by initializing the watched folder and loading its manifest.
+
+        Args:
+            folder (str): The folder to watch.
+            settle (float, optional): The seconds a workbook must remain unchanged before it is processed.
+                Defaults to 2.0.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.monotonic.
+            design_cache (str, optional): The path of the design cache shared across runs. Defaults to None.
+        """
+        self.folder = folder
+        self.settle = settle
+        self.clock = clock
+        self.design_cache = design_cache
+        self.manifest_path = os.path.join(folder, MANIFEST_NAME)
+        self.manifest = self.load_manifest()
+        self._signatures = {}
+        self._hashes = {}
+        self._in_flight = {}
+
+    def load_manifest(self) -> dict:
+        """This method loads the content hashes of the workbooks processed in earlier runs.
+
+        Returns:
+            dict: The content hash of each workbook, and whether it was processed successfully, by file name.
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        """This method writes the manifest, replacing the previous one in a single step."""
+        temporary_path = self.manifest_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.manifest_path)
+
+    def scan(self) -> list:
+        """This method finds the workbooks which have settled since they last changed and whose content
+        differs from the manifest.
+
+        Returns:
+            list: (path, content hash) tuples of the workbooks to process.
+        """
+        now = self.clock()
+        paths = bp.expand_inputs([os.path.join(self.folder, "*.xlsx")])
+        ready = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self._signatures.get(path)
+            if previous is None or previous[0] != signature:
+                self._signatures[path] = (signature, now)
+                continue
+            if now - previous[1] < self.settle or path in self._in_flight:
+                continue
+            # The content is only hashed again once its size or modification time changes, so settled
+            # workbooks are not read in full on every poll.
+            cached = self._hashes.get(path)
+            if cached is not None and cached[0] == signature:
+                content_hash = cached[1]
+            else:
+                try:
+                    content_hash = file_hash(path)
+                except OSError:
+                    continue
+                self._hashes[path] = (signature, content_hash)
+            # A workbook processed before is skipped unless its schedule has since been deleted.
+            entry = self.manifest.get(os.path.basename(path), {})
+            if entry.get("hash") == content_hash and (
+                not entry.get("ok") or os.path.exists(bp.output_path(path))
+            ):
+                continue
+            ready.append((path, content_hash))
+        # Forget deleted workbooks, so a workbook saved again under the same name is picked up afresh.
+        for path in set(self._signatures) - set(paths):
+            del self._signatures[path]
+            self._hashes.pop(path, None)
+        return ready
+
+    def poll(self, executor) -> list:
+        """This method submits the workbooks ready to process to the executor, and collects the results
+        of those which have finished.
+
+        Args:
+            executor (concurrent.futures.Executor): The pool the workbooks are processed on.
+
+        Returns:
+            list: The results of the workbooks finished since the last poll, as returned by
+                batch_processing.process_file.
+        """
+        for path, content_hash in self.scan():
+            self._in_flight[path] = (
+                executor.submit(bp.process_file, path, design_cache=self.design_cache),
+                content_hash,
+            )
+
+        finished = []
+        for path, (future, content_hash) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[path]
+            result = future.result()
+            # Failed workbooks are recorded too, so an unchanged broken export is not retried every poll.
+            self.manifest[os.path.basename(path)] = {
+                "hash": content_hash,
+                "ok": result["ok"],
+            }
+            finished.append(result)
+        if finished:
+            self.save_manifest()
+        return finished
+
+    def run(self, workers=None, interval=1.0, stop_event=None, report=print):
+        """This method watches the folder until the stop event is set, reporting each processed workbook.
+
+        Args:
+            workers (int, optional): The number of worker processes. Defaults to the CPU count.
+            interval (float, optional): The seconds between polls of the folder. Defaults to 1.0.
+            stop_event (threading.Event, optional): Stops the watcher once set. Defaults to running until
+                interrupted.
+            report (callable, optional): Receives a line describing each processed workbook. Defaults to print.
+        """
+        stop_event = stop_event or threading.Event()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while not stop_event.is_set():
+                for result in self.poll(executor):
+                    report(bp.format_result(result))
+                stop_event.wait(interval)
+
+
+def run_command(args) -> int:
+    """This function runs the watch command until it is interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    if not os.path.isdir(args.folder):
+        print(f"{args.folder} is not a folder.", file=sys.stderr)
+        return EXIT_NO_INPUTS
+    print(f"Watching {args.folder} for ETABS workbooks. Press Ctrl+C to stop.")
+    watcher = FolderWatcher(
+        args.folder, settle=args.settle, design_cache=design_cache_path(args)
+    )
+    try:
+        watcher.run(
+            workers=args.workers,
+            interval=args.interval,
+            report=lambda line: print(line, flush=True),
+        )
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
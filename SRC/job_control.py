@@ -0,0 +1,97 @@
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """This exception is raised within a schedule job once its cancellation has been requested."""
+
+
+class ProgressReporter:
+    """This class reports the progress of a schedule job: the stage it is in, the work done out of the
+    total, and the time elapsed. Updates are forwarded to the optional callback at most once per interval,
+    apart from the first and last update of each stage, so that frequent updates do not flood listeners.
+    The latest update is always available for listeners which poll instead.
+
+    The reporter also carries the job's cancellation request. Every update is a checkpoint at which a
+    cancelled job stops by raising JobCancelled.
+    """
+
+    def __init__(self, callback=None, min_interval=0.25, clock=time.monotonic):
+        """Begin by initializing the callback, the throttling interval, and the start time.
+
+        Args:
+            callback (callable, optional): Receives each forwarded update as a dictionary. Defaults to None.
+            min_interval (float, optional): The minimum seconds between forwarded updates. Defaults to 0.25.
+            clock (callable, optional): The clock used to time the job. Defaults to time.monotonic.
+        """
+        self.callback = callback
+        self.min_interval = min_interval
+        self.clock = clock
+        self.started_at = clock()
+        self.latest = None
+        self._last_forwarded = None
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    def start(self):
+        """This method restarts the elapsed time, such as when a queued job begins running."""
+        self.started_at = self.clock()
+
+    def cancel(self):
+        """This method requests the cancellation of the job, which stops at its next checkpoint."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the cancellation of the job has been requested."""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """This method is a checkpoint at which the job stops if its cancellation has been requested.
+
+        Raises:
+            JobCancelled: The cancellation of the job has been requested.
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled("The job was cancelled.")
+
+    def update(self, stage, done, total):
+        """This method records the progress of the job and forwards it to the callback when due.
+        It is also a cancellation checkpoint.
+
+        Args:
+            stage (str): The name of the stage, such as "Designing beams".
+            done (int): The work done within the stage, such as the number of beams designed.
+            total (int): The total work of the stage.
+
+        Raises:
+            JobCancelled: The cancellation of the job has been requested.
+        """
+        self.check_cancelled()
+        now = self.clock()
+        event = {
+            "stage": stage,
+            "done": done,
+            "total": total,
+            "elapsed": now - self.started_at,
+        }
+        with self._lock:
+            stage_changed = self.latest is None or self.latest["stage"] != stage
+            self.latest = event
+            due = (
+                stage_changed
+                or done >= total
+                or now - self._last_forwarded >= self.min_interval
+            )
+            if due:
+                self._last_forwarded = now
+        if due and self.callback is not None:
+            self.callback(event)
+
+    @property
+    def fraction(self) -> float:
+        """The fraction of the current stage which is done, between 0 and 1."""
+        latest = self.latest
+        if latest is None or not latest["total"]:
+            return 0.0
+        return min(latest["done"] / latest["total"], 1.0)
@@ -0,0 +1,201 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from job_control import JobCancelled, ProgressReporter
+
+# The statuses a schedule job passes through.
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class QueueFullError(Exception):
+    """This exception is raised when a job is submitted to a queue which is at its depth limit."""
+
+
+class ScheduleJob:
+    """This class holds the status and result of a job submitted to the schedule job queue."""
+
+    def __init__(self, name=None):
+        """Begin by initializing the job id and its queued status.
+
+        Args:
+            name (str, optional): A description of the job, such as the uploaded file name.
+        """
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.progress = ProgressReporter()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in (COMPLETED, FAILED, CANCELLED)
+
+    def as_dict(self) -> dict:
+        """This method summarises the status of the job.
+
+        Returns:
+            dict: The job id, name, status, error, and timings.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress.latest,
+        }
+
+
+class ScheduleJobQueue:
+    """This class runs schedule jobs on a fixed number of worker threads. Jobs beyond the workers wait
+    in the queue, and once the queue reaches its depth limit further jobs are refused, keeping the
+    server's throughput predictable under concurrent use.
+    """
+
+    def __init__(self, workers, max_depth, history=50):
+        """Begin by initializing the worker pool and the job registry.
+
+        Args:
+            workers (int): The number of jobs run at the same time.
+            max_depth (int): The number of jobs which may be queued or running at once.
+            history (int, optional): The number of finished jobs whose status is kept. Defaults to 50.
+        """
+        self.workers = workers
+        self.max_depth = max_depth
+        self.history = history
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="schedule-job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        """The number of jobs which are queued or running."""
+        with self._lock:
+            return sum(not job.done for job in self._jobs.values())
+
+    def submit(
+        self, function, *args, name=None, track_progress=False, **kwargs
+    ) -> ScheduleJob:
+        """This method queues a function to be run by the workers.
+
+        Args:
+            function (callable): The function to run, such as process_dataframes.
+            name (str, optional): A description of the job, such as the uploaded file name.
+            track_progress (bool, optional): Whether to pass the job's progress reporter to the function
+                as its progress keyword argument. Defaults to False.
+
+        Raises:
+            QueueFullError: The queue is at its depth limit.
+
+        Returns:
+            ScheduleJob: The queued job.
+        """
+        job = ScheduleJob(name)
+        if track_progress:
+            kwargs["progress"] = job.progress
+        with self._lock:
+            if sum(not queued.done for queued in self._jobs.values()) >= self.max_depth:
+                raise QueueFullError(
+                    f"The schedule job queue is full ({self.max_depth} jobs)."
+                )
+            self._jobs[job.id] = job
+            self._forget_finished()
+            job.future = self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job, function, args, kwargs):
+        """This method runs a job on a worker thread and records its status and result."""
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.progress.start()
+        try:
+            job.progress.check_cancelled()
+            job.result = function(*args, **kwargs)
+        except JobCancelled:
+            job.status = CANCELLED
+            raise
+        except Exception as error:
+            job.error = str(error) or type(error).__name__
+            job.status = FAILED
+            raise
+        finally:
+            job.finished_at = time.time()
+        job.status = COMPLETED
+        return job.result
+
+    def _forget_finished(self):
+        """This method drops the oldest finished jobs beyond the history. The lock must be held."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+    def cancel(self, job_id) -> bool:
+        """This method cancels a job. A queued job is removed from the queue, while a running job stops at
+        its next progress checkpoint, freeing its worker.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            bool: True if the cancellation was requested, False if the job is unknown or already finished.
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.progress.cancel()
+        if job.future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def get(self, job_id):
+        """This method retrieves a job by its id.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            ScheduleJob: The job, or None if it is unknown or has been forgotten.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job) -> int:
+        """This method returns the number of jobs queued ahead of a job.
+
+        Args:
+            job (ScheduleJob): The job.
+
+        Returns:
+            int: The number of queued jobs ahead of it, or 0 once it is running or finished.
+        """
+        with self._lock:
+            if job.status != QUEUED:
+                return 0
+            ahead = 0
+            for queued in self._jobs.values():
+                if queued is job:
+                    return ahead
+                ahead += queued.status == QUEUED
+            return 0
+
+    def shutdown(self):
+        """This method stops the workers once the submitted jobs have finished."""
+        self._executor.shutdown(wait=True)
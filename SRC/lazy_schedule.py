@@ -0,0 +1,139 @@
+import threading
+
+
+class LazySchedule:
+    """This class holds a parsed ETABS export indexed by storey, and only designs a storey once its schedule
+    is asked for. Each designed storey is kept, so a storey opened again, or exported along with others, is
+    not designed twice. Each storey is designed under its own lock, so the schedule is safe to share between
+    the requests of several threads, without one storey waiting on the design of another.
+    """
+
+    def __init__(self, beam_inputs, cache=None):
+        """Begin by indexing the inputs of each beam by storey.
+
+        Args:
+            beam_inputs (list): The inputs of each beam, as returned by df_processing.extract_beam_inputs.
+            cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+        """
+        import df_processing as pr
+
+        self.cache = cache
+        self._partitions = {
+            storey: (positions, storey_inputs)
+            for storey, positions, storey_inputs in pr.partition_by_storey(beam_inputs)
+        }
+        self._designed = {}
+        self._locks = {storey: threading.Lock() for storey in self._partitions}
+
+    @classmethod
+    def from_workbook(cls, excel_file, progress=None, cache=None):
+        """This method reads and parses an ETABS design export without designing any of its beams.
+
+        Args:
+            excel_file (str or file-like): The path or content of the uploaded spreadsheet.
+            progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+            cache (DesignCache, optional): The design cache shared across runs. Defaults to None.
+
+        Returns:
+            LazySchedule: The export indexed by storey, or a string describing why it could not be parsed.
+                An export without beams returns "No beams".
+        """
+        import df_processing as pr
+
+        if progress is not None:
+            progress.update("Reading workbook", 0, 1)
+        workbook = pr.read_workbook(excel_file)
+        if isinstance(workbook, str):
+            return workbook
+        if progress is not None:
+            progress.update("Indexing storeys", 0, 1)
+        beam_inputs = pr.extract_beam_inputs(*workbook)
+        if isinstance(beam_inputs, str):
+            return beam_inputs
+        if not beam_inputs:
+            return "No beams"
+        return cls(beam_inputs, cache)
+
+    @property
+    def storeys(self) -> list:
+        """This property lists the storeys, in the order they appear in the export."""
+        return list(self._partitions)
+
+    @property
+    def beam_count(self) -> int:
+        """This property counts the beams of every storey, designed or not."""
+        return sum(len(positions) for positions, _ in self._partitions.values())
+
+    def storey_summary(self) -> list:
+        """This method summarises each storey for the storeys to be chosen from.
+
+        Returns:
+            list: The name, beam count, and whether it is designed yet, of each storey.
+        """
+        return [
+            {
+                "storey": storey,
+                "beams": len(positions),
+                "designed": storey in self._designed,
+            }
+            for storey, (positions, _) in self._partitions.items()
+        ]
+
+    def missing(self, storeys=None) -> list:
+        """This method lists the storeys which are not designed yet.
+
+        Args:
+            storeys (list, optional): The storey names. Defaults to every storey.
+
+        Returns:
+            list: The storeys among those given which are not designed yet.
+        """
+        storeys = self.storeys if not storeys else list(dict.fromkeys(storeys))
+        return [storey for storey in storeys if storey not in self._designed]
+
+    def storey(self, storey, progress=None):
+        """This method returns the schedule of one storey, designing it on first use.
+
+        Args:
+            storey (str): The storey name.
+            progress (ProgressReporter, optional): Receives the progress of its design. Defaults to None.
+
+        Raises:
+            KeyError: The export has no such storey.
+
+        Returns:
+            pd.DataFrame: The beam schedule of the storey.
+        """
+        import df_processing as pr
+
+        positions, storey_inputs = self._partitions[storey]
+        with self._locks[storey]:
+            if storey not in self._designed:
+                self._designed[storey] = pr.design_inputs(
+                    storey_inputs, progress, self.cache
+                )
+            return self._designed[storey]
+
+    def schedule(self, storeys=None, progress=None):
+        """This method returns the schedule of the given storeys, designing those not designed yet.
+
+        Args:
+            storeys (list, optional): The storey names. Defaults to every storey.
+            progress (ProgressReporter, optional): Receives the progress of each storey's design, which
+                stops at its next checkpoint once cancelled. Defaults to None.
+
+        Raises:
+            KeyError: The export has no such storey.
+
+        Returns:
+            pd.DataFrame: The beam schedule of the storeys, in the order of the export.
+        """
+        import df_processing as pr
+
+        storeys = self.storeys if not storeys else list(dict.fromkeys(storeys))
+        return pr.assemble_storeys(
+            [
+                (self._partitions[storey][0], self.storey(storey, progress))
+                for storey in storeys
+            ]
+        )
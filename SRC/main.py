@@ -1,97 +1,234 @@
-import pandas as pd
+import time
+
+# Time the startup from before the imports, so the report includes them.
+STARTED_AT = time.perf_counter()
+
 import beamscheduler_gui as gui
-from nicegui import ui, events
-import io
+from nicegui import app, ui, events
+import os
 import tempfile
-import df_processing as pr
+import settings
+from session_store import SessionResultStore
+from job_queue import ScheduleJobQueue, QueueFullError, QUEUED
+from job_control import JobCancelled
+from api import register_api
+from schedule_database import ScheduleDatabase, process_and_store
+from design_cache import DesignCache
+from static_assets import register_assets
+from upload_spool import UploadTooLargeError, close_when_done, spool_upload
 import asyncio
 
-# Global variable to store the processed DataFrame
-processed_beam_schedule_df = None
+# Store the processed DataFrame of each client session, so concurrent users do not overwrite each other.
+session_results = SessionResultStore(
+    ttl=settings.SESSION_RESULT_TTL,
+    max_bytes=int(settings.SESSION_RESULT_MAX_MB * 1024**2),
+)
+
+# Process the uploaded schedules on a bounded pool of workers.
+job_queue = ScheduleJobQueue(
+    workers=settings.JOB_WORKERS,
+    max_depth=settings.JOB_QUEUE_DEPTH,
+    history=settings.JOB_HISTORY,
+)
+
+# Store the processed schedules, so an unchanged workbook reloads without being designed again. Only the
+# most recent revisions of each project are kept.
+schedule_database = ScheduleDatabase(
+    settings.SCHEDULE_DATABASE, settings.SCHEDULE_DATABASE_REVISIONS
+)
+
+# Cache the design of each beam across projects, so beams designed before are looked up instead.
+design_cache = (
+    DesignCache(settings.DESIGN_CACHE, settings.DESIGN_CACHE_MB)
+    if settings.DESIGN_CACHE
+    else None
+)
+
+# Serve the headless schedule API from the same queue, so scripted and GUI uploads share the workers.
+register_api(app, job_queue, schedule_database, design_cache)
+
+# Serve the bundled icons and images locally, so the page does not depend on the network.
+register_assets(app)
+
+
+# Report how long the application took to start, from its first import to serving the window, when asked to.
+def report_startup():
+    print(f"Beam Scheduler started in {time.perf_counter() - STARTED_AT:.2f} s")
+
+
+if settings.REPORT_STARTUP:
+    app.on_startup(report_startup)
 
 
 def main():
+    ui.run(reload=False, title="Beam Scheduler", native=True)
+
+
+# Build the page for each client, so that every session has its own upload and download controls.
+@ui.page("/")
+def index():
+    gui.page_head()
     gui.start_popup()
     gui.ui_header()
-    gui.main_row(lambda e: excel_handler(e, main_container))
+    gui.main_row(
+        lambda e: excel_handler(e, main_container),
+        max_file_size=int(settings.UPLOAD_MAX_MB * 1024**2),
+    )
     main_container = gui.download_button()
-    ui.run(reload=False, title="Beam Scheduler", native=True)
 
 
 # Handle and utilise the excel spreadsheet for processing.
-def excel_handler(e: events.UploadEventArguments, container):
-    global processed_beam_schedule_df
-    xl = pd.ExcelFile(e.content)
-    if len(xl.sheet_names) == 3:
-        ui.notify(
-            f"{e.name} successfully uploaded! Please await processing.",
-            type="positive",
+async def excel_handler(e: events.UploadEventArguments, container):
+    # Copy the upload into a spooled file in a worker thread. Large workbooks go to disk rather than memory,
+    # and the copy remains readable while the job waits in the queue.
+    try:
+        content = await asyncio.to_thread(
+            spool_upload,
+            e.content,
+            int(settings.UPLOAD_MAX_MB * 1024**2),
+            int(settings.UPLOAD_SPOOL_MB * 1024**2),
         )
-        # Schedule the processing of the content asynchronously
-        asyncio.create_task(process_content(e, container))
-    else:
-        ui.notify(
-            f"{e.name} does not contain the correct number of sheets. Are you sure flexure and shear are in the same spreadsheet?",
-            type="warning",
+    except UploadTooLargeError as error:
+        with container:
+            ui.notify(f"{e.name} is too large to process. {error}", type="warning")
+        return
+
+    # Reading, validating and processing the spreadsheet all happen within a worker, away from the event loop.
+    # The design engine and pandas are imported there on the first upload, keeping them out of the startup.
+    # A workbook identical to one processed before reloads its stored schedule instead.
+    try:
+        job = job_queue.submit(
+            process_and_store,
+            schedule_database,
+            content,
+            os.path.splitext(e.name)[0],
+            cache=design_cache,
+            name=e.name,
+            track_progress=True,
         )
+    except QueueFullError:
+        content.close()
+        with container:
+            ui.notify(
+                "The server is busy processing other beam schedules. Please try again in a few minutes.",
+                type="warning",
+            )
+        return
+    close_when_done(job, content)
+    with container:
+        if job.status == QUEUED:
+            ui.notify(
+                f"{e.name} is queued until a worker is free ({job_queue.position(job)} other upload(s) ahead).",
+                type="info",
+            )
+        else:
+            ui.notify(
+                f"{e.name} successfully uploaded! Please await processing.",
+                type="positive",
+            )
+    # Await the outcome of the processing asynchronously
+    asyncio.create_task(process_content(e, container, job))
 
 
-async def process_content(e: events.UploadEventArguments, container):
-    global processed_beam_schedule_df
-    excel_file = e.content
-    checking_flex = pd.read_excel(excel_file, sheet_name=0)
-    checking_shear = pd.read_excel(excel_file, sheet_name=1)
-    if (
-        checking_flex.columns[0]
-        == "TABLE:  Concrete Beam Flexure Envelope - ACI 318-19"
-        and checking_shear.columns[0]
-        == "TABLE:  Concrete Beam Shear Envelope - ACI 318-19"
-    ):
-        initial_flexural_df = pd.read_excel(excel_file, sheet_name=0)
-        initial_shear_df = pd.read_excel(excel_file, sheet_name=1)
-        processed_beam_schedule_df = await asyncio.to_thread(
-            pr.process_dataframes, initial_flexural_df, initial_shear_df
+async def process_content(e: events.UploadEventArguments, container, job):
+    session_id = e.client.id
+
+    # Push the job's latest progress to the page at a fixed interval, however often the job reports it.
+    with container:
+        progress_column, progress_label, progress_bar = gui.progress_display(
+            lambda: job_queue.cancel(job.id)
         )
+        with progress_column:
+            ui.timer(
+                settings.PROGRESS_INTERVAL,
+                lambda: show_progress(job, progress_label, progress_bar),
+            )
+    try:
+        processed_beam_schedule_df = await asyncio.wrap_future(job.future)
+    except (JobCancelled, asyncio.CancelledError):
+        # A cancelled job leaves the session's previous result in place.
         with container:
-            if isinstance(processed_beam_schedule_df, str):
-                if processed_beam_schedule_df == "Incorrect section definitions":
-                    ui.notify(
-                        "The section definitions as exported in the spreadsheet do not abide with the syntax required. Please update and try again.",
-                        type="negative",
-                    )
-            elif processed_beam_schedule_df is None:
+            ui.notify(f"Processing {e.name} was cancelled.", type="info")
+        return
+    except Exception:
+        with container:
+            ui.notify(
+                f"Processing {e.name} failed ({job.error}). Please revise the spreadsheet and try again.",
+                type="negative",
+            )
+        return
+    finally:
+        container.remove(progress_column)
+    # The worker has imported pandas by now, so this import is immediate.
+    import pandas as pd
+
+    with container:
+        if isinstance(processed_beam_schedule_df, str):
+            if processed_beam_schedule_df == "Incorrect number of sheets":
                 ui.notify(
-                    "No data available for download or uploaded file does not adhere to considerations. Please try again.",
+                    f"{e.name} does not contain the correct number of sheets. Are you sure flexure and shear are in the same spreadsheet?",
+                    type="warning",
+                )
+            elif processed_beam_schedule_df == "Incorrect sheets":
+                ui.notify(
+                    f"{e.name} does not contain the correct sheets. Are you sure flexure and shear are in the this spreadsheet?",
+                    type="warning",
+                )
+            elif processed_beam_schedule_df == "Incorrect section definitions":
+                ui.notify(
+                    "The section definitions as exported in the spreadsheet do not abide with the syntax required. Please update and try again.",
                     type="negative",
                 )
-            elif isinstance(processed_beam_schedule_df, pd.DataFrame):
-                if processed_beam_schedule_df.empty:
-                    ui.notify(
-                        "Processing did not go through and spreadsheet is empty. Please revise and consider context then try again",
-                        type="warning",
-                    )
-                else:
-                    ui.notify(
-                        "Processing complete. Please download the completed beam schedule.",
-                        type="positive",
-                    )
-                    add_down_button()
-    else:
-        with container:
+        elif processed_beam_schedule_df is None:
             ui.notify(
-                f"{e.name} does not contain the correct sheets. Are you sure flexure and shear are in the this spreadsheet?",
-                type="warning",
+                "No data available for download or uploaded file does not adhere to considerations. Please try again.",
+                type="negative",
             )
+        elif isinstance(processed_beam_schedule_df, pd.DataFrame):
+            if processed_beam_schedule_df.empty:
+                ui.notify(
+                    "Processing did not go through and spreadsheet is empty. Please revise and consider context then try again",
+                    type="warning",
+                )
+            elif not session_results.put(session_id, processed_beam_schedule_df):
+                ui.notify(
+                    "The processed beam schedule is too large to hold on this server. Please split the model and try again.",
+                    type="negative",
+                )
+            else:
+                ui.notify(
+                    "Processing complete. Please download the completed beam schedule.",
+                    type="positive",
+                )
+                add_down_button(session_id)
 
 
-def add_down_button():
+def show_progress(job, progress_label, progress_bar):
+    latest = job.progress.latest
+    if latest is None:
+        return
+    if latest["total"] > 1:
+        progress_label.text = f"{latest['stage']}: {latest['done']} of {latest['total']} beams ({latest['elapsed']:.0f} s)"
+    else:
+        progress_label.text = f"{latest['stage']}... ({latest['elapsed']:.0f} s)"
+    progress_bar.value = job.progress.fraction
+
+
+def add_down_button(session_id):
     with ui.grid(columns=3).classes("w-full no-wrap mt-5"):
         with ui.row().classes("pt-8 pb-6 pr-6 pl-10 justify-start items-start"):
             pass
         with ui.row().classes("pt-6 pb-6 pr-6 pl-6 justify-center items-center"):
             ui.button(
                 "download beam schedule",
-                on_click=download_handler,
+                on_click=lambda: download_handler(session_id),
+                color="#075985",
+            ).classes("text-lg font-bold self-center rounded-full").on(
+                "click", lambda: ui.notify("Downloading...")
+            )
+            ui.button(
+                "download per storey (.zip)",
+                on_click=lambda: bundle_download_handler(session_id),
                 color="#075985",
             ).classes("text-lg font-bold self-center rounded-full").on(
                 "click", lambda: ui.notify("Downloading...")
@@ -100,41 +237,51 @@ def add_down_button():
             pass
 
 
-# Create the relevant functions to export the excel file
-def export_file(beam_schedule_df):
-    # Use BytesIO as an in-memory buffer
-    output = io.BytesIO()
-
-    # Create an Excel writer object with the BytesIO object
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        # Write the entire DataFrame to the first sheet
-        beam_schedule_df.to_excel(writer, sheet_name="Beam Reinforcement Schedule")
+# Write exported content to a temporary file, so that it can be offered for download.
+def write_temporary_file(content, suffix):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(content)
+        return tmp.name
 
-        # Group by the 'Storey' column
-        grouped = beam_schedule_df.groupby("Storey", sort=False)
-
-        # Iterate through the groups and write to separate sheets
-        for name, group in grouped:
-            sheet_name = f"{name}"
-            group.to_excel(writer, sheet_name=sheet_name)
-
-    # Return the Excel file content from the in-memory buffer
-    return output.getvalue()
 
+async def download_handler(session_id):
+    processed_beam_schedule_df = session_results.get(session_id)
+    if processed_beam_schedule_df is None:
+        ui.notify(
+            "The processed beam schedule has expired. Please upload the spreadsheet again.",
+            type="warning",
+        )
+        return
+    import export_processing as ex
 
-def download_handler():
-    global processed_beam_schedule_df
-    # Call export_file to get the in-memory Excel file
-    excel_content = export_file(processed_beam_schedule_df)
+    # Call export_file in a worker thread to get the in-memory Excel file
+    excel_content = await asyncio.to_thread(ex.export_file, processed_beam_schedule_df)
 
     # Write the content to a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-        tmp.write(excel_content)
-        tmp_path = tmp.name  # Store the file path
+    tmp_path = await asyncio.to_thread(write_temporary_file, excel_content, ".xlsx")
 
     # Initiate the download using the file path
     ui.download(tmp_path, "beam_schedule.xlsx")
 
 
+async def bundle_download_handler(session_id):
+    processed_beam_schedule_df = session_results.get(session_id)
+    if processed_beam_schedule_df is None:
+        ui.notify(
+            "The processed beam schedule has expired. Please upload the spreadsheet again.",
+            type="warning",
+        )
+        return
+    import export_processing as ex
+
+    # Export one workbook per storey in parallel and bundle them into a zip archive.
+    zip_content = await asyncio.to_thread(
+        ex.export_storey_bundle, processed_beam_schedule_df
+    )
+    tmp_path = await asyncio.to_thread(write_temporary_file, zip_content, ".zip")
+
+    ui.download(tmp_path, "beam_schedule_by_storey.zip")
+
+
 if __name__ in {"__main__", "__mp_main__"}:
     main()
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+# The density of reinforcing steel in kg/m^3.
+STEEL_DENSITY = 7850
+
+# The span assumed for beams when the schedule does not hold their length, in mm.
+ASSUMED_LENGTH = 6000
+
+# The schedule columns holding the flexural, shear link, and side face reinforcement strings.
+FLEXURE_COLUMNS = {
+    "Top Flexure (kg)": [
+        ("Top Reinforcement", "Left (TL)"),
+        ("Top Reinforcement", "Middle (T)"),
+        ("Top Reinforcement", "Right (TR)"),
+    ],
+    "Bottom Flexure (kg)": [
+        ("Bottom Reinforcement", "Left (BL)"),
+        ("Bottom Reinforcement", "Middle (B)"),
+        ("Bottom Reinforcement", "Right (BR)"),
+    ],
+}
+SHEAR_COLUMNS = [
+    ("Shear links", "Left (H)"),
+    ("Shear links", "Middle (J)"),
+    ("Shear links", "Right (K)"),
+]
+SIDE_FACE_COLUMN = ("Side Face Reinforcement", "")
+LENGTH_COLUMN = ("Dimensions", "Length (mm)")
+
+
+def bar_area(diameters):
+    """This function returns the cross sectional area of an array of bar diameters.
+
+    Args:
+        diameters (np.ndarray): The bar diameters in mm.
+
+    Returns:
+        np.ndarray: The bar areas in mm^2.
+    """
+    return np.pi * (diameters / 2) ** 2
+
+
+def steel_mass(area, length):
+    """This function returns the mass of steel for a given area and length.
+
+    Args:
+        area (np.ndarray): The steel area in mm^2.
+        length (np.ndarray): The length of the steel in mm.
+
+    Returns:
+        np.ndarray: The mass in kg.
+    """
+    return area * length * 10**-9 * STEEL_DENSITY
+
+
+def flexure_area(rebar_strings):
+    """This function parses flexural rebar strings such as "3T25" or "3T25 + 3T20" into their total
+    steel area. Strings holding messages, such as overstressed beams, return NaN.
+
+    Args:
+        rebar_strings (pd.Series): The flexural rebar strings of a zone.
+
+    Returns:
+        np.ndarray: The total steel area of each string in mm^2.
+    """
+    parts = (
+        rebar_strings.astype(str)
+        .str.extract(r"^(\d+)T(\d+)(?: \+ (\d+)T(\d+))?$")
+        .astype(float)
+    )
+    first_layer = parts[0].to_numpy() * bar_area(parts[1].to_numpy())
+    second_layer = np.nan_to_num(parts[2].to_numpy() * bar_area(parts[3].to_numpy()))
+    return first_layer + second_layer
+
+
+def steel_takeoff(beam_schedule_df, assumed_length=ASSUMED_LENGTH, cover=40):
+    """This function computes the steel mass of every beam in the schedule in one vectorised pass. Each
+    beam is split into equal left, middle, and right zones. Shear links are taken as a closed hoop with
+    any additional legs running the depth of the beam, and side face bars run the full length of both
+    faces. Beams without a designed string, such as overstressed beams, are left without a mass.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+        assumed_length (float, optional): The span of beams whose length is not in the schedule, in mm.
+        cover (float, optional): The cover to the shear links, in mm. Defaults to 40.
+
+    Returns:
+        pd.DataFrame: The steel mass of each beam in kg.
+    """
+    width = beam_schedule_df[("Dimensions", "Width (mm)")].to_numpy(dtype=float)
+    depth = beam_schedule_df[("Dimensions", "Depth (mm)")].to_numpy(dtype=float)
+    if LENGTH_COLUMN in beam_schedule_df.columns:
+        length = beam_schedule_df[LENGTH_COLUMN].to_numpy(dtype=float)
+    else:
+        length = np.full(len(beam_schedule_df), np.nan)
+    length_assumed = np.isnan(length)
+    length = np.where(length_assumed, assumed_length, length)
+    zone_length = length / 3
+
+    takeoff = {
+        "Storey": beam_schedule_df[("Storey", "")].to_numpy(),
+        "Etabs ID": beam_schedule_df[("Etabs ID", "")].to_numpy(),
+        "Length (mm)": length,
+        "Length Assumed": length_assumed,
+    }
+
+    for name, columns in FLEXURE_COLUMNS.items():
+        takeoff[name] = sum(
+            steel_mass(flexure_area(beam_schedule_df[column]), zone_length)
+            for column in columns
+        )
+
+    # Each link set is a closed hoop of two legs, with any remaining legs added as straight bars.
+    hoop_width = width - 2 * cover
+    hoop_depth = depth - 2 * cover
+    links_mass = 0
+    for column in SHEAR_COLUMNS:
+        parts = (
+            beam_schedule_df[column]
+            .astype(str)
+            .str.extract(r"^(\d+)L-T(\d+)@(\d+)$")
+            .astype(float)
+        )
+        legs, dia, spacing = (parts[i].to_numpy() for i in range(3))
+        link_length = 2 * hoop_width + 2 * hoop_depth + (legs - 2) * hoop_depth
+        link_count = np.ceil(zone_length / spacing)
+        links_mass = links_mass + steel_mass(bar_area(dia) * link_count, link_length)
+    takeoff["Shear Links (kg)"] = links_mass
+
+    # Side face bars are spaced over the clear depth on each face. Beams not needing them weigh nothing.
+    side_face = beam_schedule_df[SIDE_FACE_COLUMN].astype(str)
+    parts = side_face.str.extract(r"^T(\d+)@(\d+) EF$").astype(float)
+    dia, spacing = parts[0].to_numpy(), parts[1].to_numpy()
+    bars_per_face = np.maximum(np.floor(hoop_depth / spacing) - 1, 1)
+    side_face_mass = steel_mass(2 * bars_per_face * bar_area(dia), length)
+    takeoff["Side Face (kg)"] = np.where(
+        side_face.eq("Not needed").to_numpy(), 0, side_face_mass
+    )
+
+    takeoff_df = pd.DataFrame(takeoff, index=beam_schedule_df.index)
+    takeoff_df["Total (kg)"] = takeoff_df[
+        [
+            "Top Flexure (kg)",
+            "Bottom Flexure (kg)",
+            "Shear Links (kg)",
+            "Side Face (kg)",
+        ]
+    ].sum(axis=1, min_count=4)
+    return takeoff_df
+
+
+def storey_takeoff(takeoff_df):
+    """This function totals the steel mass of each storey.
+
+    Args:
+        takeoff_df (pd.DataFrame): The steel mass of each beam, as returned by steel_takeoff.
+
+    Returns:
+        pd.DataFrame: The steel mass of each storey, with the number of beams that could not be measured.
+    """
+    grouped = takeoff_df.groupby("Storey", sort=False, observed=True)
+    summary = grouped[
+        [
+            "Top Flexure (kg)",
+            "Bottom Flexure (kg)",
+            "Shear Links (kg)",
+            "Side Face (kg)",
+            "Total (kg)",
+        ]
+    ].sum()
+    summary.insert(0, "Beams", grouped.size())
+    summary.insert(
+        1,
+        "Beams Not Measured",
+        takeoff_df["Total (kg)"]
+        .isna()
+        .groupby(takeoff_df["Storey"], sort=False, observed=True)
+        .sum(),
+    )
+    summary["Total (t)"] = summary["Total (kg)"] / 1000
+    return summary.reset_index()
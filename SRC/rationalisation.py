@@ -0,0 +1,164 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import df_processing as pr
+
+# The designed section and reinforcement which make up a beam type.
+DIMENSION_COLUMNS = [("Dimensions", "Width (mm)"), ("Dimensions", "Depth (mm)")]
+REINFORCEMENT_COLUMNS = [
+    ("Bottom Reinforcement", "Left (BL)"),
+    ("Bottom Reinforcement", "Middle (B)"),
+    ("Bottom Reinforcement", "Right (BR)"),
+    ("Top Reinforcement", "Left (TL)"),
+    ("Top Reinforcement", "Middle (T)"),
+    ("Top Reinforcement", "Right (TR)"),
+    ("Side Face Reinforcement", ""),
+    ("Shear links", "Left (H)"),
+    ("Shear links", "Middle (J)"),
+    ("Shear links", "Right (K)"),
+    ("Check Transverse Shear Spacing?", ""),
+]
+TYPE_COLUMNS = DIMENSION_COLUMNS + REINFORCEMENT_COLUMNS
+PROVIDED_COLUMNS = [(group, "Provided (mm^2)") for group in pr.CRITERIA_GROUPS]
+
+# Beam types only merge into one of the most recent heavier types of their section, which bounds the
+# comparisons made for each type and keeps the merging O(n log n) overall.
+MERGE_WINDOW = 8
+
+TYPE_MARK_COLUMN = ("Type Mark", "")
+
+
+def exact_types(beam_schedule_df) -> np.ndarray:
+    """This function groups beams with the same section and designed reinforcement, hashing each beam's
+    result tuple in a single pass.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+
+    Returns:
+        np.ndarray: The exact type of each beam, numbered in order of first appearance.
+    """
+    return (
+        beam_schedule_df[TYPE_COLUMNS]
+        .astype("string")
+        .fillna("")
+        .groupby(TYPE_COLUMNS, sort=False)
+        .ngroup()
+        .to_numpy()
+    )
+
+
+def merge_types(types_df, tolerance) -> np.ndarray:
+    """This function merges lighter beam types into heavier types of the same section, where the heavier
+    type provides at least as much steel in every zone and no more than the tolerance more steel in total.
+    Beam types are sorted by section and then total provided steel, heaviest first, and each is compared to
+    the most recent heavier types of its section only.
+
+    Args:
+        types_df (pd.DataFrame): One row per exact type holding its type columns and provided areas.
+        tolerance (float): The fraction of extra steel a merged beam may be given, such as 0.1 for 10%.
+
+    Returns:
+        np.ndarray: The exact type each exact type is merged into, which is itself if it is not merged.
+    """
+    merged_into = np.arange(len(types_df))
+    provided = types_df[PROVIDED_COLUMNS].to_numpy(dtype=float)
+    total = provided.sum(axis=1)
+    # Types with any overstressed zone have no provided area to compare, so they stay as they are.
+    mergeable = ~np.isnan(provided).any(axis=1)
+
+    section = (
+        types_df[
+            DIMENSION_COLUMNS
+            + [("Side Face Reinforcement", ""), ("Check Transverse Shear Spacing?", "")]
+        ]
+        .astype("string")
+        .fillna("")
+        .agg("|".join, axis=1)
+        .to_numpy()
+    )
+    candidates = np.flatnonzero(mergeable)
+    order = candidates[np.lexsort((-total[candidates], section[candidates]))]
+
+    leaders = deque(maxlen=MERGE_WINDOW)
+    current_section = None
+    for index in order:
+        if section[index] != current_section:
+            current_section = section[index]
+            leaders.clear()
+        for leader in reversed(leaders):
+            if (provided[leader] >= provided[index]).all() and total[leader] <= total[
+                index
+            ] * (1 + tolerance):
+                merged_into[index] = leader
+                break
+        else:
+            leaders.append(index)
+    return merged_into
+
+
+def rationalise(beam_schedule_df, tolerance=0.0):
+    """This function rationalises the beam schedule into beam types. Beams are first grouped by their
+    section and designed reinforcement. With a tolerance, lighter types are then merged into heavier
+    types of the same section which envelope them. Each type is given a type mark, ordered by section
+    depth, width, and provided steel.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+        tolerance (float, optional): The fraction of extra steel a merged beam may be given. Defaults to
+            0.0, which only groups identical beams.
+
+    Returns:
+        tuple: The typed beam schedule, with its type mark after the etabs id and the reinforcement of each
+            beam replaced by its type's, and the type schedule with one row per type.
+    """
+    exact = exact_types(beam_schedule_df)
+    first_rows = pd.Series(np.arange(len(exact))).groupby(exact).first().to_numpy()
+    types_df = beam_schedule_df.iloc[first_rows].reset_index(drop=True)
+
+    merged_into = (
+        merge_types(types_df, tolerance) if tolerance > 0 else np.arange(len(types_df))
+    )
+    beam_type = merged_into[exact]
+
+    # Number the types by depth, width, and total provided steel.
+    final_types = np.unique(merged_into)
+    final_df = types_df.iloc[final_types]
+    mark_order = np.lexsort(
+        (
+            final_df[PROVIDED_COLUMNS].to_numpy(dtype=float).sum(axis=1),
+            final_df[("Dimensions", "Width (mm)")].to_numpy(),
+            final_df[("Dimensions", "Depth (mm)")].to_numpy(),
+        )
+    )
+    width = len(str(len(final_types)))
+    marks = np.empty(len(types_df), dtype=object)
+    marks[final_types[mark_order]] = [
+        f"BT{number:0{width}d}" for number in range(1, len(final_types) + 1)
+    ]
+
+    # Each beam takes the reinforcement of its type. Only types providing steel in every zone are merged,
+    # so the status of each beam stands as designed.
+    typed_df = beam_schedule_df.copy()
+    type_rows = first_rows[beam_type]
+    for column in REINFORCEMENT_COLUMNS + PROVIDED_COLUMNS:
+        typed_df[column] = beam_schedule_df[column].to_numpy()[type_rows]
+    typed_df.insert(2, TYPE_MARK_COLUMN, marks[beam_type])
+    typed_df = pr.apply_schedule_dtypes(typed_df)
+
+    # The type schedule lists each type's section, reinforcement, beam count, and storeys.
+    type_schedule_df = final_df[TYPE_COLUMNS].copy()
+    type_schedule_df.insert(0, TYPE_MARK_COLUMN, marks[final_types])
+    members = pd.Series(typed_df[("Storey", "")].astype(str).to_numpy()).groupby(
+        beam_type
+    )
+    type_schedule_df[("Beams", "")] = members.size().reindex(final_types).to_numpy()
+    type_schedule_df[("Storeys", "")] = (
+        members.agg(lambda storeys: ", ".join(pd.unique(storeys)))
+        .reindex(final_types)
+        .to_numpy()
+    )
+    type_schedule_df = type_schedule_df.iloc[mark_order].reset_index(drop=True)
+    return typed_df, type_schedule_df
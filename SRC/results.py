@@ -0,0 +1,20 @@
+# The outcomes of processing an ETABS design export, shared by the HTTP API and the command line. This
+# module is kept free of imports, so the API and the command line start without loading the design engine.
+
+# The messages reported for the sentinel results of process_workbook.
+INVALID_RESULTS = {
+    "Incorrect number of sheets": "The spreadsheet does not contain the flexure and shear sheets together.",
+    "Incorrect sheets": "The spreadsheet does not contain the flexure and shear sheets.",
+    "Incorrect section definitions": "The section definitions do not abide with the syntax required.",
+    "Mismatched sections": "A beam is defined with different sections in the runs to merge.",
+    "Duplicate stations": "A beam station appears more than once in one of the runs to merge.",
+    "Mismatched stations": "A beam has its stations at different locations in the runs to merge.",
+}
+
+# The exit codes of the command line.
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_NO_INPUTS = 2
+
+# The suffix added to each input's name to name its schedule.
+OUTPUT_SUFFIX = "_beam_schedule.xlsx"
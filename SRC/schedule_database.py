@@ -0,0 +1,524 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+# The tables of the schedule database. Each schedule is stored as one payload per storey, so a storey
+# reloads without reading the rest of the schedule, along with the rows of the schedule the storey's beams
+# occupy, so a schedule whose storeys are interleaved reloads in the order of its export.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    beam_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    fingerprints BLOB,
+    UNIQUE (project, revision)
+);
+CREATE INDEX IF NOT EXISTS schedules_input ON schedules (input_hash, parameters);
+CREATE TABLE IF NOT EXISTS schedule_storeys (
+    schedule_id INTEGER NOT NULL REFERENCES schedules (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    storey TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    rows BLOB,
+    PRIMARY KEY (schedule_id, position)
+);
+CREATE INDEX IF NOT EXISTS schedule_storeys_storey ON schedule_storeys (schedule_id, storey);
+"""
+
+
+def content_hash(excel_file) -> str:
+    """This function returns the SHA-256 hash of an uploaded workbook, leaving the file at its start.
+
+    Args:
+        excel_file (str or file-like): The path or content of the workbook.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    digest = hashlib.sha256()
+    if isinstance(excel_file, (str, os.PathLike)):
+        with open(excel_file, "rb") as file:
+            for block in iter(lambda: file.read(1024**2), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    excel_file.seek(0)
+    for block in iter(lambda: excel_file.read(1024**2), b""):
+        digest.update(block)
+    excel_file.seek(0)
+    return digest.hexdigest()
+
+
+def encode_parameters(parameters) -> str:
+    """This function encodes design parameters consistently, so that equal parameters compare equal.
+
+    Args:
+        parameters (dict): The design parameters.
+
+    Returns:
+        str: The parameters as canonical JSON.
+    """
+    return json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+
+
+class ScheduleDatabase:
+    """This class stores processed beam schedules in a local SQLite database, indexed by project, revision
+    and storey. Each schedule records the hash of the workbook it was designed from and the design
+    parameters used, so a schedule is only reused for the same input under the same rules. Only the most
+    recent revisions of each project are kept, when a limit is given. A connection is opened per call, so the
+    database is safe to use from the event loop and worker threads alike.
+    """
+
+    def __init__(self, path, max_revisions=None):
+        """Begin by creating the database and its tables if they do not exist.
+
+        Args:
+            path (str): The path of the SQLite database file.
+            max_revisions (int, optional): The number of revisions kept per project, the oldest being
+                deleted as new revisions are saved. Defaults to keeping every revision.
+        """
+        self.path = path
+        self.max_revisions = max_revisions
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            # Databases created before beam fingerprints were stored gain the column here.
+            columns = [
+                row[1] for row in connection.execute("PRAGMA table_info(schedules)")
+            ]
+            if "fingerprints" not in columns:
+                connection.execute("ALTER TABLE schedules ADD COLUMN fingerprints BLOB")
+            # Databases created before the rows of each storey were stored gain the column here.
+            columns = [
+                row[1]
+                for row in connection.execute("PRAGMA table_info(schedule_storeys)")
+            ]
+            if "rows" not in columns:
+                connection.execute("ALTER TABLE schedule_storeys ADD COLUMN rows BLOB")
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """This method opens a connection to the database, with foreign keys enforced."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def save(
+        self,
+        project,
+        revision,
+        beam_schedule_df,
+        input_hash,
+        parameters,
+        fingerprints=None,
+    ):
+        """This method stores a processed schedule, replacing any earlier schedule of the same revision.
+
+        Args:
+            project (str): The project the schedule belongs to.
+            revision (str): The revision of the project.
+            beam_schedule_df (pd.DataFrame): The processed beam schedule.
+            input_hash (str): The hash of the workbook the schedule was designed from.
+            parameters (dict): The design parameters the schedule was designed with.
+            fingerprints (list, optional): The fingerprint of each beam's inputs, in the order of the rows,
+                which allows a later revision to only redesign the beams which changed.
+        """
+        beam_schedule_df = beam_schedule_df.reset_index(drop=True)
+        storeys = [
+            (
+                position,
+                str(storey),
+                zlib.compress(
+                    storey_df.to_json(orient="split", index=False).encode("utf-8")
+                ),
+                zlib.compress(json.dumps(storey_df.index.tolist()).encode("utf-8")),
+            )
+            for position, (storey, storey_df) in enumerate(
+                beam_schedule_df.groupby("Storey", sort=False, observed=True)
+            )
+        ]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "DELETE FROM schedules WHERE project = ? AND revision = ?",
+                    (project, revision),
+                )
+                schedule_id = connection.execute(
+                    "INSERT INTO schedules (project, revision, input_hash, parameters, beam_count, created_at,"
+                    " fingerprints) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        project,
+                        revision,
+                        input_hash,
+                        encode_parameters(parameters),
+                        len(beam_schedule_df),
+                        time.time(),
+                        None
+                        if fingerprints is None
+                        else zlib.compress(json.dumps(fingerprints).encode("utf-8")),
+                    ),
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO schedule_storeys (schedule_id, position, storey, payload, rows)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(schedule_id, *storey) for storey in storeys],
+                )
+                if self.max_revisions:
+                    self._prune(connection, project)
+        finally:
+            connection.close()
+
+    def _prune(self, connection, project):
+        """This method deletes the oldest revisions of a project beyond the number kept.
+
+        Args:
+            connection (sqlite3.Connection): The open connection to prune through.
+            project (str): The project.
+        """
+        connection.execute(
+            "DELETE FROM schedules WHERE id IN (SELECT id FROM schedules WHERE project = ?"
+            " ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?)",
+            (project, self.max_revisions),
+        )
+
+    def load(self, project, revision, storeys=None):
+        """This method reloads a stored schedule with its typed schema, without designing it again.
+
+        Args:
+            project (str): The project the schedule belongs to.
+            revision (str): The revision of the project.
+            storeys (list, optional): The storeys to load. Defaults to every storey.
+
+        Returns:
+            pd.DataFrame: The beam schedule, in the order of its export, or None if it is not stored.
+        """
+        query = (
+            "SELECT schedule_storeys.payload, schedule_storeys.rows FROM schedule_storeys"
+            " JOIN schedules ON schedules.id = schedule_storeys.schedule_id"
+            " WHERE schedules.project = ? AND schedules.revision = ?"
+        )
+        arguments = [project, revision]
+        if storeys is not None:
+            query += f" AND schedule_storeys.storey IN ({','.join('?' * len(storeys))})"
+            arguments += [str(storey) for storey in storeys]
+        connection = self._connect()
+        try:
+            if not self.exists(project, revision, connection):
+                return None
+            stored = connection.execute(
+                query + " ORDER BY schedule_storeys.position", arguments
+            ).fetchall()
+        finally:
+            connection.close()
+        return decode_schedule(
+            [payload for payload, _ in stored], [rows for _, rows in stored]
+        )
+
+    def load_fingerprints(self, project, revision):
+        """This method reloads the fingerprint of each beam's inputs stored with a schedule.
+
+        Args:
+            project (str): The project the schedule belongs to.
+            revision (str): The revision of the project.
+
+        Returns:
+            list: The fingerprint of each row of the schedule, or None if they were not stored.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT fingerprints FROM schedules WHERE project = ? AND revision = ?",
+                (project, revision),
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def latest_revision(self, project, parameters):
+        """This method finds the most recent revision of a project designed under the same parameters,
+        with its beam fingerprints stored.
+
+        Args:
+            project (str): The project.
+            parameters (dict): The design parameters.
+
+        Returns:
+            str: The revision, or None if there is none.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT revision FROM schedules WHERE project = ? AND parameters = ?"
+                " AND fingerprints IS NOT NULL ORDER BY created_at DESC LIMIT 1",
+                (project, encode_parameters(parameters)),
+            ).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else row[0]
+
+    def parameters(self, project, revision):
+        """This method returns the design parameters a stored schedule was designed with.
+
+        Args:
+            project (str): The project.
+            revision (str): The revision of the project.
+
+        Returns:
+            dict: The design parameters, or None if the revision is not stored.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT parameters FROM schedules WHERE project = ? AND revision = ?",
+                (project, revision),
+            ).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else json.loads(row[0])
+
+    def exists(self, project, revision, connection=None) -> bool:
+        """This method checks whether a revision of a project is stored.
+
+        Args:
+            project (str): The project.
+            revision (str): The revision of the project.
+            connection (sqlite3.Connection, optional): An open connection to reuse.
+
+        Returns:
+            bool: Whether the revision is stored.
+        """
+        own_connection = connection is None
+        connection = connection or self._connect()
+        try:
+            row = connection.execute(
+                "SELECT 1 FROM schedules WHERE project = ? AND revision = ?",
+                (project, revision),
+            ).fetchone()
+        finally:
+            if own_connection:
+                connection.close()
+        return row is not None
+
+    def find(self, input_hash, parameters):
+        """This method finds the most recent schedule designed from the same workbook under the same parameters.
+
+        Args:
+            input_hash (str): The hash of the workbook.
+            parameters (dict): The design parameters.
+
+        Returns:
+            tuple: The project and revision of the schedule, or None if there is none.
+        """
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT project, revision FROM schedules WHERE input_hash = ? AND parameters = ?"
+                " ORDER BY created_at DESC LIMIT 1",
+                (input_hash, encode_parameters(parameters)),
+            ).fetchone()
+        finally:
+            connection.close()
+
+    def revisions(self, project=None) -> list:
+        """This method lists the stored schedules, most recent first.
+
+        Args:
+            project (str, optional): Only list the revisions of this project. Defaults to every project.
+
+        Returns:
+            list: A dictionary per schedule holding its project, revision, input hash, parameters, beam
+                count, storeys, and creation time.
+        """
+        query = "SELECT id, project, revision, input_hash, parameters, beam_count, created_at FROM schedules"
+        arguments = []
+        if project is not None:
+            query += " WHERE project = ?"
+            arguments.append(project)
+        connection = self._connect()
+        try:
+            rows = connection.execute(query + " ORDER BY created_at DESC", arguments)
+            revisions = []
+            for schedule_id, *row in rows.fetchall():
+                storeys = connection.execute(
+                    "SELECT storey FROM schedule_storeys WHERE schedule_id = ? ORDER BY position",
+                    (schedule_id,),
+                ).fetchall()
+                revisions.append(
+                    {
+                        "project": row[0],
+                        "revision": row[1],
+                        "input_hash": row[2],
+                        "parameters": json.loads(row[3]),
+                        "beam_count": row[4],
+                        "created_at": row[5],
+                        "storeys": [storey for (storey,) in storeys],
+                    }
+                )
+            return revisions
+        finally:
+            connection.close()
+
+    def delete(self, project, revision) -> bool:
+        """This method deletes a stored schedule.
+
+        Args:
+            project (str): The project.
+            revision (str): The revision of the project.
+
+        Returns:
+            bool: Whether a schedule was deleted.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM schedules WHERE project = ? AND revision = ?",
+                    (project, revision),
+                ).rowcount
+        finally:
+            connection.close()
+        return deleted > 0
+
+
+def decode_schedule(payloads, rows=None):
+    """This function rebuilds a beam schedule from its stored storey payloads, restoring its typed schema.
+
+    Args:
+        payloads (list): The compressed JSON payload of each storey, in order.
+        rows (list, optional): The compressed JSON rows of each storey's beams within the schedule, which
+            restore the order of the export. Schedules stored without them keep the order of the storeys.
+
+    Returns:
+        pd.DataFrame: The beam schedule.
+    """
+    import df_processing as pr
+    import pandas as pd
+
+    frames = []
+    for payload in payloads:
+        split = json.loads(zlib.decompress(payload))
+        frames.append(
+            pd.DataFrame(
+                split["data"],
+                columns=pd.MultiIndex.from_tuples(
+                    [tuple(column) for column in split["columns"]]
+                ),
+            )
+        )
+    if not frames:
+        return pr.apply_schedule_dtypes(
+            pd.DataFrame(columns=pd.MultiIndex.from_tuples(pr.SCHEDULE_COLUMNS))
+        )
+    beam_schedule_df = pd.concat(frames, ignore_index=True)
+    if rows is not None and all(storey_rows is not None for storey_rows in rows):
+        order = [
+            row
+            for storey_rows in rows
+            for row in json.loads(zlib.decompress(storey_rows))
+        ]
+        beam_schedule_df = beam_schedule_df.set_axis(order).sort_index()
+        beam_schedule_df = beam_schedule_df.reset_index(drop=True)
+    return pr.apply_schedule_dtypes(beam_schedule_df)
+
+
+def process_and_store(
+    database,
+    excel_file,
+    project,
+    revision=None,
+    previous_revision=None,
+    progress=None,
+    cache=None,
+):
+    """This function produces the schedule of a workbook and stores it. The stored schedule of an identical
+    workbook designed under the current rules is reused outright. Otherwise, when a previous revision of the
+    project was designed under the current rules, only the beams whose section or demands have changed
+    since are designed, and the rest are carried over.
+
+    Args:
+        database (ScheduleDatabase): The schedule database.
+        excel_file (str or file-like): The path or content of the workbook.
+        project (str): The project the schedule belongs to.
+        revision (str, optional): The revision of the project. Defaults to the start of the workbook's hash.
+        previous_revision (str, optional): The revision to carry unchanged beams over from. Defaults to the
+            project's most recent revision.
+        progress (ProgressReporter, optional): Receives the progress of each stage. Defaults to None.
+        cache (DesignCache, optional): The design cache shared across projects. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The beam schedule, or a string describing why the workbook could not be processed.
+    """
+    import df_processing as pr
+
+    if progress is not None:
+        progress.update("Checking stored schedules", 0, 1)
+    input_hash = content_hash(excel_file)
+    parameters = pr.design_parameters()
+    revision = revision or input_hash[:12]
+
+    stored = database.find(input_hash, parameters)
+    if stored is not None:
+        beam_schedule_df = database.load(*stored)
+        if stored != (project, revision):
+            database.save(
+                project,
+                revision,
+                beam_schedule_df,
+                input_hash,
+                parameters,
+                database.load_fingerprints(*stored),
+            )
+        return beam_schedule_df
+
+    if progress is not None:
+        progress.update("Reading workbook", 0, 1)
+    workbook = pr.read_workbook(excel_file)
+    if isinstance(workbook, str):
+        return workbook
+    if progress is not None:
+        progress.update("Reading demands", 0, 1)
+    beam_inputs = pr.extract_beam_inputs(*workbook)
+    if isinstance(beam_inputs, str):
+        return beam_inputs
+    fingerprints = pr.beam_fingerprints(beam_inputs)
+
+    # Schedules designed under other rules cannot be carried over.
+    previous_revision = previous_revision or database.latest_revision(
+        project, parameters
+    )
+    previous_fingerprints = None
+    if (
+        previous_revision is not None
+        and database.parameters(project, previous_revision) == parameters
+    ):
+        previous_fingerprints = database.load_fingerprints(project, previous_revision)
+
+    if previous_fingerprints is None:
+        beam_schedule_df = pr.design_inputs(beam_inputs, progress, cache)
+    else:
+        beam_schedule_df = pr.redesign_changed(
+            beam_inputs,
+            fingerprints,
+            database.load(project, previous_revision),
+            previous_fingerprints,
+            progress,
+            cache,
+        )
+    if not beam_schedule_df.empty:
+        database.save(
+            project, revision, beam_schedule_df, input_hash, parameters, fingerprints
+        )
+    return beam_schedule_df
@@ -0,0 +1,219 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import df_processing as pr
+import export_processing as ex
+import settings
+from results import EXIT_FAILED, EXIT_OK, INVALID_RESULTS
+
+# The columns identifying a beam across revisions.
+KEY_COLUMNS = [("Storey", ""), ("Etabs ID", "")]
+
+# The schedule columns compared between revisions: the flexural bars, the shear links, and the side face
+# reinforcement, along with the dimensions they depend on.
+COMPARED_COLUMNS = [
+    ("Dimensions", "Width (mm)"),
+    ("Dimensions", "Depth (mm)"),
+    ("Bottom Reinforcement", "Left (BL)"),
+    ("Bottom Reinforcement", "Middle (B)"),
+    ("Bottom Reinforcement", "Right (BR)"),
+    ("Top Reinforcement", "Left (TL)"),
+    ("Top Reinforcement", "Middle (T)"),
+    ("Top Reinforcement", "Right (TR)"),
+    ("Side Face Reinforcement", ""),
+    ("Shear links", "Left (H)"),
+    ("Shear links", "Middle (J)"),
+    ("Shear links", "Right (K)"),
+]
+
+# The kinds of change reported for each beam.
+ADDED = "Added"
+REMOVED = "Removed"
+CHANGED = "Changed"
+
+CHANGE_COLUMNS = ["Storey", "Etabs ID", "Change", "Element", "Before", "After"]
+
+
+def column_label(column) -> str:
+    """This function names a schedule column for the change sheet, such as "Top Reinforcement Left (TL)".
+
+    Args:
+        column (tuple): The two level schedule column.
+
+    Returns:
+        str: The column's name.
+    """
+    return " ".join(level for level in column if level)
+
+
+def comparable_values(beam_schedule_df) -> pd.DataFrame:
+    """This function takes the key and compared columns of a schedule as strings, keyed by storey and
+    etabs id, so that two revisions compare cell by cell regardless of their dtypes.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): The processed beam schedule.
+
+    Returns:
+        pd.DataFrame: The compared columns as strings, indexed by storey and etabs id.
+    """
+    values = pd.DataFrame(
+        {
+            column_label(column): beam_schedule_df[column]
+            .astype("string")
+            .fillna("")
+            .to_numpy(dtype=object)
+            for column in KEY_COLUMNS + COMPARED_COLUMNS
+        }
+    )
+    # A beam appearing twice in one revision is compared by its last row.
+    return values.drop_duplicates(["Storey", "Etabs ID"], keep="last").set_index(
+        ["Storey", "Etabs ID"]
+    )
+
+
+def diff_schedules(previous_df, current_df) -> pd.DataFrame:
+    """This function compares two revisions of a beam schedule, joining their beams by storey and etabs id.
+    Every compared column is checked in one vectorised comparison across all beams, and each difference
+    becomes a row of the change sheet. Beams only in one revision are reported as added or removed.
+
+    Args:
+        previous_df (pd.DataFrame): The beam schedule of the earlier revision.
+        current_df (pd.DataFrame): The beam schedule of the later revision.
+
+    Returns:
+        pd.DataFrame: One row per changed element, added beam, or removed beam, in the order of the later
+            revision followed by the removed beams.
+    """
+    previous = comparable_values(previous_df)
+    current = comparable_values(current_df)
+    labels = [column_label(column) for column in COMPARED_COLUMNS]
+
+    common = current.index.intersection(previous.index, sort=False)
+    before = previous.loc[common, labels].to_numpy()
+    after = current.loc[common, labels].to_numpy()
+    rows, columns = np.nonzero(before != after)
+    changed = pd.DataFrame(
+        {
+            "Storey": common.get_level_values(0)[rows],
+            "Etabs ID": common.get_level_values(1)[rows],
+            "Change": CHANGED,
+            "Element": np.asarray(labels, dtype=object)[columns],
+            "Before": before[rows, columns],
+            "After": after[rows, columns],
+        }
+    )
+
+    added_index = current.index.difference(previous.index, sort=False)
+    added = pd.DataFrame(
+        {
+            "Storey": added_index.get_level_values(0),
+            "Etabs ID": added_index.get_level_values(1),
+            "Change": ADDED,
+            "Element": "",
+            "Before": "",
+            "After": "",
+        }
+    )
+    removed_index = previous.index.difference(current.index, sort=False)
+    removed = pd.DataFrame(
+        {
+            "Storey": removed_index.get_level_values(0),
+            "Etabs ID": removed_index.get_level_values(1),
+            "Change": REMOVED,
+            "Element": "",
+            "Before": "",
+            "After": "",
+        }
+    )
+
+    # Order the changes by the position of each beam in the later revision, then the removed beams.
+    order = pd.Series(range(len(current)), index=current.index)
+    changes = pd.concat(
+        [frame for frame in (changed, added) if not frame.empty]
+        or [pd.DataFrame(columns=CHANGE_COLUMNS)],
+        ignore_index=True,
+    )
+    if not changes.empty:
+        positions = order.reindex(
+            pd.MultiIndex.from_arrays([changes["Storey"], changes["Etabs ID"]])
+        ).to_numpy()
+        changes = changes.iloc[np.argsort(positions, kind="stable")]
+    if not removed.empty:
+        changes = pd.concat([changes, removed], ignore_index=True)
+    return changes.reset_index(drop=True)[CHANGE_COLUMNS]
+
+
+def summarise_changes(changes_df) -> dict:
+    """This function counts the beams added, removed, and changed between two revisions.
+
+    Args:
+        changes_df (pd.DataFrame): The change sheet, as returned by diff_schedules.
+
+    Returns:
+        dict: The number of added, removed, and changed beams.
+    """
+    beams = changes_df.drop_duplicates(["Storey", "Etabs ID", "Change"])
+    counts = beams["Change"].value_counts()
+    return {change: int(counts.get(change, 0)) for change in (ADDED, REMOVED, CHANGED)}
+
+
+def load_schedule(source, database=None, project=None):
+    """This function loads a schedule to compare, either by processing an ETABS export or, given a project,
+    by reloading a stored revision.
+
+    Args:
+        source (str): The path of the ETABS export, or the revision when a project is given.
+        database (str, optional): The path of the schedule database. Defaults to the configured database.
+        project (str, optional): The project of the stored revision. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The beam schedule, or a string describing why it could not be loaded.
+    """
+    if project is None:
+        beam_schedule_df = pr.process_workbook(source)
+        if isinstance(beam_schedule_df, str):
+            return (
+                f"{source}: {INVALID_RESULTS.get(beam_schedule_df, beam_schedule_df)}"
+            )
+        return beam_schedule_df
+
+    from schedule_database import ScheduleDatabase
+
+    beam_schedule_df = ScheduleDatabase(database or settings.SCHEDULE_DATABASE).load(
+        project, source
+    )
+    if beam_schedule_df is None:
+        return f"Revision {source} of {project} is not stored"
+    return beam_schedule_df
+
+
+def run_command(args) -> int:
+    """This function runs the diff command, writing the change sheet between two schedule revisions.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code.
+    """
+    start = time.perf_counter()
+    schedules = []
+    for source in (args.previous, args.current):
+        beam_schedule_df = load_schedule(source, args.database, args.project)
+        if isinstance(beam_schedule_df, str):
+            print(beam_schedule_df, file=sys.stderr)
+            return EXIT_FAILED
+        schedules.append(beam_schedule_df)
+
+    changes_df = diff_schedules(*schedules)
+    with open(args.output, "wb") as file:
+        file.write(ex.export_changes(changes_df))
+    summary = summarise_changes(changes_df)
+    print(
+        f"{summary[CHANGED]} beam(s) changed, {summary[ADDED]} added and {summary[REMOVED]} removed."
+        f" Wrote {args.output} in {time.perf_counter() - start:.2f} s."
+    )
+    return EXIT_OK
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionResultStore:
+    """This class holds the processed beam schedule of each client session. Results expire once they
+    have not been used for their lifetime, and the least recently used results are evicted once the
+    store exceeds its memory limit. It is safe to use from the event loop and worker threads alike.
+    """
+
+    def __init__(self, ttl, max_bytes, clock=time.monotonic):
+        """Begin by initializing the lifetime, memory limit, and the empty store.
+
+        Args:
+            ttl (float): The number of seconds a result is kept after it was last used.
+            max_bytes (int): The total memory the stored results may hold.
+            clock (callable, optional): The clock used to time the results. Defaults to time.monotonic.
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def result_size(result) -> int:
+        """This function estimates the memory held by a result.
+
+        Args:
+            result (pd.DataFrame): The processed beam schedule.
+
+        Returns:
+            int: The memory held by the result in bytes.
+        """
+        if hasattr(result, "memory_usage"):
+            return int(result.memory_usage(deep=True).sum())
+        return 0
+
+    @property
+    def total_bytes(self) -> int:
+        """The memory held by all stored results in bytes."""
+        with self._lock:
+            return sum(size for _, size, _ in self._results.values())
+
+    def _expire(self):
+        """This method removes the results which have outlived their lifetime. The lock must be held."""
+        now = self.clock()
+        for session_id in [
+            session_id
+            for session_id, (_, _, last_used) in self._results.items()
+            if now - last_used > self.ttl
+        ]:
+            del self._results[session_id]
+
+    def put(self, session_id, result) -> bool:
+        """This method stores the result of a session, replacing its previous result. The least recently
+        used results of other sessions are evicted until the store is within its memory limit.
+
+        Args:
+            session_id (str): The id of the client session.
+            result (pd.DataFrame): The processed beam schedule.
+
+        Returns:
+            bool: True if the result was stored, False if it alone exceeds the memory limit.
+        """
+        size = SessionResultStore.result_size(result)
+        with self._lock:
+            self._results.pop(session_id, None)
+            self._expire()
+            if size > self.max_bytes:
+                return False
+            total = sum(stored_size for _, stored_size, _ in self._results.values())
+            while self._results and total + size > self.max_bytes:
+                _, (_, evicted_size, _) = self._results.popitem(last=False)
+                total -= evicted_size
+            self._results[session_id] = (result, size, self.clock())
+            return True
+
+    def get(self, session_id):
+        """This method retrieves the result of a session and renews its lifetime.
+
+        Args:
+            session_id (str): The id of the client session.
+
+        Returns:
+            pd.DataFrame: The processed beam schedule, or None if the session has no result.
+        """
+        with self._lock:
+            self._expire()
+            if session_id not in self._results:
+                return None
+            result, size, _ = self._results.pop(session_id)
+            self._results[session_id] = (result, size, self.clock())
+            return result
+
+    def discard(self, session_id):
+        """This method removes the result of a session, if it has one.
+
+        Args:
+            session_id (str): The id of the client session.
+        """
+        with self._lock:
+            self._results.pop(session_id, None)
@@ -0,0 +1,58 @@
+import os
+
+# Settings of the beam scheduler server. Each may be overridden by its environment variable,
+# which allows a hosted instance to be sized without changing the source.
+
+# The number of seconds a processed schedule is kept for its session after it was last used.
+SESSION_RESULT_TTL = float(os.environ.get("BEAM_SCHEDULER_SESSION_RESULT_TTL", 3600))
+
+# The total memory, in MB, which the processed schedules of all sessions may hold.
+SESSION_RESULT_MAX_MB = float(
+    os.environ.get("BEAM_SCHEDULER_SESSION_RESULT_MAX_MB", 512)
+)
+
+# The number of schedule jobs processed at the same time.
+JOB_WORKERS = int(
+    os.environ.get("BEAM_SCHEDULER_JOB_WORKERS", min(4, os.cpu_count() or 1))
+)
+
+# The number of schedule jobs which may be queued or processing before uploads are turned away.
+JOB_QUEUE_DEPTH = int(os.environ.get("BEAM_SCHEDULER_JOB_QUEUE_DEPTH", 8))
+
+# The number of finished schedule jobs whose status is kept.
+JOB_HISTORY = int(os.environ.get("BEAM_SCHEDULER_JOB_HISTORY", 50))
+
+# The number of seconds between progress updates pushed to each client.
+PROGRESS_INTERVAL = float(os.environ.get("BEAM_SCHEDULER_PROGRESS_INTERVAL", 0.5))
+
+# The number of seconds browsers may cache the bundled assets, such as the icon stylesheet.
+ASSET_MAX_AGE = int(os.environ.get("BEAM_SCHEDULER_ASSET_MAX_AGE", 31536000))
+
+# The largest workbook, in MB, which may be uploaded.
+UPLOAD_MAX_MB = float(os.environ.get("BEAM_SCHEDULER_UPLOAD_MAX_MB", 200))
+
+# The size, in MB, above which an upload is spooled to disk rather than held in memory.
+UPLOAD_SPOOL_MB = float(os.environ.get("BEAM_SCHEDULER_UPLOAD_SPOOL_MB", 8))
+
+# The SQLite database which stores processed schedules by project, revision and storey.
+SCHEDULE_DATABASE = os.environ.get(
+    "BEAM_SCHEDULER_SCHEDULE_DATABASE",
+    os.path.join(os.path.expanduser("~"), ".beam_scheduler", "schedules.sqlite3"),
+)
+
+# The number of revisions of each project kept in the schedule database, the oldest being deleted as new
+# revisions are stored. Zero keeps every revision.
+SCHEDULE_DATABASE_REVISIONS = int(
+    os.environ.get("BEAM_SCHEDULER_SCHEDULE_DATABASE_REVISIONS", 20)
+)
+
+# The SQLite database caching the design of each beam across every project, and its size in MB. The least
+# recently used designs are evicted beyond this size. An empty path turns the cache off.
+DESIGN_CACHE = os.environ.get(
+    "BEAM_SCHEDULER_DESIGN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".beam_scheduler", "designs.sqlite3"),
+)
+DESIGN_CACHE_MB = float(os.environ.get("BEAM_SCHEDULER_DESIGN_CACHE_MB", 256))
+
+# Whether the server prints how long it took to start, for profiling its imports.
+REPORT_STARTUP = os.environ.get("BEAM_SCHEDULER_REPORT_STARTUP", "") not in ("", "0")
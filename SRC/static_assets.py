@@ -0,0 +1,63 @@
+import hashlib
+import os
+from functools import lru_cache
+from urllib.parse import parse_qs
+
+from starlette.staticfiles import StaticFiles
+
+import settings
+
+# The folder of images and stylesheets shipped with the beam scheduler, and the URL it is served at.
+ASSETS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"
+)
+ASSETS_URL = "/assets"
+
+
+class CachedStaticFiles(StaticFiles):
+    """This class serves static files with a long lived Cache-Control header. Browsers then reuse their
+    copy of each asset on later visits without revalidating it, so the page renders without waiting on
+    the network. The URLs from asset_url carry a content hash, so a changed asset is still fetched afresh.
+    A URL without the hash is revalidated on each use instead, as its content may change under it.
+    """
+
+    def __init__(self, *args, max_age=settings.ASSET_MAX_AGE, **kwargs):
+        """Begin by initializing the static files and the cache lifetime.
+
+        Args:
+            max_age (int, optional): The number of seconds browsers may cache each file.
+        """
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        cache_control = "no-cache"
+        if "v" in parse_qs(scope.get("query_string", b"").decode("latin-1")):
+            cache_control = f"public, max-age={self.max_age}, immutable"
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+
+@lru_cache(maxsize=None)
+def asset_url(path) -> str:
+    """This function returns the URL of a bundled asset, versioned by a hash of its content.
+
+    Args:
+        path (str): The path of the asset within the assets folder, such as "eva-icons/eva-icons.css".
+
+    Returns:
+        str: The URL of the asset.
+    """
+    with open(os.path.join(ASSETS_DIR, path), "rb") as file:
+        version = hashlib.sha256(file.read()).hexdigest()[:12]
+    return f"{ASSETS_URL}/{path}?v={version}"
+
+
+def register_assets(app):
+    """This function serves the assets folder on the application.
+
+    Args:
+        app (FastAPI): The application, such as NiceGUI's app.
+    """
+    app.mount(ASSETS_URL, CachedStaticFiles(directory=ASSETS_DIR), name="assets")
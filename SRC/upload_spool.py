@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+
+# The size of the blocks an upload is copied in.
+CHUNK_SIZE = 1024**2
+
+
+class UploadTooLargeError(Exception):
+    """This exception is raised when an upload exceeds the upload size limit."""
+
+
+def spool_upload(source, max_bytes, spool_bytes):
+    """This function copies an upload into a spooled temporary file, block by block. Uploads up to the
+    spool size stay in memory, while larger uploads roll over to disk, where the workbook reader opens
+    them without loading the whole file. The copy also outlives the request the upload arrived in, so
+    the upload can wait in the job queue.
+
+    Args:
+        source (file-like): The uploaded content.
+        max_bytes (int): The largest upload accepted, in bytes.
+        spool_bytes (int): The size above which the upload is written to disk, in bytes.
+
+    Raises:
+        UploadTooLargeError: The upload exceeds the upload size limit.
+
+    Returns:
+        tempfile.SpooledTemporaryFile: The upload, positioned at its start. The caller closes it.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes, suffix=".xlsx")
+    try:
+        source.seek(0)
+        copied = 0
+        for block in iter(lambda: source.read(CHUNK_SIZE), b""):
+            copied += len(block)
+            if copied > max_bytes:
+                raise UploadTooLargeError(
+                    f"The upload exceeds the {max_bytes / 1024**2:.0f} MB limit."
+                )
+            spool.write(block)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def close_when_done(job, spool):
+    """This function closes an upload's spooled file once the job reading it has finished, however it ends.
+
+    Args:
+        job (ScheduleJob): The job processing the upload.
+        spool (file-like): The spooled upload.
+    """
+    job.future.add_done_callback(lambda _: spool.close())
@@ -0,0 +1,158 @@
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# The application modules import each other by bare module name (they are run from within SRC),
+# so make SRC importable for the tests that exercise them.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "SRC"))
+
+import settings
+
+FLEXURE_TABLE = "TABLE:  Concrete Beam Flexure Envelope - ACI 318-19"
+SHEAR_TABLE = "TABLE:  Concrete Beam Shear Envelope - ACI 318-19"
+
+
+def build_etabs_frames(beams: list) -> tuple:
+    """This function builds flexure and shear dataframes mimicking how pandas reads an ETABS
+    design export, including the two field name and unit rows beneath the table title.
+
+    Args:
+        beams (list): A list of (story, id, section, overstressed) tuples, one per beam.
+
+    Returns:
+        tuple: The flexural and shear dataframes.
+    """
+    flexure_rows = [
+        ["Story", "Label", "UniqueName", "Section", "Location", "FTopCombo"]
+        + ["FTopMoment", "FTopArea", "FBotCombo", "FBotMoment", "FBotArea"],
+        ["", "", "", "", "mm", "", "kN-m", "mm²", "", "kN-m", "mm²"],
+    ]
+    shear_rows = [
+        ["Story", "Label", "UniqueName", "Section", "Location", "VCombo", "VForce"]
+        + ["PhiVc", "VRebar", "TCombo", "TForce", "TTrnRebar", "TLngCombo"]
+        + ["TLngForce", "TLngRebar"],
+        ["", "", "", "", "mm", "", "kN", "kN", "mm²/m", "", "kN-m", "mm²/m", "", "kN-m"]
+        + ["mm²"],
+    ]
+    for unique_name, (story, label, section, overstressed) in enumerate(beams):
+        combo = "O/S" if overstressed else "DCon2"
+        for location in (250, 2500, 4750):
+            flexure_rows.append(
+                [story, label, str(unique_name), section, location, combo, -100]
+                + ["O/S" if overstressed else 900, combo, 80]
+                + ["O/S" if overstressed else 700]
+            )
+            shear_rows.append(
+                [story, label, str(unique_name), section, location, combo, 200, 100]
+                + ["O/S" if overstressed else 500, combo, 10]
+                + ["O/S" if overstressed else 100, combo, 10]
+                + ["O/S" if overstressed else 300]
+            )
+    flexural_df = pd.DataFrame(
+        flexure_rows, columns=[FLEXURE_TABLE] + [f"Unnamed: {i}" for i in range(1, 11)]
+    )
+    shear_df = pd.DataFrame(
+        shear_rows, columns=[SHEAR_TABLE] + [f"Unnamed: {i}" for i in range(1, 15)]
+    )
+    return flexural_df, shear_df
+
+
+@pytest.fixture
+def example_beams() -> list:
+    """These example beams span three storeys with a mix of sections, and one overstressed beam.
+
+    Returns:
+        list: (story, id, section, overstressed) tuples.
+    """
+    sections = ["B300X600-C45/55", "B400X750-C45/55", "B600X900-C40/50"]
+    return [
+        (f"L{story}", f"B{beam}", sections[beam % 3], story == 1 and beam == 2)
+        for story in range(3)
+        for beam in range(5)
+    ]
+
+
+@pytest.fixture
+def etabs_frames(example_beams: list) -> tuple:
+    """This fixture provides the raw flexure and shear dataframes of the example beams.
+
+    Args:
+        example_beams (list): Refer to example beams function
+
+    Returns:
+        tuple: The flexural and shear dataframes.
+    """
+    return build_etabs_frames(example_beams)
+
+
+def build_etabs_workbook(flexural_df, shear_df) -> bytes:
+    """This function writes flexure and shear dataframes to a workbook laid out as an ETABS design export,
+    with the program control table as the third sheet.
+
+    Args:
+        flexural_df (pd.DataFrame): The flexural dataframe.
+        shear_df (pd.DataFrame): The shear dataframe.
+
+    Returns:
+        bytes: The workbook content.
+    """
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        flexural_df.to_excel(
+            writer, sheet_name="Concrete Beam Flexure Envelope", index=False
+        )
+        shear_df.to_excel(
+            writer, sheet_name="Concrete Beam Shear Envelope", index=False
+        )
+        pd.DataFrame({"TABLE:  Program Control": ["ProgramName", "ETABS"]}).to_excel(
+            writer, sheet_name="Program Control", index=False
+        )
+    return output.getvalue()
+
+
+@pytest.fixture
+def etabs_workbook(etabs_frames: tuple) -> bytes:
+    """This fixture provides the example beams as an ETABS design export workbook.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+
+    Returns:
+        bytes: The workbook content.
+    """
+    return build_etabs_workbook(*etabs_frames)
+
+
+@pytest.fixture
+def beam_schedule_df(etabs_frames: tuple) -> pd.DataFrame:
+    """This fixture provides the processed beam schedule of the example beams.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+
+    Returns:
+        pd.DataFrame: The processed beam schedule.
+    """
+    import df_processing as pr
+
+    return pr.process_dataframes(*etabs_frames)
+
+
+@pytest.fixture(autouse=True)
+def design_cache_path(tmp_path, monkeypatch) -> str:
+    """This fixture points the configured design cache at a temporary folder, so the tests never read or
+    fill the cache of the machine they run on.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        monkeypatch (pytest.MonkeyPatch): Replaces the configured cache.
+
+    Returns:
+        str: The path of the temporary design cache.
+    """
+    path = str(tmp_path / "designs.sqlite3")
+    monkeypatch.setattr(settings, "DESIGN_CACHE", path)
+    return path
@@ -0,0 +1,221 @@
+import io
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import register_api
+from job_queue import ScheduleJobQueue
+from schedule_database import ScheduleDatabase
+
+
+@pytest.fixture
+def api_client() -> TestClient:
+    """This fixture provides a client of the schedule API, served from a queue with one worker.
+
+    Returns:
+        TestClient: The API client, whose queue is shut down after the test.
+    """
+    job_queue = ScheduleJobQueue(workers=1, max_depth=1)
+    app = FastAPI()
+    register_api(app, job_queue)
+    yield TestClient(app)
+    job_queue.shutdown()
+
+
+def wait_for_job(api_client: TestClient, job_id: str) -> dict:
+    """This function polls a job's status until it has finished.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        job_id (str): The id of the job.
+
+    Returns:
+        dict: The finished job's status.
+    """
+    for _ in range(100):
+        status = api_client.get(f"/api/schedules/{job_id}").json()
+        if status["status"] not in ("queued", "running"):
+            return status
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+def test_schedule_round_trip(api_client: TestClient, etabs_workbook: bytes):
+    """This test checks that a posted export is processed and its schedule fetched in each format.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        etabs_workbook (bytes): Refer to etabs workbook function
+    """
+    response = api_client.post(
+        "/api/schedules", files={"file": ("model.xlsx", etabs_workbook)}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert wait_for_job(api_client, job_id)["status"] == "completed"
+
+    schedule = api_client.get(f"/api/schedules/{job_id}/schedule?format=json").json()
+    assert len(schedule["data"]) == 15
+    assert schedule["columns"][0] == ["Storey", ""]
+    csv = api_client.get(f"/api/schedules/{job_id}/schedule?format=csv")
+    assert csv.headers["content-type"].startswith("text/csv")
+    xlsx = api_client.get(f"/api/schedules/{job_id}/schedule")
+    assert "L1" in pd.ExcelFile(io.BytesIO(xlsx.content)).sheet_names
+    assert (
+        api_client.get(f"/api/schedules/{job_id}/schedule?format=pdf").status_code
+        == 422
+    )
+
+
+def test_merged_schedule(api_client: TestClient, etabs_workbook: bytes):
+    """This test checks that the exports of several runs are merged into one schedule.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        etabs_workbook (bytes): Refer to etabs workbook function
+    """
+    response = api_client.post(
+        "/api/schedules/merged",
+        files=[
+            ("files", ("cracked.xlsx", etabs_workbook)),
+            ("files", ("uncracked.xlsx", etabs_workbook)),
+        ],
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert wait_for_job(api_client, job_id)["status"] == "completed"
+    schedule = api_client.get(f"/api/schedules/{job_id}/schedule?format=json").json()
+    assert len(schedule["data"]) == 15
+
+
+def test_lazy_schedule(api_client: TestClient, etabs_workbook: bytes):
+    """This test checks that a lazy upload designs the storeys fetched on the job queue, and refuses
+    unknown storeys.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        etabs_workbook (bytes): Refer to etabs workbook function
+    """
+    response = api_client.post(
+        "/api/schedules",
+        files={"file": ("model.xlsx", etabs_workbook)},
+        data={"lazy": "true"},
+    )
+    job_id = response.json()["id"]
+    assert wait_for_job(api_client, job_id)["status"] == "completed"
+    storeys = api_client.get(f"/api/schedules/{job_id}/storeys").json()
+    assert [storey["designed"] for storey in storeys] == [False, False, False]
+
+    # The storey is designed on the queue, and fetched from its own job.
+    response = api_client.get(f"/api/schedules/{job_id}/schedule?format=json&storey=L2")
+    assert response.status_code == 202
+    design_id = response.json()["id"]
+    assert wait_for_job(api_client, design_id)["status"] == "completed"
+    schedule = api_client.get(f"/api/schedules/{design_id}/schedule?format=json")
+    assert {row[0] for row in schedule.json()["data"]} == {"L2"}
+    storeys = api_client.get(f"/api/schedules/{job_id}/storeys").json()
+    assert [storey["designed"] for storey in storeys] == [False, False, True]
+    # Once designed, the storey is fetched straight away.
+    response = api_client.get(f"/api/schedules/{job_id}/schedule?format=json&storey=L2")
+    assert response.status_code == 200
+    assert response.json()["data"] == schedule.json()["data"]
+    assert (
+        api_client.get(f"/api/schedules/{job_id}/schedule?storey=L9").status_code == 404
+    )
+
+
+def test_invalid_workbook(api_client: TestClient, etabs_frames: tuple):
+    """This test checks that a spreadsheet without the shear sheet is reported as invalid.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    output = io.BytesIO()
+    etabs_frames[0].to_excel(output, index=False)
+    job_id = api_client.post(
+        "/api/schedules", files={"file": ("model.xlsx", output.getvalue())}
+    ).json()["id"]
+    assert wait_for_job(api_client, job_id)["status"] == "invalid"
+    assert api_client.get(f"/api/schedules/{job_id}/schedule").status_code == 409
+
+
+def test_stored_schedule(tmp_path, etabs_workbook: bytes):
+    """This test checks that a schedule processed with a database is stored under its project and revision,
+    and can be fetched again by storey.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+    """
+    job_queue = ScheduleJobQueue(workers=1, max_depth=1)
+    app = FastAPI()
+    register_api(app, job_queue, ScheduleDatabase(str(tmp_path / "schedules.sqlite3")))
+    api_client = TestClient(app)
+    try:
+        job_id = api_client.post(
+            "/api/schedules",
+            files={"file": ("model.xlsx", etabs_workbook)},
+            data={"project": "Tower", "revision": "R1"},
+        ).json()["id"]
+        assert wait_for_job(api_client, job_id)["status"] == "completed"
+    finally:
+        job_queue.shutdown()
+
+    [revision] = api_client.get("/api/projects/Tower/revisions").json()
+    assert revision["revision"] == "R1"
+    schedule = api_client.get(
+        "/api/projects/Tower/revisions/R1/schedule?format=json&storey=L2"
+    ).json()
+    assert len(schedule["data"]) == 5
+    assert (
+        api_client.get("/api/projects/Tower/revisions/R9/schedule").status_code == 404
+    )
+    assert (
+        api_client.get(
+            "/api/projects/Tower/diff?previous=R1&current=R1&format=json"
+        ).json()
+        == []
+    )
+
+
+def test_upload_over_limit(api_client: TestClient, monkeypatch):
+    """This test checks that uploads beyond the size limit are refused.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+        monkeypatch (pytest.MonkeyPatch): Lowers the upload size limit.
+    """
+    monkeypatch.setattr("settings.UPLOAD_MAX_MB", 1)
+    response = api_client.post(
+        "/api/schedules", files={"file": ("model.xlsx", b"x" * (1024**2 + 1))}
+    )
+    assert response.status_code == 413
+
+
+def test_unknown_job(api_client: TestClient):
+    """This test checks that unknown job ids are not found.
+
+    Args:
+        api_client (TestClient): Refer to api client function
+    """
+    assert api_client.get("/api/schedules/missing").status_code == 404
+
+
+def test_api_import_is_light():
+    """This test checks that importing the API, and so starting the application, does not import pandas."""
+    source = os.path.join(os.path.dirname(os.path.dirname(__file__)), "SRC")
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, api; print('pandas' in sys.modules)"],
+        cwd=source,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert loaded.stdout.strip() == "False"
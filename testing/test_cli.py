@@ -0,0 +1,190 @@
+import io
+
+import pandas as pd
+
+import batch_processing as bp
+import cli
+import results
+from testing.conftest import build_etabs_frames, build_etabs_workbook
+
+
+def test_expand_inputs(tmp_path):
+    """This test checks that glob patterns are expanded, skipping lock files and earlier schedules.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+    """
+    for name in ["a.xlsx", "b.xlsx", "~$a.xlsx", "a_beam_schedule.xlsx"]:
+        (tmp_path / name).write_bytes(b"")
+    assert bp.expand_inputs([str(tmp_path / "*.xlsx"), str(tmp_path / "a.xlsx")]) == [
+        str(tmp_path / "a.xlsx"),
+        str(tmp_path / "b.xlsx"),
+    ]
+
+
+def test_batch(tmp_path, etabs_workbook: bytes, etabs_frames: tuple, capsys):
+    """This test checks that every workbook in a batch gets a schedule, and a failure sets the exit code.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        etabs_frames (tuple): Refer to etabs frames function
+        capsys (pytest.CaptureFixture): Captures the printed timings.
+    """
+    (tmp_path / "tower_a.xlsx").write_bytes(etabs_workbook)
+    (tmp_path / "tower_b.xlsx").write_bytes(etabs_workbook)
+    etabs_frames[0].to_excel(tmp_path / "flexure_only.xlsx", index=False)
+
+    exit_code = cli.main(
+        ["batch", str(tmp_path / "*.xlsx"), "-o", str(tmp_path / "out"), "-w", "2"]
+    )
+    assert exit_code == results.EXIT_FAILED
+    output = capsys.readouterr().out
+    assert output.count("OK  ") == 2 and output.count("FAIL") == 1
+    schedule = pd.read_excel(
+        tmp_path / "out" / "tower_a_beam_schedule.xlsx", sheet_name=None
+    )
+    assert "L2" in schedule
+    assert not (tmp_path / "out" / "flexure_only_beam_schedule.xlsx").exists()
+
+
+def test_batch_types(tmp_path, etabs_workbook: bytes, capsys):
+    """This test checks that a batch with types writes the type schedule after the full schedule.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        capsys (pytest.CaptureFixture): Captures the printed timings.
+    """
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    assert (
+        cli.main(["batch", str(tmp_path / "tower.xlsx"), "--types"]) == results.EXIT_OK
+    )
+    assert "15 beams in 4 types" in capsys.readouterr().out
+    schedule = pd.read_excel(tmp_path / "tower_beam_schedule.xlsx", sheet_name=None)
+    assert list(schedule)[:2] == ["Beam Reinforcement Schedule", "Beam Types"]
+
+
+def test_merge(tmp_path, etabs_workbook: bytes, capsys):
+    """This test checks that the merge command designs the runs given into one schedule.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        capsys (pytest.CaptureFixture): Captures the printed summary.
+    """
+    (tmp_path / "cracked.xlsx").write_bytes(etabs_workbook)
+    (tmp_path / "uncracked.xlsx").write_bytes(etabs_workbook)
+    output = tmp_path / "merged.xlsx"
+    exit_code = cli.main(["merge", str(tmp_path / "*.xlsx"), "-o", str(output)])
+    assert exit_code == results.EXIT_OK
+    assert "Merged 2 run(s) into 15 beams" in capsys.readouterr().out
+    assert "L2" in pd.read_excel(output, sheet_name=None)
+
+
+def test_sweep(tmp_path, etabs_workbook: bytes, capsys):
+    """This test checks that the sweep command summarises each variant against the current rules.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        capsys (pytest.CaptureFixture): Captures the printed summary.
+    """
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    (tmp_path / "variants.json").write_text('[{"name": "Cover 50", "cover": 50}]')
+    output = tmp_path / "sweep.xlsx"
+    exit_code = cli.main(
+        [
+            "sweep",
+            str(tmp_path / "tower.xlsx"),
+            str(tmp_path / "variants.json"),
+            "--include-current",
+            "-o",
+            str(output),
+        ]
+    )
+    assert exit_code == results.EXIT_OK
+    assert "Designed 15 beams under 2 variant(s), 0 failed" in capsys.readouterr().out
+    assert list(pd.read_excel(output)["Variant"]) == ["Current rules", "Cover 50"]
+
+
+def test_generate(tmp_path, capsys):
+    """This test checks that the generate command writes a synthetic export the batch command processes.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        capsys (pytest.CaptureFixture): Captures the printed summary.
+    """
+    output = tmp_path / "synthetic.xlsx"
+    exit_code = cli.main(
+        ["generate", str(output), "-n", "40", "--storeys", "4", "--os-rate", "0.1"]
+    )
+    assert exit_code == results.EXIT_OK
+    assert cli.main(["batch", str(output)]) == results.EXIT_OK
+    assert "synthetic.xlsx: 40 beams" in capsys.readouterr().out
+    assert (
+        cli.main(["generate", str(output), "--section", "B300X600-C45/55"])
+        == results.EXIT_FAILED
+    )
+
+
+def test_batch_by_storey(tmp_path, etabs_workbook: bytes, capsys):
+    """This test checks that a batch by storey writes each storey's schedule alongside the full schedule.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        capsys (pytest.CaptureFixture): Captures the printed timings.
+    """
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    exit_code = cli.main(
+        ["batch", str(tmp_path / "tower.xlsx"), "--by-storey", "-w", "2"]
+    )
+    assert exit_code == results.EXIT_OK
+    assert capsys.readouterr().out.count(": 5 beams") == 3
+    assert sorted(path.name for path in (tmp_path / "tower_storeys").iterdir()) == [
+        "L0.xlsx",
+        "L1.xlsx",
+        "L2.xlsx",
+    ]
+    schedule = pd.read_excel(tmp_path / "tower_beam_schedule.xlsx", sheet_name=None)
+    # The second header row is read as the first row, ahead of the 15 beams.
+    assert len(schedule["Beam Reinforcement Schedule"]) == 16
+
+
+def test_batch_without_inputs(tmp_path):
+    """This test checks that a batch matching no workbooks exits with its own code.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+    """
+    assert cli.main(["batch", str(tmp_path / "*.xlsx")]) == results.EXIT_NO_INPUTS
+
+
+def test_diff(tmp_path, etabs_workbook: bytes, example_beams: list, capsys):
+    """This test checks that the diff command writes the change sheet between two exports.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        example_beams (list): Refer to example beams function
+        capsys (pytest.CaptureFixture): Captures the printed summary.
+    """
+    (tmp_path / "r1.xlsx").write_bytes(etabs_workbook)
+    (tmp_path / "r2.xlsx").write_bytes(
+        build_etabs_workbook(*build_etabs_frames(example_beams[:-1]))
+    )
+    output = tmp_path / "changes.xlsx"
+    exit_code = cli.main(
+        [
+            "diff",
+            str(tmp_path / "r1.xlsx"),
+            str(tmp_path / "r2.xlsx"),
+            "-o",
+            str(output),
+        ]
+    )
+    assert exit_code == results.EXIT_OK
+    assert "0 beam(s) changed, 0 added and 1 removed" in capsys.readouterr().out
+    changes_df = pd.read_excel(output)
+    assert changes_df["Change"].tolist() == ["Removed"]
@@ -0,0 +1,62 @@
+import pandas as pd
+
+import df_processing as pr
+from design_cache import DesignCache
+from testing.test_schedule_database import count_designed_beams
+
+
+def test_cached_design(design_cache_path: str, etabs_frames: tuple, monkeypatch):
+    """This test checks that a cached schedule matches the designed schedule, that repeated beams are
+    designed once, and that a second project reuses the designs without designing any beam.
+
+    Args:
+        design_cache_path (str): Refer to design cache path function
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Wraps the beam design.
+    """
+    expected = pr.process_dataframes(*etabs_frames)
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    cache = DesignCache(design_cache_path)
+    designed = count_designed_beams(monkeypatch)
+
+    pd.testing.assert_frame_equal(pr.design_inputs(beam_inputs, cache=cache), expected)
+    assert 0 < len(designed) == cache.stats()["designs"] < len(beam_inputs)
+
+    designed.clear()
+    reopened = DesignCache(design_cache_path)
+    pd.testing.assert_frame_equal(
+        pr.design_inputs(beam_inputs, cache=reopened), expected
+    )
+    assert designed == []
+
+
+def test_design_rules_version(design_cache_path: str, etabs_frames: tuple, monkeypatch):
+    """This test checks that designs cached under other design rules are not reused.
+
+    Args:
+        design_cache_path (str): Refer to design cache path function
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Changes the design rules version.
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    pr.design_inputs(beam_inputs, cache=DesignCache(design_cache_path))
+
+    monkeypatch.setattr(pr, "DESIGN_RULES_VERSION", pr.DESIGN_RULES_VERSION + 1)
+    designed = count_designed_beams(monkeypatch)
+    pr.design_inputs(beam_inputs, cache=DesignCache(design_cache_path))
+    assert designed
+
+
+def test_least_recently_used_eviction(tmp_path):
+    """This test checks that the least recently used designs are evicted once the cache is over its size.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+    """
+    cache = DesignCache(str(tmp_path / "designs.sqlite3"), max_mb=250 / 1024**2)
+    cache.put_many({"a": ["x" * 90], "b": ["x" * 90]})
+    assert set(cache.get_many(["a"])) == {"a"}
+
+    cache.put_many({"c": ["x" * 90]})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert cache.stats()["designs"] == 2
@@ -0,0 +1,154 @@
+import json
+
+import pytest
+
+import design_sweep as ds
+import df_processing as pr
+import quantity_takeoff as qt
+from beam_calculator_class import Beam
+
+
+def test_sweep_variants(etabs_frames: tuple, beam_schedule_df):
+    """This test checks that each variant is designed from the same parsed beams, in the order given, and
+    that the current rules reproduce the schedule's steel.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    variants = [
+        {"name": "Current rules"},
+        {"name": "No T32", "flexure_diameters": [16, 20, 25]},
+        {"name": "Cover 50", "cover": 50},
+    ]
+    sweep_df = ds.run_sweep(beam_inputs, variants, workers=2)
+
+    assert list(sweep_df["Variant"]) == ["Current rules", "No T32", "Cover 50"]
+    assert list(sweep_df["Beams"]) == [15, 15, 15]
+    assert list(sweep_df["Failed Beams"]) == [1, 1, 1]
+    assert sweep_df["Designed Steel (t)"][0] == pytest.approx(
+        qt.steel_takeoff(beam_schedule_df)["Total (kg)"].sum() / 1000
+    )
+    assert sweep_df["Steel Change (%)"][0] == 0
+    assert sweep_df["Compared Steel (t)"][1] != sweep_df["Compared Steel (t)"][0]
+    # The variants only change the beams they design.
+    assert Beam.FLEXURE_DIAMETERS == (16, 20, 25, 32)
+
+
+def test_steel_compared_over_common_beams(etabs_frames: tuple):
+    """This test checks that the steel of variants is compared over the beams every variant designs, so a
+    variant failing more beams does not appear lighter.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    variants = [
+        {"name": "Current rules"},
+        {"name": "Only T16", "flexure_diameters": [16]},
+    ]
+    sweep_df = ds.run_sweep(beam_inputs, variants, workers=1)
+
+    assert list(sweep_df["Failed Beams"]) == [1, 7]
+    assert list(sweep_df["Compared Beams"]) == [8, 8]
+    # The failed beams leave the variant with less steel, which is no saving.
+    assert sweep_df["Designed Steel (t)"][1] < sweep_df["Designed Steel (t)"][0]
+    assert sweep_df["Steel Change (%)"][1] > 0
+
+
+def test_two_digit_spacing(etabs_frames: tuple):
+    """This test checks that a variant with spacings of two digits designs beams under high shear demand.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    flexural_df, shear_df = etabs_frames
+    shear_df = shear_df.copy()
+    shear_df.loc[2:, "Unnamed: 8"] = shear_df.loc[2:, "Unnamed: 8"].where(
+        shear_df.loc[2:, "Unnamed: 8"] == "O/S", 2500
+    )
+    beam_inputs = pr.extract_beam_inputs(flexural_df, shear_df)
+    summary = ds.design_variant(
+        beam_inputs, {"name": "Close links", "shear_spacings": [150, 100, 75]}
+    )
+    assert summary["Beams"] == 15
+
+
+def test_variant_spacings(etabs_frames: tuple):
+    """This test checks that beams are only detailed at the shear spacings of their variant, which the
+    current rules would take below.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    for variant, spacings in (
+        ({"name": "Current rules"}, {250, 200, 150, 125, 100}),
+        ({"name": "Wide links", "shear_spacings": [200, 150]}, {200, 150}),
+    ):
+        beam_schedule_df = ds.design_schedule(beam_inputs, ds.catalogue(variant))
+        detailed = {
+            int(spacing)
+            for column in qt.SHEAR_COLUMNS
+            for spacing in beam_schedule_df[column]
+            .astype(str)
+            .str.extract(r"@(\d+)$")[0]
+            .dropna()
+        }
+        assert detailed == spacings
+
+
+def test_load_variants(tmp_path):
+    """This test checks that variants are named when loaded, and that unknown rules and invalid values are
+    turned away.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+    """
+    path = tmp_path / "variants.json"
+    path.write_text(json.dumps([{"cover": 50}]))
+    assert ds.load_variants(str(path)) == [{"cover": 50, "name": "Variant 1"}]
+
+    path.write_text(json.dumps([{"name": "Grade", "steel_grade": 500}]))
+    with pytest.raises(ValueError, match="steel_grade"):
+        ds.load_variants(str(path))
+
+    for rules in (
+        {"shear_spacings": []},
+        {"shear_spacings": [150, -75]},
+        {"flexure_diameters": [16, 20.5]},
+        {"flexure_diameters": "T16"},
+        {"cover": 0},
+    ):
+        path.write_text(json.dumps([rules]))
+        with pytest.raises(ValueError, match=next(iter(rules))):
+            ds.load_variants(str(path))
+
+
+def test_failed_variant(etabs_frames: tuple, monkeypatch):
+    """This test checks that a variant whose design fails is reported without failing the sweep, alongside
+    a variant with spacings of two digits.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Breaks the design of one variant.
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    design_variant = ds.design_variant
+
+    def break_variant(beam_inputs, variant):
+        if variant["name"] == "Broken":
+            raise RuntimeError("design failed")
+        return design_variant(beam_inputs, variant)
+
+    monkeypatch.setattr(ds, "design_variant", break_variant)
+    variants = [
+        {"name": "Current rules"},
+        {"name": "Broken"},
+        {"name": "Close links", "shear_spacings": [150, 100, 75]},
+    ]
+    sweep_df = ds.run_sweep(beam_inputs, variants, workers=1)
+    assert list(sweep_df["Beams"].isna()) == [False, True, False]
+    assert sweep_df["Error"][1] == "RuntimeError: design failed"
+    assert sweep_df["Error"][[0, 2]].isna().all()
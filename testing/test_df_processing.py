@@ -0,0 +1,143 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import df_processing as pr
+from testing.conftest import build_etabs_workbook
+
+
+def test_schedule_columns(beam_schedule_df: pd.DataFrame):
+    """This test checks that the schedule holds one row per beam, with a status column following the
+    required and provided areas of every criteria group.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    assert len(beam_schedule_df) == 15
+    assert list(beam_schedule_df.columns) == pr.SCHEDULE_COLUMNS
+    assert len(pr.SCHEDULE_COLUMNS) == len(pr.BEAM_MAPPING) + len(pr.CRITERIA_GROUPS)
+
+
+def test_schedule_dtypes(beam_schedule_df: pd.DataFrame):
+    """This test checks that the schedule columns follow the typed schema.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    assert isinstance(beam_schedule_df[("Storey", "")].dtype, pd.CategoricalDtype)
+    assert isinstance(beam_schedule_df[("Etabs ID", "")].dtype, pd.CategoricalDtype)
+    assert beam_schedule_df[("Dimensions", "Width (mm)")].dtype == np.int32
+    for group in pr.CRITERIA_GROUPS:
+        assert beam_schedule_df[(group, "Required (mm^2)")].dtype == np.float32
+        assert beam_schedule_df[(group, "Provided (mm^2)")].dtype == np.float32
+        assert isinstance(
+            beam_schedule_df[(group, "Status")].dtype, pd.CategoricalDtype
+        )
+
+
+def test_schedule_status(beam_schedule_df: pd.DataFrame):
+    """This test checks that the overstressed beam has its messages moved into the status columns
+    and that the areas of the remaining beams can be compared numerically.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    overstressed = beam_schedule_df[("Etabs ID", "")].eq("B2") & beam_schedule_df[
+        ("Storey", "")
+    ].eq("L1")
+    flexure = beam_schedule_df["Flexural BL Reinforcement Criteria"]
+    shear = beam_schedule_df["Shear L Reinforcement Criteria"]
+    assert (
+        flexure.loc[overstressed, "Status"] == "Overstressed. Please re-assess"
+    ).all()
+    assert (shear.loc[overstressed, "Status"] == "O/S in Shear and Torsion").all()
+    assert flexure.loc[overstressed, "Provided (mm^2)"].isna().all()
+    assert (flexure.loc[~overstressed, "Status"] == "OK").all()
+    assert (
+        flexure.loc[~overstressed, "Provided (mm^2)"]
+        > flexure.loc[~overstressed, "Required (mm^2)"]
+    ).all()
+
+
+def test_design_status():
+    """This test checks the status derived from pairs of required and provided reinforcement."""
+    required = pd.Series([700.0, "O/S", 700.0, "O/S in Shear"], dtype=object)
+    provided = pd.Series(
+        [
+            942.5,
+            "Overstressed. Please re-assess",
+            "Increase rebar count or re-assess",
+            "Overstressed. Please re-assess",
+        ],
+        dtype=object,
+    )
+    assert pr.design_status(required, provided).tolist() == [
+        "OK",
+        "Overstressed. Please re-assess",
+        "Increase rebar count or re-assess",
+        "O/S in Shear",
+    ]
+
+
+def test_incorrect_section_definitions(etabs_frames: tuple):
+    """This test checks that section names which do not abide by the naming convention are reported.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    flexural_df, shear_df = etabs_frames
+    flexural_df.loc[2:, "Unnamed: 3"] = "Beam 400 by 600"
+    assert (
+        pr.process_dataframes(flexural_df, shear_df) == "Incorrect section definitions"
+    )
+
+
+def test_process_workbook(etabs_workbook: bytes, beam_schedule_df: pd.DataFrame):
+    """This test checks that processing the workbook matches processing its dataframes.
+
+    Args:
+        etabs_workbook (bytes): Refer to etabs workbook function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    processed_df = pr.process_workbook(io.BytesIO(etabs_workbook))
+    pd.testing.assert_frame_equal(processed_df, beam_schedule_df)
+
+
+def test_read_workbook_checks_sheets(etabs_frames: tuple):
+    """This test checks that workbooks with missing or misplaced sheets are reported.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    flexural_df, shear_df = etabs_frames
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        flexural_df.to_excel(writer, sheet_name="Flexure", index=False)
+    assert (
+        pr.read_workbook(io.BytesIO(output.getvalue())) == "Incorrect number of sheets"
+    )
+    assert (
+        pr.read_workbook(io.BytesIO(build_etabs_workbook(shear_df, flexural_df)))
+        == "Incorrect sheets"
+    )
+
+
+def test_design_by_storey(etabs_frames: tuple, beam_schedule_df: pd.DataFrame):
+    """This test checks that designing each storey on a separate worker assembles into the same schedule,
+    whichever order the storeys finish in.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    beam_inputs = pr.extract_beam_inputs(*etabs_frames)
+    storeys = list(pr.design_by_storey(beam_inputs, workers=2, file_format="csv"))
+    assert sorted(storey for storey, *_ in storeys) == ["L0", "L1", "L2"]
+    assert all(content.startswith(b"\xef\xbb\xbf") for *_, content in storeys)
+    pd.testing.assert_frame_equal(
+        pr.assemble_storeys(
+            [(positions, storey_df) for _, positions, storey_df, _ in reversed(storeys)]
+        ),
+        beam_schedule_df,
+    )
@@ -0,0 +1,84 @@
+import io
+
+import pandas as pd
+
+import df_processing as pr
+import envelope_merging as em
+from testing.conftest import build_etabs_frames, build_etabs_workbook
+
+
+def test_governing_envelope(example_beams: list):
+    """This test checks that each station takes the larger required area or the overstressed run, along with
+    its combo, and that the merged envelope designs like the governing run.
+
+    Args:
+        example_beams (list): Refer to example beams function
+    """
+    first_run = build_etabs_frames(example_beams)
+    # The second run overstresses B1 on L0, and governs the top of B0 on L0.
+    second_run = build_etabs_frames(
+        [
+            (story, label, section, overstressed or (story, label) == ("L0", "B1"))
+            for story, label, section, overstressed in example_beams
+        ]
+    )
+    second_run[0].loc[2:4, ["Unnamed: 5", "Unnamed: 7"]] = ["DCon9", 2500]
+    # The first run governs the shear of B2 on L0.
+    second_run[1].loc[8:10, "Unnamed: 8"] = 100
+
+    flexural_df, shear_df = em.merge_envelopes([first_run, second_run])
+    assert list(flexural_df.loc[2, ["Unnamed: 5", "Unnamed: 7"]]) == ["DCon9", 2500]
+    assert list(flexural_df.loc[5, ["Unnamed: 8", "Unnamed: 10"]]) == ["O/S", "O/S"]
+    assert shear_df.loc[8, "Unnamed: 8"] == 500
+    # The overstressed run keeps governing whatever run follows.
+    flexural_df, _ = em.merge_envelopes([second_run, first_run])
+    assert flexural_df.loc[5, "Unnamed: 10"] == "O/S"
+
+    # B0 and B1 on L0 are designed from the second run, and the rest of the beams from either.
+    merged_df = em.process_workbooks(
+        [
+            io.BytesIO(build_etabs_workbook(*first_run)),
+            io.BytesIO(build_etabs_workbook(*second_run)),
+        ]
+    )
+    second_df = pr.process_dataframes(*second_run)
+    first_df = pr.process_dataframes(*first_run)
+    pd.testing.assert_frame_equal(merged_df.iloc[:2], second_df.iloc[:2])
+    pd.testing.assert_frame_equal(
+        merged_df.iloc[2:], first_df.iloc[2:], check_categorical=False
+    )
+
+
+def test_merge_runs_with_other_beams(example_beams: list):
+    """This test checks that beams only in a later run are added, and beams defined with different sections
+    across runs are turned away.
+
+    Args:
+        example_beams (list): Refer to example beams function
+    """
+    first_run = build_etabs_frames(example_beams)
+    extra_run = build_etabs_frames([("L3", "B0", "B300X600-C45/55", False)])
+    flexural_df, shear_df = em.merge_envelopes([first_run, extra_run])
+    beam_schedule_df = pr.process_dataframes(flexural_df, shear_df)
+    assert len(beam_schedule_df) == len(example_beams) + 1
+    assert beam_schedule_df[("Storey", "")].iloc[-1] == "L3"
+
+    resized_run = build_etabs_frames([("L0", "B0", "B400X750-C45/55", False)])
+    assert em.merge_envelopes([first_run, resized_run]) == "Mismatched sections"
+    assert em.merge_envelopes([]) == "No workbooks"
+
+
+def test_merge_runs_with_mismatched_stations(example_beams: list):
+    """This test checks that runs placing a beam's stations at different locations are turned away, rather
+    than read with the stations of neighbouring beams.
+
+    Args:
+        example_beams (list): Refer to example beams function
+    """
+    first_run = build_etabs_frames(example_beams)
+    for beams in (1, 3):
+        moved_run = build_etabs_frames(example_beams)
+        # Move the midspan station of the first beams.
+        for frame in moved_run:
+            frame.loc[[3 + 3 * beam for beam in range(beams)], "Unnamed: 4"] = 2600
+        assert em.merge_envelopes([first_run, moved_run]) == "Mismatched stations"
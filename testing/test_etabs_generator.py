@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+import pytest
+
+import df_processing as pr
+import etabs_generator as eg
+
+
+def test_generated_export(tmp_path):
+    """This test checks that a generated export is read and designed like an ETABS export, with its beams
+    spread over the storeys and the overstressed beams reported as such.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+    """
+    envelopes = eg.generate_envelopes(60, storeys=3, os_rate=0.2, seed=3)
+    workbook = io.BytesIO()
+    eg.write_workbook(*envelopes, workbook)
+    workbook.seek(0)
+    flexural_df, shear_df = pr.read_workbook(workbook)
+    assert len(flexural_df) == len(shear_df) == 2 + 60 * 3
+
+    beam_schedule_df = pr.process_dataframes(flexural_df, shear_df)
+    assert beam_schedule_df[("Storey", "")].value_counts().to_dict() == {
+        "L1": 20,
+        "L2": 20,
+        "L3": 20,
+    }
+    overstressed = flexural_df.iloc[2::3]["Unnamed: 7"].astype(str).eq("O/S").to_numpy()
+    statuses = beam_schedule_df[("Flexural BL Reinforcement Criteria", "Status")]
+    assert 0 < overstressed.sum() < 60
+    assert (statuses[overstressed] != "OK").all()
+
+    eg.write_text_tables(*envelopes, tmp_path / "model.txt")
+    lines = (tmp_path / "model.txt").read_text(encoding="utf-8").splitlines()
+    assert lines[0] == pr.FLEXURE_TABLE
+    assert lines[2 + 2 + 60 * 3] == pr.SHEAR_TABLE
+
+
+def test_generated_export_is_repeatable():
+    """This test checks that the same seed generates the same export."""
+    first = eg.generate_envelopes(30, sections={"B300X600-C45/55": 1}, seed=7)
+    second = eg.generate_envelopes(30, sections={"B300X600-C45/55": 1}, seed=7)
+    for first_df, second_df in zip(first, second):
+        pd.testing.assert_frame_equal(first_df, second_df)
+    assert set(first[0]["Unnamed: 3"].iloc[2:]) == {"B300X600-C45/55"}
+
+
+def test_malformed_sections():
+    """This test checks that malformed sections invalidate the export, and that an unknown section of the
+    mix is refused."""
+    envelopes = eg.generate_envelopes(50, malformed_rate=0.2)
+    assert pr.extract_beam_inputs(*envelopes) == "Incorrect section definitions"
+    with pytest.raises(ValueError):
+        eg.generate_envelopes(10, sections={"B300-C45": 1})
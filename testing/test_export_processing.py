@@ -0,0 +1,85 @@
+import io
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import export_processing as ex
+
+
+def test_export_file_sheets(beam_schedule_df: pd.DataFrame):
+    """This test checks that the exported workbook has the full schedule, one sheet per storey,
+    and the steel quantity takeoff.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    workbook = pd.ExcelFile(io.BytesIO(ex.export_file(beam_schedule_df)))
+    assert workbook.sheet_names == [
+        "Beam Reinforcement Schedule",
+        "L0",
+        "L1",
+        "L2",
+        "Steel Quantity Takeoff",
+        "Steel Quantity by Storey",
+    ]
+
+
+def test_export_file_formatting(beam_schedule_df: pd.DataFrame):
+    """This test checks that the schedule sheet has merged headers, formatted areas, and a single
+    conditional format highlighting the overstressed rows.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    workbook = openpyxl.load_workbook(io.BytesIO(ex.export_file(beam_schedule_df)))
+    worksheet = workbook["Beam Reinforcement Schedule"]
+    merged = [str(cell_range) for cell_range in worksheet.merged_cells.ranges]
+    assert "A1:A2" in merged and "C1:D1" in merged
+    assert worksheet["A3"].value == "L0"
+    assert worksheet["C2"].value == "Width (mm)"
+    assert worksheet["Q3"].number_format == "#,##0"
+    assert len(worksheet.conditional_formatting) == 1
+    assert worksheet.freeze_panes == "C3"
+
+
+def test_storey_file_name():
+    """This test checks that storey names are made safe for use as file names."""
+    assert ex.storey_file_name("L12", "xlsx") == "L12.xlsx"
+    assert ex.storey_file_name("Top of Roof", "csv") == "Top of Roof.csv"
+    assert ex.storey_file_name("B1/B2", "xlsx") == "B1_B2.xlsx"
+
+
+@pytest.mark.parametrize("file_format, max_workers", [("xlsx", 2), ("csv", 1)])
+def test_export_storey_bundle(
+    beam_schedule_df: pd.DataFrame, file_format: str, max_workers: int
+):
+    """This test checks that the storey bundle holds one file per storey with only that storey's beams.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+        file_format (str): The storey file format.
+        max_workers (int): The number of worker processes.
+    """
+    bundle = ex.export_storey_bundle(
+        beam_schedule_df, file_format=file_format, max_workers=max_workers
+    )
+    with zipfile.ZipFile(io.BytesIO(bundle)) as archive:
+        assert archive.namelist() == [f"L{i}.{file_format}" for i in range(3)]
+        content = io.BytesIO(archive.read(f"L1.{file_format}"))
+    if file_format == "xlsx":
+        storey_df = pd.read_excel(content, header=None)
+    else:
+        storey_df = pd.read_csv(content, header=None)
+    assert (storey_df[0] == "L1").sum() == 5
+
+
+def test_export_storey_bundle_rejects_format(beam_schedule_df: pd.DataFrame):
+    """This test checks that unsupported storey file formats are rejected.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    with pytest.raises(ValueError):
+        ex.export_storey_bundle(beam_schedule_df, file_format="pdf")
@@ -0,0 +1,147 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from folder_watcher import MANIFEST_NAME, FolderWatcher
+
+
+class FakeClock:
+    """This class stands in for time.monotonic, only advancing when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def poll_until_idle(watcher: FolderWatcher, executor) -> list:
+    """This function polls the watcher until no workbooks remain in flight.
+
+    Args:
+        watcher (FolderWatcher): The watcher.
+        executor (concurrent.futures.Executor): The pool the workbooks are processed on.
+
+    Returns:
+        list: The results of the workbooks processed.
+    """
+    results = watcher.poll(executor)
+    while watcher._in_flight:
+        results += watcher.poll(executor)
+    return results
+
+
+@pytest.fixture
+def executor():
+    """This fixture provides a thread pool standing in for the worker processes.
+
+    Returns:
+        ThreadPoolExecutor: The executor, which is shut down after the test.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_workbook_processed_once_settled(tmp_path, etabs_workbook: bytes, executor):
+    """This test checks that a workbook is only processed once it has settled, and is then written alongside.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        executor (ThreadPoolExecutor): Refer to executor function
+    """
+    clock = FakeClock()
+    watcher = FolderWatcher(str(tmp_path), settle=2.0, clock=clock)
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook[:100])
+    assert poll_until_idle(watcher, executor) == []
+
+    # The save completes before it settles, restarting the settle time.
+    clock.now = 1.0
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    os.utime(tmp_path / "tower.xlsx", ns=(1, 1))
+    assert poll_until_idle(watcher, executor) == []
+    clock.now = 2.0
+    assert poll_until_idle(watcher, executor) == []
+
+    clock.now = 3.5
+    results = poll_until_idle(watcher, executor)
+    assert [result["ok"] for result in results] == [True]
+    assert (tmp_path / "tower_beam_schedule.xlsx").exists()
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_unchanged_workbook_skipped(tmp_path, etabs_workbook: bytes, executor):
+    """This test checks that a workbook whose content is unchanged is skipped, even by a new watcher,
+    while changed content is processed again.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        executor (ThreadPoolExecutor): Refer to executor function
+    """
+    clock = FakeClock()
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    watcher = FolderWatcher(str(tmp_path), settle=0, clock=clock)
+    watcher.scan()
+    assert len(poll_until_idle(watcher, executor)) == 1
+
+    # Touching the workbook without changing its content does not reprocess it.
+    os.utime(tmp_path / "tower.xlsx", ns=(5, 5))
+    restarted = FolderWatcher(str(tmp_path), settle=0, clock=clock)
+    restarted.scan()
+    assert restarted.scan() == []
+
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook + b"\0")
+    restarted.scan()
+    assert len(restarted.scan()) == 1
+
+
+def test_failed_workbook_not_retried(tmp_path, etabs_frames: tuple, executor):
+    """This test checks that a workbook which could not be processed is not retried until it changes.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_frames (tuple): Refer to etabs frames function
+        executor (ThreadPoolExecutor): Refer to executor function
+    """
+    etabs_frames[0].to_excel(tmp_path / "flexure_only.xlsx", index=False)
+    watcher = FolderWatcher(str(tmp_path), settle=0, clock=FakeClock())
+    watcher.scan()
+    assert [result["ok"] for result in poll_until_idle(watcher, executor)] == [False]
+    assert watcher.scan() == []
+
+
+def test_settled_workbook_hashed_once(
+    tmp_path, etabs_workbook: bytes, executor, monkeypatch
+):
+    """This test checks that a settled workbook is only hashed again once it changes.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        etabs_workbook (bytes): Refer to etabs workbook function
+        executor (ThreadPoolExecutor): Refer to executor function
+        monkeypatch (pytest.MonkeyPatch): Counts the workbooks hashed.
+    """
+    import folder_watcher
+
+    hashed = []
+    file_hash = folder_watcher.file_hash
+    monkeypatch.setattr(
+        folder_watcher,
+        "file_hash",
+        lambda path: hashed.append(path) or file_hash(path),
+    )
+    clock = FakeClock()
+    watcher = FolderWatcher(str(tmp_path), settle=2.0, clock=clock)
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook)
+    for now in (0.0, 3.0, 4.0, 5.0, 6.0):
+        clock.now = now
+        poll_until_idle(watcher, executor)
+    assert len(hashed) == 1
+
+    (tmp_path / "tower.xlsx").write_bytes(etabs_workbook + b"\0")
+    for now in (7.0, 10.0, 11.0):
+        clock.now = now
+        poll_until_idle(watcher, executor)
+    assert len(hashed) == 2
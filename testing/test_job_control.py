@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import df_processing as pr
+from job_control import JobCancelled, ProgressReporter
+
+
+class FakeClock:
+    """This class is a controllable clock for timing the progress updates."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_progress_throttling():
+    """This test checks that updates within the interval are recorded but not forwarded, apart from
+    the first and last update of a stage.
+    """
+    clock = FakeClock()
+    events = []
+    progress = ProgressReporter(events.append, min_interval=1, clock=clock)
+    for done in range(10):
+        clock.now = done * 0.1
+        progress.update("Designing beams", done, 10)
+    assert [event["done"] for event in events] == [0]
+    clock.now = 1.5
+    progress.update("Designing beams", 10, 10)
+    progress.update("Tabulating schedule", 0, 1)
+    assert [event["stage"] for event in events] == [
+        "Designing beams",
+        "Designing beams",
+        "Tabulating schedule",
+    ]
+    assert events[1]["elapsed"] == 1.5
+    assert progress.latest["stage"] == "Tabulating schedule"
+
+
+def test_progress_fraction():
+    """This test checks the fraction of the current stage which is done."""
+    progress = ProgressReporter()
+    assert progress.fraction == 0
+    progress.update("Designing beams", 25, 100)
+    assert progress.fraction == 0.25
+
+
+def test_process_dataframes_progress(etabs_frames: tuple, monkeypatch):
+    """This test checks that processing reports each stage and the beams designed in chunks.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Sets a small chunk size.
+    """
+    monkeypatch.setattr(pr, "BEAM_CHUNK_SIZE", 4)
+    events = []
+    progress = ProgressReporter(events.append, min_interval=0)
+    beam_schedule_df = pr.process_dataframes(*etabs_frames, progress=progress)
+    assert isinstance(beam_schedule_df, pd.DataFrame)
+    assert [(event["stage"], event["done"]) for event in events] == [
+        ("Reading demands", 0),
+        ("Designing beams", 0),
+        ("Designing beams", 4),
+        ("Designing beams", 8),
+        ("Designing beams", 12),
+        ("Designing beams", 15),
+        ("Tabulating schedule", 0),
+    ]
+
+
+def test_process_dataframes_cancelled(etabs_frames: tuple, monkeypatch):
+    """This test checks that processing stops at the next beam chunk once cancelled.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Sets a small chunk size.
+    """
+    monkeypatch.setattr(pr, "BEAM_CHUNK_SIZE", 4)
+    events = []
+
+    def cancel_after_first_chunk(event):
+        events.append(event)
+        if event["done"] == 4:
+            progress.cancel()
+
+    progress = ProgressReporter(cancel_after_first_chunk, min_interval=0)
+    with pytest.raises(JobCancelled):
+        pr.process_dataframes(*etabs_frames, progress=progress)
+    assert events[-1]["done"] == 4 and progress.cancelled
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+
+from job_control import JobCancelled
+from job_queue import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    QueueFullError,
+    ScheduleJobQueue,
+)
+
+
+@pytest.fixture
+def job_queue() -> ScheduleJobQueue:
+    """This fixture provides a queue with one worker and room for two jobs.
+
+    Returns:
+        ScheduleJobQueue: The job queue, which is shut down after the test.
+    """
+    job_queue = ScheduleJobQueue(workers=1, max_depth=2, history=1)
+    yield job_queue
+    job_queue.shutdown()
+
+
+def test_job_completes(job_queue: ScheduleJobQueue):
+    """This test checks that a job's result and status are recorded.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+    job = job_queue.submit(sum, [1, 2, 3], name="sum")
+    assert job.future.result(timeout=5) == 6
+    assert job.status == COMPLETED and job.result == 6
+    assert job_queue.get(job.id) is job
+    assert job.as_dict()["name"] == "sum"
+
+
+def test_job_fails(job_queue: ScheduleJobQueue):
+    """This test checks that a failing job records its error and raises it to whoever awaits it.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+    job = job_queue.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        job.future.result(timeout=5)
+    assert job.status == FAILED and "not a number" in job.error
+
+
+def test_queue_depth_limit(job_queue: ScheduleJobQueue):
+    """This test checks that jobs beyond the depth limit are refused, that queued jobs know their
+    position, and that the queue accepts jobs again once they finish.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+    release = threading.Event()
+    running = job_queue.submit(release.wait, 5)
+    queued = job_queue.submit(release.wait, 5)
+    assert queued.status == QUEUED and job_queue.position(queued) == 0
+    with pytest.raises(QueueFullError):
+        job_queue.submit(release.wait, 5)
+    assert job_queue.active == 2
+    release.set()
+    running.future.result(timeout=5)
+    queued.future.result(timeout=5)
+    assert job_queue.active == 0
+    job_queue.submit(release.wait, 5).future.result(timeout=5)
+    assert job_queue.get(running.id) is None
+
+
+def test_job_awaitable(job_queue: ScheduleJobQueue):
+    """This test checks that a job can be awaited from the event loop.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+
+    async def await_job():
+        return await asyncio.wrap_future(job_queue.submit(max, 4, 9).future)
+
+    assert asyncio.run(await_job()) == 9
+
+
+def test_job_progress(job_queue: ScheduleJobQueue):
+    """This test checks that a job tracking its progress receives its reporter, and that the
+    progress appears in the job's status.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+
+    def report(progress):
+        progress.update("Designing beams", 3, 4)
+
+    job = job_queue.submit(report, track_progress=True)
+    job.future.result(timeout=5)
+    assert job.as_dict()["progress"]["done"] == 3
+    assert job.progress.fraction == 0.75
+
+
+def test_cancel_running_job(job_queue: ScheduleJobQueue):
+    """This test checks that a running job stops at its next progress checkpoint once cancelled.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+    started = threading.Event()
+
+    def work(progress):
+        started.set()
+        while True:
+            progress.update("Designing beams", 0, 1)
+
+    job = job_queue.submit(work, track_progress=True)
+    started.wait(5)
+    assert job_queue.cancel(job.id)
+    with pytest.raises(JobCancelled):
+        job.future.result(timeout=5)
+    assert job.status == CANCELLED and job_queue.active == 0
+    assert not job_queue.cancel(job.id)
+
+
+def test_cancel_queued_job(job_queue: ScheduleJobQueue):
+    """This test checks that a queued job is removed from the queue once cancelled, freeing its place.
+
+    Args:
+        job_queue (ScheduleJobQueue): Refer to job queue function
+    """
+    release = threading.Event()
+    running = job_queue.submit(release.wait, 5)
+    queued = job_queue.submit(release.wait, 5)
+    assert job_queue.cancel(queued.id)
+    assert queued.status == CANCELLED and job_queue.active == 1
+    release.set()
+    assert running.future.result(timeout=5)
@@ -0,0 +1,79 @@
+import io
+import threading
+
+import pandas as pd
+
+import df_processing as pr
+from lazy_schedule import LazySchedule
+from testing.conftest import build_etabs_workbook
+from testing.test_schedule_database import count_designed_beams
+
+
+def test_lazy_schedule(etabs_workbook: bytes, etabs_frames: tuple, monkeypatch):
+    """This test checks that only the storeys asked for are designed, once each, and that the schedule of
+    every storey matches the schedule designed at once.
+
+    Args:
+        etabs_workbook (bytes): Refer to etabs workbook function
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Wraps the beam design.
+    """
+    expected = pr.process_dataframes(*etabs_frames)
+    designed = count_designed_beams(monkeypatch)
+    schedule = LazySchedule.from_workbook(io.BytesIO(etabs_workbook))
+    assert schedule.storeys == ["L0", "L1", "L2"]
+    assert schedule.beam_count == 15
+    assert designed == []
+
+    storey_df = schedule.schedule(["L1"])
+    assert len(designed) == 5
+    assert set(storey_df[("Storey", "")]) == {"L1"}
+    assert [storey["designed"] for storey in schedule.storey_summary()] == [
+        False,
+        True,
+        False,
+    ]
+
+    schedule.schedule(["L1"])
+    assert len(designed) == 5
+    pd.testing.assert_frame_equal(schedule.schedule(), expected)
+    assert len(designed) == 15
+
+
+def test_lazy_schedule_without_beams(etabs_frames: tuple):
+    """This test checks that an export without beams is reported rather than indexed.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+    """
+    flexural_df, shear_df = etabs_frames
+    workbook = build_etabs_workbook(flexural_df.iloc[:2], shear_df.iloc[:2])
+    assert LazySchedule.from_workbook(io.BytesIO(workbook)) == "No beams"
+
+
+def test_storeys_designed_concurrently(etabs_frames: tuple, monkeypatch):
+    """This test checks that a storey is not kept waiting while another storey is being designed.
+
+    Args:
+        etabs_frames (tuple): Refer to etabs frames function
+        monkeypatch (pytest.MonkeyPatch): Holds the design of one storey.
+    """
+    schedule = LazySchedule(pr.extract_beam_inputs(*etabs_frames))
+    release = threading.Event()
+    design_inputs = pr.design_inputs
+
+    def held_design(storey_inputs, progress=None, cache=None):
+        if storey_inputs[0][0] == "L0":
+            assert release.wait(10)
+        return design_inputs(storey_inputs, progress, cache)
+
+    monkeypatch.setattr(pr, "design_inputs", held_design)
+    held = threading.Thread(target=schedule.storey, args=("L0",))
+    held.start()
+    try:
+        assert len(schedule.storey("L1")) == 5
+        assert schedule.missing() == ["L0", "L2"]
+    finally:
+        release.set()
+        held.join()
+    assert schedule.missing() == ["L2"]
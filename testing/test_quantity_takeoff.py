@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from pytest import approx
+
+import quantity_takeoff as qt
+
+
+def test_flexure_area():
+    """This test checks that single and double layer rebar strings are parsed into their area,
+    and that messages are left without an area.
+    """
+    areas = qt.flexure_area(
+        pd.Series(["3T25", "3T25 + 3T20", "Overstressed. Please re-assess"])
+    )
+    assert areas[0] == approx(3 * qt.bar_area(25))
+    assert areas[1] == approx(3 * qt.bar_area(25) + 3 * qt.bar_area(20))
+    assert np.isnan(areas[2])
+
+
+def test_steel_takeoff(beam_schedule_df: pd.DataFrame):
+    """This test checks the steel mass of the first example beam, a B300X600 beam with 2T32 top and
+    2T25 bottom bars, 2L-T12@100/200/100 links, and no side face reinforcement.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    takeoff_df = qt.steel_takeoff(beam_schedule_df)
+    beam = takeoff_df.iloc[0]
+    assert beam["Length Assumed"] and beam["Length (mm)"] == 6000
+    assert beam["Top Flexure (kg)"] == approx(2 * qt.bar_area(32) * 6000 * 7850e-9)
+    assert beam["Bottom Flexure (kg)"] == approx(2 * qt.bar_area(25) * 6000 * 7850e-9)
+    link_length = 2 * 220 + 2 * 520
+    assert beam["Shear Links (kg)"] == approx(
+        (20 + 10 + 20) * qt.bar_area(12) * link_length * 7850e-9
+    )
+    assert beam["Side Face (kg)"] == 0
+
+
+def test_steel_takeoff_length_column(beam_schedule_df: pd.DataFrame):
+    """This test checks that beam lengths held by the schedule are used instead of the assumed span.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    beam_schedule_df[qt.LENGTH_COLUMN] = 3000.0
+    takeoff_df = qt.steel_takeoff(beam_schedule_df)
+    assert not takeoff_df["Length Assumed"].any()
+    assert takeoff_df["Top Flexure (kg)"].iloc[0] == approx(
+        2 * qt.bar_area(32) * 3000 * 7850e-9
+    )
+
+
+def test_storey_takeoff(beam_schedule_df: pd.DataFrame):
+    """This test checks that the storey totals add up and count the overstressed beam as not measured.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    takeoff_df = qt.steel_takeoff(beam_schedule_df)
+    summary = qt.storey_takeoff(takeoff_df)
+    assert summary["Storey"].tolist() == ["L0", "L1", "L2"]
+    assert summary["Beams"].tolist() == [5, 5, 5]
+    assert summary["Beams Not Measured"].tolist() == [0, 1, 0]
+    assert summary["Total (kg)"].sum() == approx(takeoff_df["Total (kg)"].sum())
@@ -0,0 +1,57 @@
+import pandas as pd
+
+import rationalisation as ra
+
+
+def test_exact_types(beam_schedule_df: pd.DataFrame):
+    """This test checks that identical beams share a type mark, ordered by section, and that the type
+    schedule counts the beams and storeys of each type.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    typed_df, type_schedule_df = ra.rationalise(beam_schedule_df)
+    assert list(typed_df.columns[:3]) == [
+        ("Storey", ""),
+        ("Etabs ID", ""),
+        ra.TYPE_MARK_COLUMN,
+    ]
+    assert list(typed_df[ra.TYPE_MARK_COLUMN][:5]) == [
+        "BT1",
+        "BT2",
+        "BT3",
+        "BT1",
+        "BT2",
+    ]
+    assert list(type_schedule_df[ra.TYPE_MARK_COLUMN]) == ["BT1", "BT2", "BT3", "BT4"]
+    assert list(type_schedule_df[("Beams", "")]) == [6, 6, 2, 1]
+    assert type_schedule_df[("Storeys", "")][0] == "L0, L1, L2"
+    # Without a tolerance the reinforcement of every beam is left as designed.
+    pd.testing.assert_frame_equal(
+        typed_df.drop(columns=[ra.TYPE_MARK_COLUMN]), beam_schedule_df
+    )
+
+
+def test_envelope_merging(beam_schedule_df: pd.DataFrame):
+    """This test checks that a lighter beam merges into a heavier type of its section within the tolerance,
+    taking the type's reinforcement, and stays its own type outside of it.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    provided = ("Flexural TL Reinforcement Criteria", "Provided (mm^2)")
+    # The beam B1 of L2 is given a lighter top left bar than the other 400x750 beams.
+    lighter = 11
+    beam_schedule_df.loc[lighter, ("Top Reinforcement", "Left (TL)")] = "2T20"
+    beam_schedule_df.loc[lighter, provided] = 628.3
+
+    _, type_schedule_df = ra.rationalise(beam_schedule_df)
+    assert len(type_schedule_df) == 5
+
+    typed_df, type_schedule_df = ra.rationalise(beam_schedule_df, tolerance=0.1)
+    assert len(type_schedule_df) == 4
+    merged = typed_df.iloc[lighter]
+    assert merged[("Top Reinforcement", "Left (TL)")] == "3T20"
+    assert merged[provided] == typed_df.iloc[1][provided]
+    assert merged[ra.TYPE_MARK_COLUMN] == typed_df.iloc[1][ra.TYPE_MARK_COLUMN]
+    assert merged[("Flexural TL Reinforcement Criteria", "Status")] == "OK"
@@ -0,0 +1,184 @@
+import io
+
+import pandas as pd
+import pytest
+
+import df_processing as pr
+from schedule_database import ScheduleDatabase, process_and_store
+from testing.conftest import build_etabs_frames, build_etabs_workbook
+
+
+@pytest.fixture
+def database(tmp_path) -> ScheduleDatabase:
+    """This fixture provides an empty schedule database.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+
+    Returns:
+        ScheduleDatabase: The database.
+    """
+    return ScheduleDatabase(str(tmp_path / "schedules.sqlite3"))
+
+
+def test_round_trip(database: ScheduleDatabase, beam_schedule_df: pd.DataFrame):
+    """This test checks that a stored schedule reloads with its values and typed schema, in whole or by storey.
+
+    Args:
+        database (ScheduleDatabase): Refer to database function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    database.save("Tower", "R1", beam_schedule_df, "abc", pr.design_parameters())
+    pd.testing.assert_frame_equal(database.load("Tower", "R1"), beam_schedule_df)
+
+    storey_df = database.load("Tower", "R1", storeys=["L1"])
+    assert len(storey_df) == 5 and set(storey_df[("Storey", "")]) == {"L1"}
+    assert database.load("Tower", "R2") is None
+
+    [revision] = database.revisions("Tower")
+    assert revision["storeys"] == ["L0", "L1", "L2"] and revision["beam_count"] == 15
+
+
+def test_save_replaces_revision(
+    database: ScheduleDatabase, beam_schedule_df: pd.DataFrame
+):
+    """This test checks that saving a revision again replaces it, and that revisions can be deleted.
+
+    Args:
+        database (ScheduleDatabase): Refer to database function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    database.save("Tower", "R1", beam_schedule_df, "abc", {})
+    database.save("Tower", "R1", beam_schedule_df.iloc[:5], "def", {})
+    assert len(database.load("Tower", "R1")) == 5
+    assert database.find("abc", {}) is None
+    assert database.delete("Tower", "R1")
+    assert database.revisions() == []
+
+
+def test_revision_limit(tmp_path, beam_schedule_df: pd.DataFrame):
+    """This test checks that only the most recent revisions of each project are kept.
+
+    Args:
+        tmp_path (Path): A temporary folder.
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    database = ScheduleDatabase(str(tmp_path / "schedules.sqlite3"), max_revisions=2)
+    for revision in ("R1", "R2", "R3"):
+        database.save("Tower", revision, beam_schedule_df, revision, {})
+    database.save("Podium", "R1", beam_schedule_df, "P1", {})
+    assert [revision["revision"] for revision in database.revisions("Tower")] == [
+        "R3",
+        "R2",
+    ]
+    assert database.load("Tower", "R1") is None
+    assert database.exists("Podium", "R1")
+
+
+def count_designed_beams(monkeypatch) -> list:
+    """This function records every beam designed from now on.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Wraps the beam design.
+
+    Returns:
+        list: The designed beams, filled in as they are designed.
+    """
+    designed = []
+    design_beam = pr.design_beam
+
+    def counting_design_beam(beam):
+        designed.append((beam.story, beam.id))
+        design_beam(beam)
+
+    monkeypatch.setattr(pr, "design_beam", counting_design_beam)
+    return designed
+
+
+def test_process_and_store_reuses_schedule(
+    database: ScheduleDatabase, etabs_workbook: bytes, monkeypatch
+):
+    """This test checks that an identical workbook reloads its stored schedule instead of being designed
+    again, unless the design parameters have changed.
+
+    Args:
+        database (ScheduleDatabase): Refer to database function
+        etabs_workbook (bytes): Refer to etabs workbook function
+        monkeypatch (pytest.MonkeyPatch): Counts the beams designed.
+    """
+    designed = count_designed_beams(monkeypatch)
+    first = process_and_store(database, io.BytesIO(etabs_workbook), "Tower", "R1")
+    second = process_and_store(database, io.BytesIO(etabs_workbook), "Tower", "R2")
+    assert len(designed) == 15
+    pd.testing.assert_frame_equal(first, second)
+    assert [revision["revision"] for revision in database.revisions("Tower")] == [
+        "R2",
+        "R1",
+    ]
+
+    monkeypatch.setattr(pr, "DESIGN_RULES_VERSION", pr.DESIGN_RULES_VERSION + 1)
+    process_and_store(database, io.BytesIO(etabs_workbook), "Tower", "R3")
+    assert len(designed) == 30
+
+
+def test_incremental_redesign(
+    database: ScheduleDatabase, example_beams: list, monkeypatch
+):
+    """This test checks that a new revision only designs its new and changed beams, and matches the
+    schedule of a full design.
+
+    Args:
+        database (ScheduleDatabase): Refer to database function
+        example_beams (list): Refer to example beams function
+        monkeypatch (pytest.MonkeyPatch): Counts the beams designed.
+    """
+    process_and_store(
+        database,
+        io.BytesIO(build_etabs_workbook(*build_etabs_frames(example_beams))),
+        "Tower",
+        "R1",
+    )
+
+    # Remove the first beam, change the section of another, and add a new one.
+    revised_beams = example_beams[1:]
+    revised_beams[-1] = ("L2", "B4", "B600X900-C40/50", False)
+    revised_beams.append(("L2", "B5", "B300X600-C45/55", False))
+    revised_frames = build_etabs_frames(revised_beams)
+
+    designed = count_designed_beams(monkeypatch)
+    revised_df = process_and_store(
+        database, io.BytesIO(build_etabs_workbook(*revised_frames)), "Tower", "R2"
+    )
+    assert designed == [("L2", "B4"), ("L2", "B5")]
+    pd.testing.assert_frame_equal(revised_df, pr.process_dataframes(*revised_frames))
+
+
+def test_interleaved_storeys(
+    database: ScheduleDatabase, example_beams: list, monkeypatch
+):
+    """This test checks that a schedule whose storeys are interleaved reloads in the order of its export,
+    so a new revision only designs its changed beams.
+
+    Args:
+        database (ScheduleDatabase): Refer to database function
+        example_beams (list): Refer to example beams function
+        monkeypatch (pytest.MonkeyPatch): Counts the beams designed.
+    """
+    interleaved_beams = sorted(example_beams, key=lambda beam: beam[1])
+    frames = build_etabs_frames(interleaved_beams)
+    stored_df = process_and_store(
+        database, io.BytesIO(build_etabs_workbook(*frames)), "Tower", "R1"
+    )
+    pd.testing.assert_frame_equal(database.load("Tower", "R1"), stored_df)
+    storey_df = database.load("Tower", "R1", storeys=["L0", "L2"])
+    assert list(storey_df[("Storey", "")])[:4] == ["L0", "L2", "L0", "L2"]
+
+    revised_beams = list(interleaved_beams)
+    revised_beams[4] = (*revised_beams[4][:2], "B600X900-C40/50", False)
+    revised_frames = build_etabs_frames(revised_beams)
+    designed = count_designed_beams(monkeypatch)
+    revised_df = process_and_store(
+        database, io.BytesIO(build_etabs_workbook(*revised_frames)), "Tower", "R2"
+    )
+    assert designed == [revised_beams[4][:2]]
+    pd.testing.assert_frame_equal(revised_df, pr.process_dataframes(*revised_frames))
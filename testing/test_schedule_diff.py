@@ -0,0 +1,39 @@
+import pandas as pd
+
+import df_processing as pr
+import schedule_diff as sd
+from testing.conftest import build_etabs_frames
+
+
+def test_diff_schedules(example_beams: list, beam_schedule_df: pd.DataFrame):
+    """This test checks that changed, added, and removed beams are reported, in the order of the later revision.
+
+    Args:
+        example_beams (list): Refer to example beams function
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    revised_beams = example_beams[1:]
+    revised_beams[0] = ("L0", "B1", "B600X900-C40/50", False)
+    revised_beams.append(("L3", "B0", "B300X600-C45/55", False))
+    revised_df = pr.process_dataframes(*build_etabs_frames(revised_beams))
+
+    changes_df = sd.diff_schedules(beam_schedule_df, revised_df)
+    assert list(changes_df.columns) == sd.CHANGE_COLUMNS
+    assert sd.summarise_changes(changes_df) == {"Added": 1, "Removed": 1, "Changed": 1}
+    assert changes_df["Change"].iloc[-1] == "Removed"
+    assert changes_df["Etabs ID"].iloc[-1] == "B0"
+
+    changed = changes_df[changes_df["Change"] == "Changed"]
+    assert set(changed["Etabs ID"]) == {"B1"}
+    width = changed[changed["Element"] == "Dimensions Width (mm)"]
+    assert (width["Before"].iloc[0], width["After"].iloc[0]) == ("400", "600")
+
+
+def test_diff_identical_schedules(beam_schedule_df: pd.DataFrame):
+    """This test checks that identical revisions have no changes.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    changes_df = sd.diff_schedules(beam_schedule_df, beam_schedule_df.copy())
+    assert changes_df.empty and list(changes_df.columns) == sd.CHANGE_COLUMNS
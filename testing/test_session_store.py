@@ -0,0 +1,97 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from session_store import SessionResultStore
+
+
+class FakeClock:
+    """This class is a controllable clock for timing the stored results."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """This fixture provides a clock starting at zero seconds.
+
+    Returns:
+        FakeClock: The controllable clock.
+    """
+    return FakeClock()
+
+
+def test_sessions_are_independent(beam_schedule_df: pd.DataFrame, clock: FakeClock):
+    """This test checks that each session retrieves its own result.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+        clock (FakeClock): Refer to clock function
+    """
+    store = SessionResultStore(ttl=60, max_bytes=10**9, clock=clock)
+    other_df = beam_schedule_df.head(3)
+    store.put("first", beam_schedule_df)
+    store.put("second", other_df)
+    assert store.get("first") is beam_schedule_df
+    assert store.get("second") is other_df
+    assert store.get("third") is None
+
+
+def test_results_expire(beam_schedule_df: pd.DataFrame, clock: FakeClock):
+    """This test checks that results expire once unused for their lifetime, and that use renews it.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+        clock (FakeClock): Refer to clock function
+    """
+    store = SessionResultStore(ttl=60, max_bytes=10**9, clock=clock)
+    store.put("first", beam_schedule_df)
+    store.put("second", beam_schedule_df)
+    clock.now = 50
+    assert store.get("first") is beam_schedule_df
+    clock.now = 100
+    assert store.get("first") is beam_schedule_df
+    assert store.get("second") is None
+
+
+def test_memory_limit(beam_schedule_df: pd.DataFrame, clock: FakeClock):
+    """This test checks that the least recently used results are evicted to respect the memory limit,
+    and that a result larger than the limit is refused.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+        clock (FakeClock): Refer to clock function
+    """
+    size = SessionResultStore.result_size(beam_schedule_df)
+    store = SessionResultStore(ttl=60, max_bytes=2 * size, clock=clock)
+    store.put("first", beam_schedule_df)
+    store.put("second", beam_schedule_df)
+    store.get("first")
+    store.put("third", beam_schedule_df)
+    assert store.get("second") is None
+    assert store.get("first") is not None and store.get("third") is not None
+    assert store.total_bytes == 2 * size
+    assert not store.put("fourth", pd.concat([beam_schedule_df] * 3))
+
+
+def test_concurrent_puts(beam_schedule_df: pd.DataFrame):
+    """This test checks that results stored from many threads at once are all retained.
+
+    Args:
+        beam_schedule_df (pd.DataFrame): Refer to beam schedule function
+    """
+    store = SessionResultStore(ttl=60, max_bytes=10**9)
+    threads = [
+        threading.Thread(target=store.put, args=(f"session {i}", beam_schedule_df))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(store.get(f"session {i}") is not None for i in range(20))
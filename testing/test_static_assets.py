@@ -0,0 +1,34 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from static_assets import asset_url, register_assets
+
+
+def test_assets_served_with_cache_headers():
+    """This test checks that the bundled icon stylesheet, and the image it masks, are served locally with
+    long lived cache headers."""
+    app = FastAPI()
+    register_assets(app)
+    client = TestClient(app)
+
+    url = asset_url("eva-icons/eva-icons.css")
+    assert url.startswith("/assets/eva-icons/eva-icons.css?v=")
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+    assert ".eva-github" in response.text
+    assert client.get("/assets/github-outline.png").status_code == 200
+
+
+def test_unversioned_assets_revalidated():
+    """This test checks that the image the icon stylesheet masks is referenced by its versioned URL, and
+    that an asset fetched without its version is not cached as immutable."""
+    app = FastAPI()
+    register_assets(app)
+    client = TestClient(app)
+
+    stylesheet = client.get(asset_url("eva-icons/eva-icons.css")).text
+    version = asset_url("github-outline.png").partition("?")[2]
+    assert f'url("../github-outline.png?{version}")' in stylesheet
+    response = client.get("/assets/github-outline.png")
+    assert response.headers["cache-control"] == "no-cache"
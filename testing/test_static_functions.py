@@ -90,3 +90,24 @@ def test_provided_reinforcement(diameter: int, expected: int) -> float:
         float: The area of steel (mm^2)
     """
     assert Beam.provided_reinforcement(diameter) == expected
+
+
+@pytest.mark.parametrize(
+    "shear_string, expected",
+    [
+        ("2L-T12@250", (2, 250)),
+        ("4L-T16@75", (4, 75)),
+        ("12L-T25@100", (12, 100)),
+    ],
+)
+def test_get_shear_legs_and_spacing(shear_string: str, expected: tuple) -> tuple:
+    """This function tests the get shear legs and spacing method from the Beam class.
+
+    Args:
+        shear_string (str): the shear reinforcement string.
+        expected (tuple): the correct number of legs and spacing.
+
+    Returns:
+        tuple: the correct number of legs and spacing.
+    """
+    assert Beam.get_shear_legs_and_spacing(shear_string) == expected
@@ -0,0 +1,27 @@
+import io
+
+import pytest
+
+from upload_spool import UploadTooLargeError, spool_upload
+
+
+def test_small_upload_stays_in_memory():
+    """This test checks that an upload within the spool size is held in memory, positioned at its start."""
+    spool = spool_upload(io.BytesIO(b"x" * 100), max_bytes=1000, spool_bytes=500)
+    assert not spool._rolled
+    assert spool.read() == b"x" * 100
+    spool.close()
+
+
+def test_large_upload_spooled_to_disk():
+    """This test checks that an upload beyond the spool size is written to disk."""
+    spool = spool_upload(io.BytesIO(b"x" * 800), max_bytes=1000, spool_bytes=500)
+    assert spool._rolled
+    assert len(spool.read()) == 800
+    spool.close()
+
+
+def test_upload_over_limit_rejected():
+    """This test checks that an upload beyond the size limit is refused."""
+    with pytest.raises(UploadTooLargeError):
+        spool_upload(io.BytesIO(b"x" * 1001), max_bytes=1000, spool_bytes=500)